@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Audio decoding via FFMPEG.
+Uploads are decoded once, straight from ffmpeg's stdout into 16 kHz mono float32 NumPy blocks.
+PCMSpool keeps a decoded recording in memory up to a size limit and in a memory-mapped
+temporary file beyond it.
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+import threading
+
+import imageio_ffmpeg
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 16 kHz mono is what Whisper expects and plenty for the energy/silence analysis
+SAMPLE_RATE = 16000
+
+# Configure FFMPEG path
+system_ffmpeg = shutil.which("ffmpeg")
+
+if system_ffmpeg:
+    ffmpeg_path = system_ffmpeg
+    logger.info(f"Using system FFMPEG at: {ffmpeg_path}")
+else:
+    # Copy to local directory fallback (mostly for Windows local dev)
+    original_ffmpeg = imageio_ffmpeg.get_ffmpeg_exe()
+    ffmpeg_path = os.path.abspath("ffmpeg.exe")
+
+    if not os.path.exists(ffmpeg_path):
+        try:
+            shutil.copy(original_ffmpeg, ffmpeg_path)
+        except Exception as e:
+            logger.warning(f"Could not copy ffmpeg: {e}")
+            ffmpeg_path = original_ffmpeg # Fallback
+
+    logger.info(f"Using FFMPEG binary at: {ffmpeg_path}")
+
+
+def _pcm_chunks(input_path, sr, chunk_bytes):
+    """Yield raw little-endian float32 PCM bytes from ffmpeg's stdout as it decodes."""
+    command = [
+        ffmpeg_path,
+        "-nostdin",
+        "-i", input_path,
+        "-f", "f32le", # Raw float32 samples, no container
+        "-acodec", "pcm_f32le",
+        "-ar", str(sr),
+        "-ac", "1", # Mono
+        "-"
+    ]
+    proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    # Drain stderr on a thread so a chatty ffmpeg can never block on a full pipe
+    stderr_chunks = []
+    drain = threading.Thread(target=lambda: stderr_chunks.append(proc.stderr.read()), daemon=True)
+    drain.start()
+
+    try:
+        while True:
+            chunk = proc.stdout.read(chunk_bytes)
+            if not chunk:
+                break
+            yield chunk
+    except GeneratorExit:
+        # Consumer stopped early; don't leave ffmpeg running
+        proc.kill()
+        raise
+    finally:
+        proc.stdout.close()
+        proc.wait()
+        drain.join()
+
+    if proc.returncode != 0:
+        stderr = b"".join(stderr_chunks).decode(errors="replace")
+        logger.error(f"FFMPEG failed: {stderr}")
+        raise Exception(f"Audio conversion failed: {stderr}")
+
+
+def iter_pcm_blocks(input_path: str, sr: int = SAMPLE_RATE, block_samples: int = 10 * SAMPLE_RATE):
+    """Decode to mono float32 arrays of `block_samples` samples (the last one shorter) as ffmpeg produces them."""
+    block_bytes = block_samples * 4
+    buffer = bytearray()
+    for chunk in _pcm_chunks(input_path, sr, chunk_bytes=block_bytes):
+        buffer += chunk
+        while len(buffer) >= block_bytes:
+            yield np.frombuffer(bytes(buffer[:block_bytes]), dtype=np.float32)
+            del buffer[:block_bytes]
+    # Drop a trailing partial sample
+    usable = len(buffer) - (len(buffer) % 4)
+    if usable:
+        yield np.frombuffer(bytes(buffer[:usable]), dtype=np.float32)
+
+
+class PCMSpool:
+    """
+    Collects float32 PCM blocks. Up to `max_memory_bytes` they stay in one in-memory buffer;
+    past that everything moves to `path` and array() returns a copy-on-write memory map,
+    so long recordings are paged in from disk as they are read instead of held in RAM.
+    """
+
+    def __init__(self, path: str, max_memory_bytes: int):
+        self.path = path
+        self.max_memory_bytes = max_memory_bytes
+        self.samples = 0
+        self._buffer = bytearray()
+        self._file = None
+
+    @property
+    def spilled(self) -> bool:
+        return self._file is not None
+
+    def write(self, block: np.ndarray):
+        data = memoryview(np.ascontiguousarray(block, dtype=np.float32)).cast("B")
+        self.samples += len(block)
+        if self._file is None and len(self._buffer) + len(data) > self.max_memory_bytes:
+            self._file = open(self.path, "wb")
+            self._file.write(self._buffer)
+            self._buffer = bytearray()
+        if self._file is not None:
+            self._file.write(data)
+        else:
+            self._buffer += data
+
+    def array(self) -> np.ndarray:
+        """All samples written so far; call once writing is done."""
+        if self._file is None:
+            # View the buffer as float32 without copying
+            return np.frombuffer(self._buffer, dtype=np.float32)
+        self._file.close()
+        if self.samples == 0:
+            return np.zeros(0, dtype=np.float32)
+        # "c": writable for consumers that need it (torch.from_numpy), without touching the file
+        return np.memmap(self.path, dtype=np.float32, mode="c", shape=(self.samples,))
+
+    def cleanup(self):
+        self._buffer = bytearray()
+        if self._file is not None:
+            self._file.close()
+        try:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        except OSError as e:
+            # Windows refuses while a memory map of the file is still alive
+            logger.warning(f"Could not remove spooled audio {self.path}: {e}")
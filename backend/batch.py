@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Batch analysis helpers: unpacking zip uploads and comparing the recordings of a batch.
+A batch is one record in the job store listing its member jobs; every member is a regular
+job, so /status, /result and /download-report work on each recording as usual.
+"""
+
+import hashlib
+import os
+import zipfile
+from typing import Dict, Any, List, Optional, Tuple
+
+from uploads import UploadTooLargeError
+
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".m4a", ".aac", ".ogg", ".opus", ".flac", ".webm", ".mp4")
+
+# Pace the comparison treats as ideal (middle of the 140-160 WPM target)
+IDEAL_WPM = 150
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class BatchTooLargeError(Exception):
+    """Raised when a batch has more recordings than allowed."""
+
+
+def is_zip(filename: Optional[str], path: str) -> bool:
+    return (filename or "").lower().endswith(".zip") and zipfile.is_zipfile(path)
+
+
+def extract_audio_files(zip_path: str, dest_prefix: str, max_files: int, max_bytes: int,
+                        hash_algorithm: Optional[str] = None) -> List[Tuple[str, str, int, Optional[str]]]:
+    """
+    Extract the audio files of a zip archive next to `dest_prefix` (a path prefix, e.g.
+    "temp/<batch_id>_"). Folders, hidden files and other file types are skipped.
+    Members are copied in chunks with the same size limit as single uploads, whatever
+    size the archive claims. Returns (filename, path, size, hex digest or None) per file.
+    """
+    extracted = []
+    try:
+        with zipfile.ZipFile(zip_path) as archive:
+            for index, info in enumerate(archive.infolist()):
+                name = os.path.basename(info.filename)
+                if info.is_dir() or not name or name.startswith(".") or "__MACOSX" in info.filename:
+                    continue
+                if not name.lower().endswith(AUDIO_EXTENSIONS):
+                    continue
+                if len(extracted) >= max_files:
+                    raise BatchTooLargeError(f"Batches are limited to {max_files} recordings")
+                if info.file_size > max_bytes:
+                    raise UploadTooLargeError(f"{name} is {info.file_size} bytes, limit is {max_bytes}")
+
+                path = f"{dest_prefix}{index}_{name}"
+                digest = hashlib.new(hash_algorithm) if hash_algorithm else None
+                size = 0
+                # Record the path first so a failed copy is cleaned up with the rest
+                extracted.append((name, path, 0, None))
+                with archive.open(info) as src, open(path, "wb") as out:
+                    while True:
+                        chunk = src.read(CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        size += len(chunk)
+                        if size > max_bytes:
+                            raise UploadTooLargeError(f"{name} exceeds limit of {max_bytes} bytes")
+                        out.write(chunk)
+                        if digest is not None:
+                            digest.update(chunk)
+                extracted[-1] = (name, path, size, digest.hexdigest() if digest is not None else None)
+    except BaseException:
+        for _, path, _, _ in extracted:
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+    return extracted
+
+
+def _recording_metrics(result: Dict[str, Any]) -> Dict[str, Any]:
+    summary = result.get("summary", {})
+    duration = result.get("duration", 0)
+    filler_count = int(summary.get("filler_words", "0"))
+    risks = [point["risk"] for point in result.get("timeline", [])]
+    return {
+        "duration": round(duration, 1),
+        "speech_rate": round(summary.get("speech_rate", 0), 1),
+        "filler_count": filler_count,
+        "fillers_per_min": round(filler_count / duration * 60, 1) if duration > 0 else 0,
+        "reading_ease": round(summary.get("reading_ease", 0), 1),
+        "average_risk": round(sum(risks) / len(risks), 1) if risks else 0,
+        "peak_risk": max(risks) if risks else 0,
+        "drop_risk": summary.get("drop_risk")
+    }
+
+
+def compare_recordings(members: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Side-by-side comparison of a finished batch. `members` are the member jobs (with their
+    results) plus "job_id"; failed recordings are listed but left out of averages and rankings.
+    """
+    recordings = []
+    for member in members:
+        entry = {"job_id": member["job_id"], "filename": member.get("filename"), "status": member.get("status")}
+        if member.get("status") == "done" and member.get("result"):
+            entry.update(_recording_metrics(member["result"]))
+        elif member.get("error"):
+            entry["error"] = member["error"]
+        recordings.append(entry)
+
+    analyzed = [entry for entry in recordings if entry["status"] == "done" and "speech_rate" in entry]
+    averages = {}
+    best = {}
+    if analyzed:
+        for metric in ("duration", "speech_rate", "fillers_per_min", "reading_ease", "average_risk", "peak_risk"):
+            averages[metric] = round(sum(entry[metric] for entry in analyzed) / len(analyzed), 1)
+        best = {
+            "pace": min(analyzed, key=lambda entry: abs(entry["speech_rate"] - IDEAL_WPM))["job_id"],
+            "fillers": min(analyzed, key=lambda entry: entry["fillers_per_min"])["job_id"],
+            "clarity": max(analyzed, key=lambda entry: entry["reading_ease"])["job_id"],
+            "engagement": min(analyzed, key=lambda entry: entry["average_risk"])["job_id"]
+        }
+
+    return {
+        "recordings": recordings,
+        "analyzed": len(analyzed),
+        "failed": len(recordings) - len(analyzed),
+        "averages": averages,
+        "best": best,
+        # Lowest average drop risk first
+        "ranking": [entry["job_id"] for entry in sorted(analyzed, key=lambda entry: entry["average_risk"])]
+    }
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+PDF report build time and memory versus transcript size.
+
+Builds reports for synthetic results with a growing number of Whisper segments
+(filler words, long words and uneven pacing mixed in, so every detail section has findings).
+
+Usage (from the backend directory):
+    python benchmarks/bench_pdf.py
+    python benchmarks/bench_pdf.py --segments 100 1000 5000 --max-items 50 --output bench_pdf.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+WORDS = (
+    "we the talk about results and this is our plan for next quarter um uh like so actually "
+    "basically literally infrastructure interoperability methodology organizational"
+).split()
+
+
+def synthetic_result(num_segments, seed=0):
+    from fillers import FILLER_LEXICONS, FillerDetector
+    from timeline import compute_segment_features, segment_feature_table
+    detector = FillerDetector(FILLER_LEXICONS["en"])
+    rng = random.Random(seed)
+    segments = []
+    t = 0.0
+    for i in range(num_segments):
+        duration = rng.uniform(1.5, 8)
+        words = [rng.choice(WORDS) for _ in range(rng.randint(4, 45))]
+        segments.append({"id": i, "start": t, "end": t + duration, "text": " " + " ".join(words)})
+        t += duration + rng.uniform(0, 1.5)
+    summary = {
+        "suggestions": [{"title": "Slow down", "description": "Pause between points."}],
+        "insights": {"jargon": {"title": "Jargon", "desc": "Medium"}},
+        "drop_risk": "High",
+        "jargon_density": "Medium",
+        "filler_words": "10"
+    }
+    return {
+        "drop_risks": [{"start": "0:10", "end": "0:20", "risk": "80%", "description": "Fast", "segment_text": "text"}],
+        "timeline": [],
+        "summary": summary,
+        "segments": segments,
+        # Computed by the analysis pipeline, so it isn't part of the report build time
+        "segment_features": segment_feature_table(compute_segment_features(segments, detector)),
+        "transcript": "".join(seg["text"] for seg in segments),
+        "duration": t,
+        "fillers": detector.fillers
+    }
+
+
+def build(result, max_items):
+    from pdf_generator import generate_detailed_report
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    os.close(fd)
+    try:
+        start = time.perf_counter()
+        generate_detailed_report(result, "bench.wav", path, max_items=max_items)
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(path)
+    finally:
+        os.remove(path)
+    return elapsed, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PDF report generation")
+    parser.add_argument("--segments", nargs="+", type=int, default=[50, 200, 500, 1000, 2000])
+    parser.add_argument("--max-items", type=int, default=None,
+                        help="Items per section before the rest moves to the appendix (default: REPORT_MAX_ITEMS)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory pass")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+    if args.max_items is None:
+        import config
+        args.max_items = config.REPORT_MAX_ITEMS
+
+    # Warm up imports, fonts and the shared style sheet so the first size isn't penalized
+    build(synthetic_result(5), args.max_items)
+
+    report = []
+    for num_segments in args.segments:
+        result = synthetic_result(num_segments)
+        timings = []
+        for _ in range(args.repeat):
+            elapsed, size = build(result, args.max_items)
+            timings.append(elapsed)
+
+        peak_mb = None
+        if not args.no_memory:
+            tracemalloc.start()
+            build(result, args.max_items)
+            peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            tracemalloc.stop()
+
+        report.append({
+            "segments": num_segments,
+            "wall_sec": [round(t, 3) for t in timings],
+            "best_wall_sec": round(min(timings), 3),
+            "pdf_kb": round(size / 1024, 1),
+            "peak_python_mb": round(peak_mb, 1) if peak_mb is not None else None
+        })
+
+    print(f"{'segments':>9}{'best s':>9}{'PDF KB':>9}{'peak MB':>9}")
+    for entry in report:
+        peak = f"{entry['peak_python_mb']:.1f}" if entry["peak_python_mb"] is not None else "n/a"
+        print(f"{entry['segments']:>9}{entry['best_wall_sec']:>9.3f}{entry['pdf_kb']:>9.1f}{peak:>9}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+"""
+End-to-end benchmark of the analysis pipeline.
+
+Generates speech-like audio locally (voiced phrases with a moving pitch, syllable-rate
+amplitude modulation and pauses of varying length), runs analyze_audio_sync on it and
+downloads the PDF report through /download-report. Reports wall time per pipeline stage,
+peak RSS and the throughput of N jobs running at once on N worker processes.
+
+Stages follow the job's own stage updates: "decode" covers format conversion, loading and
+the RMS frames computed block by block on the way (one ffmpeg pass), "audio_analysis" silence detection.
+
+Every run happens in a fresh process so peak RSS is measured per audio length.
+With --synthetic-transcript the Whisper model is replaced by a generator that emits
+plausible segments (with word timings) for the speech it finds, so everything except
+transcription can be measured on machines without the model.
+
+Usage (from the backend directory):
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --durations 30 300 3600 --concurrency 1 2 4 --output bench_pipeline.json
+    python benchmarks/bench_pipeline.py --synthetic-transcript --compare bench_pipeline.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+import wave
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+SAMPLE_RATE = 16000
+STAGE_NAMES = {
+    "decoding": "decode",
+    "audio_analysis": "audio_analysis",
+    "transcribing": "transcribe",
+    "text_analysis": "text_analysis",
+    "timeline": "timeline",
+    "summary": "summary"
+}
+WORDS = (
+    "we the talk about results and this is our plan for next quarter so the team will um uh like "
+    "actually basically literally you know infrastructure interoperability methodology customers"
+).split()
+
+
+def peak_rss_mb():
+    """Peak resident set size of the current process in MB (None where unsupported, e.g. Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def write_speech_like_wav(path, duration, seed=0):
+    """Write `duration` seconds of speech-like 16 kHz mono audio, one phrase at a time."""
+    rng = np.random.RandomState(seed)
+    total = int(duration * SAMPLE_RATE)
+    written = 0
+    with wave.open(path, "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(SAMPLE_RATE)
+        while written < total:
+            # A phrase of voiced speech...
+            n = min(int(rng.uniform(2, 12) * SAMPLE_RATE), total - written)
+            t = np.arange(n) / SAMPLE_RATE
+            f0 = rng.uniform(100, 220) * (1 + 0.1 * np.sin(2 * np.pi * rng.uniform(0.2, 0.6) * t))
+            phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+            voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+            syllables = 0.5 * (1 - np.cos(2 * np.pi * rng.uniform(3, 6) * t))
+            phrase = rng.uniform(0.05, 0.3) * syllables * voiced + rng.randn(n) * 0.002
+            out.writeframes((np.clip(phrase, -1, 1) * 32767).astype(np.int16).tobytes())
+            written += n
+            # ...then a pause: mostly short, sometimes long enough to count as a silence section
+            pause = rng.uniform(3, 6) if rng.rand() < 0.1 else rng.uniform(0.2, 1.2)
+            n = min(int(pause * SAMPLE_RATE), total - written)
+            out.writeframes((rng.randn(n) * 0.002 * 32767).astype(np.int16).tobytes())
+            written += n
+
+
+class SyntheticTranscriber:
+    """Stands in for Whisper: one segment per stretch of speech, with word timings, at 110-200 WPM."""
+
+    def __init__(self, seed=0):
+        self.rng = np.random.RandomState(seed)
+
+    def transcribe(self, audio, on_segments=None):
+        from streaming_features import analyze_blocks
+        # Block-wise, so the stand-in doesn't add full-length copies of the audio to the peak RSS
+        blocks = (audio[i:i + 10 * SAMPLE_RATE] for i in range(0, len(audio), 10 * SAMPLE_RATE))
+        segments = []
+        for start, end in analyze_blocks(blocks, SAMPLE_RATE).non_silent_intervals(top_db=30):
+            start, end = start / SAMPLE_RATE, end / SAMPLE_RATE
+            count = max(1, int((end - start) * self.rng.uniform(110, 200) / 60))
+            step = (end - start) / count
+            words = [
+                {"word": " " + self.rng.choice(WORDS), "start": start + i * step, "end": start + (i + 1) * step}
+                for i in range(count)
+            ]
+            segments.append({
+                "id": len(segments),
+                "start": start,
+                "end": end,
+                "text": "".join(word["word"] for word in words),
+                "words": words
+            })
+            if on_segments is not None:
+                on_segments(segments[-1:])
+        return {"text": "".join(seg["text"] for seg in segments), "segments": segments, "language": "en"}
+
+
+def _configure(work_dir):
+    """Point the pipeline's state at `work_dir` (before main is imported)."""
+    os.environ.setdefault("JOB_STORE", "memory")
+    os.environ["RESULT_CACHE_MAX_MB"] = "0"
+    os.environ["REPORT_DIR"] = os.path.join(work_dir, "reports")
+    os.environ["REPORT_PRERENDER"] = "0"
+
+
+def _run_job(main, audio_path, filename):
+    """Analyze one file in this process. Returns (job id, {stage: seconds}, total seconds)."""
+    job_id = str(uuid.uuid4())
+    marks = []
+
+    def hook(hook_job_id, stage):
+        if hook_job_id == job_id:
+            marks.append((stage, time.perf_counter()))
+
+    # analyze_audio_sync deletes its input, so analyze a copy
+    path = f"{audio_path}.{job_id}"
+    shutil.copyfile(audio_path, path)
+    main.job_store.create(job_id, {"status": "queued", "progress": 0, "stage": "queued", "filename": filename, "result": None})
+    main.stage_hooks.append(hook)
+    start = time.perf_counter()
+    try:
+        main.analyze_audio_sync(job_id, path, None, {}, filename)
+    finally:
+        main.stage_hooks.remove(hook)
+    total = time.perf_counter() - start
+
+    job = main.job_store.get(job_id, include_result=False)
+    if job["status"] != "done":
+        raise RuntimeError(f"Analysis failed: {job.get('error')}")
+    stages = {}
+    for (stage, begin), (_, end) in zip(marks, marks[1:]):
+        if stage in STAGE_NAMES:
+            stages[STAGE_NAMES[stage]] = round(end - begin, 3)
+    return job_id, stages, total
+
+
+def _load_pipeline(work_dir, synthetic_transcript):
+    """Import the app and warm it up like a long-running worker (model loaded, numba JIT compiled)."""
+    _configure(work_dir)
+    import main
+    if synthetic_transcript:
+        main._transcriber = SyntheticTranscriber()
+    else:
+        main.get_transcriber().warm_up()
+    warm_up_path = os.path.join(work_dir, f"warm_up_{os.getpid()}.wav")
+    write_speech_like_wav(warm_up_path, 5, seed=2)
+    _run_job(main, warm_up_path, "warm_up.wav")
+    os.remove(warm_up_path)
+    return main
+
+
+def _run_single(audio_path, duration, work_dir, synthetic_transcript, results):
+    from fastapi.testclient import TestClient
+    main = _load_pipeline(work_dir, synthetic_transcript)
+
+    job_id, stages, total = _run_job(main, audio_path, os.path.basename(audio_path))
+
+    with TestClient(main.app) as client:
+        start = time.perf_counter()
+        response = client.get(f"/download-report/{job_id}")
+        stages["report"] = round(time.perf_counter() - start, 3)
+        response.raise_for_status()
+        report_kb = round(len(response.content) / 1024, 1)
+        start = time.perf_counter()
+        client.get(f"/download-report/{job_id}").raise_for_status()
+        stages["report_cached"] = round(time.perf_counter() - start, 3)
+
+    results.put({
+        "audio_sec": duration,
+        "stages": stages,
+        "analysis_sec": round(total, 3),
+        "real_time_factor": round(total / duration, 4),
+        "report_kb": report_kb,
+        "peak_rss_mb": round(peak_rss_mb(), 1) if peak_rss_mb() is not None else None
+    })
+
+
+_worker_main = None
+
+
+def _init_concurrent_worker(work_dir, synthetic_transcript):
+    global _worker_main
+    _worker_main = _load_pipeline(work_dir, synthetic_transcript)
+
+
+def _run_concurrent_job(audio_path):
+    _, _, total = _run_job(_worker_main, audio_path, os.path.basename(audio_path))
+    return total, peak_rss_mb()
+
+
+def run_concurrency(workers, jobs, audio_path, duration, work_dir, synthetic_transcript):
+    """`jobs` analyses on `workers` processes, like ANALYSIS_WORKERS=workers under load."""
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=ctx, initializer=_init_concurrent_worker,
+                             initargs=(work_dir, synthetic_transcript)) as pool:
+        # Start and initialize every worker before timing
+        list(pool.map(time.sleep, [0.1] * workers))
+        start = time.perf_counter()
+        outcomes = list(pool.map(_run_concurrent_job, [audio_path] * jobs))
+        wall = time.perf_counter() - start
+    latencies = [outcome[0] for outcome in outcomes]
+    rss = [outcome[1] for outcome in outcomes if outcome[1] is not None]
+    return {
+        "workers": workers,
+        "jobs": jobs,
+        "audio_sec_each": duration,
+        "wall_sec": round(wall, 3),
+        "mean_job_sec": round(sum(latencies) / len(latencies), 3),
+        "max_job_sec": round(max(latencies), 3),
+        "jobs_per_min": round(jobs / wall * 60, 2),
+        "audio_sec_per_sec": round(jobs * duration / wall, 2),
+        "peak_worker_rss_mb": round(max(rss), 1) if rss else None
+    }
+
+
+def compare(report, baseline, tolerance):
+    """Print per-stage changes against a previous run. Returns the number of regressions."""
+    regressions = 0
+    previous = {run["audio_sec"]: run for run in baseline.get("runs", [])}
+    print(f"\nCompared with baseline ({baseline.get('meta', {}).get('timestamp', 'unknown date')}):")
+    print(f"{'audio s':>8}  {'stage':<16}{'before':>9}{'after':>9}{'change':>9}")
+    for run in report["runs"]:
+        old = previous.get(run["audio_sec"])
+        if old is None:
+            continue
+        metrics = dict(run["stages"], analysis=run["analysis_sec"])
+        old_metrics = dict(old["stages"], analysis=old["analysis_sec"])
+        for name, value in metrics.items():
+            before = old_metrics.get(name)
+            if not before:
+                continue
+            change = (value - before) / before
+            # Stages under 50 ms are too noisy to flag
+            flag = ""
+            if change > tolerance and value - before > 0.05:
+                flag = "  REGRESSION"
+                regressions += 1
+            print(f"{run['audio_sec']:>8.0f}  {name:<16}{before:>9.3f}{value:>9.3f}{change:>+9.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the analysis pipeline end to end")
+    parser.add_argument("--durations", nargs="+", type=float, default=[30, 300, 1800, 3600],
+                        help="Audio lengths in seconds")
+    parser.add_argument("--concurrency", nargs="*", type=int, default=[1, 2],
+                        help="Worker counts for the throughput runs (none to skip)")
+    parser.add_argument("--concurrency-duration", type=float, default=60, help="Audio length of each concurrent job")
+    parser.add_argument("--jobs-per-worker", type=int, default=2)
+    parser.add_argument("--synthetic-transcript", action="store_true",
+                        help="Replace Whisper with generated segments (measures everything but transcription)")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--compare", help="Baseline JSON from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="Slowdown (fraction) reported as a regression in --compare")
+    args = parser.parse_args()
+
+    import config
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "backend": "synthetic" if args.synthetic_transcript else config.TRANSCRIPTION_BACKEND,
+            "model": None if args.synthetic_transcript else config.WHISPER_MODEL
+        },
+        "runs": [],
+        "concurrency": []
+    }
+
+    work_dir = tempfile.mkdtemp(prefix="bench_pipeline_")
+    ctx = multiprocessing.get_context("spawn")
+    try:
+        for duration in args.durations:
+            audio_path = os.path.join(work_dir, f"speech_{int(duration)}s.wav")
+            write_speech_like_wav(audio_path, duration)
+            results = ctx.Queue()
+            proc = ctx.Process(target=_run_single,
+                               args=(audio_path, duration, work_dir, args.synthetic_transcript, results))
+            proc.start()
+            proc.join()
+            if proc.exitcode != 0:
+                print(f"{duration:.0f} s: failed (exit code {proc.exitcode})")
+                continue
+            report["runs"].append(results.get(timeout=10))
+            os.remove(audio_path)
+
+        if args.concurrency:
+            audio_path = os.path.join(work_dir, "speech_concurrent.wav")
+            write_speech_like_wav(audio_path, args.concurrency_duration, seed=1)
+            for workers in args.concurrency:
+                report["concurrency"].append(run_concurrency(
+                    workers, workers * args.jobs_per_worker, audio_path, args.concurrency_duration,
+                    work_dir, args.synthetic_transcript
+                ))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    columns = ["decode", "audio_analysis", "transcribe", "text_analysis", "timeline", "summary", "report"]
+    print(f"{'audio s':>8}" + "".join(f"{name[:12]:>13}" for name in columns) + f"{'total':>9}{'RTF':>8}{'RSS MB':>9}")
+    for run in report["runs"]:
+        rss = f"{run['peak_rss_mb']:.0f}" if run["peak_rss_mb"] is not None else "n/a"
+        print(
+            f"{run['audio_sec']:>8.0f}" + "".join(f"{run['stages'].get(name, 0):>13.3f}" for name in columns)
+            + f"{run['analysis_sec']:>9.2f}{run['real_time_factor']:>8.3f}{rss:>9}"
+        )
+    if report["concurrency"]:
+        print(f"\n{'workers':>8}{'jobs':>6}{'wall s':>9}{'jobs/min':>10}{'audio s/s':>11}{'max job s':>11}")
+        for entry in report["concurrency"]:
+            print(
+                f"{entry['workers']:>8}{entry['jobs']:>6}{entry['wall_sec']:>9.2f}{entry['jobs_per_min']:>10.2f}"
+                f"{entry['audio_sec_per_sec']:>11.2f}{entry['max_job_sec']:>11.2f}"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print(f"{regressions} regression(s) beyond {args.tolerance:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
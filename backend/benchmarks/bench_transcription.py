@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Compare transcription backends on the same audio files.
+
+Each backend runs in a fresh process so load time and peak RSS are measured in isolation.
+
+Usage (from the backend directory):
+    python benchmarks/bench_transcription.py talk1.wav talk2.wav
+    python benchmarks/bench_transcription.py talk.wav --backends whisper faster-whisper --repeat 3 --output bench.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+
+def peak_rss_mb():
+    """Peak resident set size of the current process in MB (None where unsupported, e.g. Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_backend(backend_name, model_name, compute_type, files, repeat, results):
+    import librosa
+    from transcription import create_backend
+
+    backend = create_backend(backend_name, model_name, compute_type=compute_type)
+
+    start = time.perf_counter()
+    backend.load()
+    load_time = time.perf_counter() - start
+
+    runs = []
+    for path in files:
+        audio, _ = librosa.load(path, sr=16000)
+        duration = len(audio) / 16000
+        timings = []
+        text = ""
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = backend.transcribe(audio)
+            timings.append(time.perf_counter() - start)
+            text = result["text"]
+        best = min(timings)
+        runs.append({
+            "file": os.path.basename(path),
+            "audio_sec": round(duration, 2),
+            "wall_sec": [round(t, 3) for t in timings],
+            "best_wall_sec": round(best, 3),
+            "real_time_factor": round(best / duration, 4) if duration > 0 else None,
+            "segments": len(result["segments"]),
+            "words": len(text.split())
+        })
+
+    results.put({
+        "backend": backend_name,
+        "model": model_name,
+        "load_sec": round(load_time, 3),
+        "peak_rss_mb": peak_rss_mb(),
+        "runs": runs
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark transcription backends")
+    parser.add_argument("files", nargs="+", help="Audio files (WAV recommended)")
+    parser.add_argument("--backends", nargs="+", default=["whisper", "faster-whisper"])
+    parser.add_argument("--model", default="tiny")
+    parser.add_argument("--compute-type", default="int8", help="faster-whisper quantization")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    report = []
+    for backend_name in args.backends:
+        results = ctx.Queue()
+        proc = ctx.Process(
+            target=_run_backend,
+            args=(backend_name, args.model, args.compute_type, args.files, args.repeat, results)
+        )
+        proc.start()
+        proc.join()
+        if proc.exitcode != 0:
+            print(f"{backend_name}: failed (exit code {proc.exitcode})")
+            continue
+        report.append(results.get(timeout=10))
+
+    print(f"{'backend':<16}{'file':<28}{'audio s':>9}{'wall s':>9}{'RTF':>8}{'load s':>9}{'RSS MB':>9}")
+    for entry in report:
+        rss = f"{entry['peak_rss_mb']:.0f}" if entry["peak_rss_mb"] is not None else "n/a"
+        for run in entry["runs"]:
+            print(
+                f"{entry['backend']:<16}{run['file'][:27]:<28}{run['audio_sec']:>9.1f}"
+                f"{run['best_wall_sec']:>9.2f}{run['real_time_factor']:>8.3f}{entry['load_sec']:>9.2f}{rss:>9}"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Parallel transcription of long recordings.
+The audio is cut only inside silences (from librosa.effects.split) into chunks of roughly
+`target_sec`; chunks are transcribed on a pool of processes, each holding its own model,
+and the segments are stitched back together with absolute timestamps.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+import numpy as np
+
+from transcription import create_backend
+
+logger = logging.getLogger(__name__)
+
+
+def plan_chunks(non_silent_intervals, total_samples: int, sr: int,
+                target_sec: float = 60, max_sec: float = 120) -> List[Tuple[int, int]]:
+    """
+    Split [0, total_samples) into (start, end) sample ranges of about `target_sec`.
+    Cuts fall in the middle of a silence gap. A chunk that would grow past `max_sec` ends in
+    the last gap before it does; only speech longer than `max_sec` with no silence at all
+    is split hard at `max_sec`.
+    """
+    target = int(target_sec * sr)
+    max_len = int(max_sec * sr)
+    intervals = np.asarray(non_silent_intervals, dtype=np.int64).reshape(-1, 2)
+
+    cuts = [0]
+    previous_end = 0
+    for i, (start, end) in enumerate(intervals):
+        if end - cuts[-1] > max_len:
+            _cut_in_gap(cuts, previous_end, start, end, max_len)
+        if end - cuts[-1] >= target and i + 1 < len(intervals):
+            next_start = intervals[i + 1][0]
+            cuts.append(int(min((end + next_start) // 2, cuts[-1] + max_len)))
+        previous_end = end
+    if total_samples - cuts[-1] > max_len:
+        _cut_in_gap(cuts, previous_end, total_samples, total_samples, max_len)
+    cuts.append(total_samples)
+
+    return [(lo, hi) for lo, hi in zip(cuts[:-1], cuts[1:]) if hi > lo]
+
+
+def _cut_in_gap(cuts: List[int], gap_start: int, gap_end: int, end: int, max_len: int):
+    """
+    End the current chunk in the silence [gap_start, gap_end] before speech that runs to `end`:
+    mid-gap, or later in the gap if the speech wouldn't fit in `max_len` from there (but never
+    past `max_len` into the current chunk). Speech that still doesn't fit has no pause to cut
+    at and is split hard.
+    """
+    cut = int(min(gap_end, max((gap_start + gap_end) // 2, end - max_len), cuts[-1] + max_len))
+    if cut > cuts[-1]:
+        cuts.append(cut)
+    while end - cuts[-1] > max_len:
+        cuts.append(cuts[-1] + max_len)
+
+
+# Per-process model for chunk workers
+_chunk_backend = None
+
+
+def _init_chunk_worker(backend_name, model_name, options):
+    global _chunk_backend
+    _chunk_backend = create_backend(backend_name, model_name, **options)
+    threading.Thread(target=_exit_with_parent, name="chunk-parent-watch", daemon=True).start()
+
+
+def _exit_with_parent():
+    # The analysis worker owning the pool can die without shutting it down (e.g. OOM-killed,
+    # after which the scheduler starts a new pool); don't outlive it
+    multiprocessing.parent_process().join()
+    os._exit(1)
+
+
+def _transcribe_chunk(audio_chunk):
+    return _chunk_backend.transcribe(audio_chunk)
+
+
+class ChunkedTranscriber:
+    """Transcribes silence-aligned chunks of one recording in parallel across `workers` processes."""
+
+    def __init__(self, backend_name, model_name, workers, **options):
+        self.workers = workers
+        # Split the cores between the chunk workers instead of letting each grab all of them
+        options.setdefault("cpu_threads", max(1, (os.cpu_count() or 1) // workers))
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_chunk_worker,
+            initargs=(backend_name, model_name, options)
+        )
+
+    def transcribe(self, audio: np.ndarray, chunks: List[Tuple[int, int]], sr: int,
+                   on_segments: Optional[Callable[[List[Dict[str, Any]]], None]] = None) -> Dict[str, Any]:
+        """`on_segments` receives each chunk's stitched segments, in order, as the chunk completes."""
+        logger.info(f"Transcribing {len(chunks)} chunks on {self.workers} worker(s)...")
+        results = self._executor.map(_transcribe_chunk, [audio[lo:hi] for lo, hi in chunks])
+
+        # Stitch segments back together on the absolute timeline
+        segments = []
+        for (lo, _), result in zip(chunks, results):
+            offset = lo / sr
+            first = len(segments)
+            for seg in result.get("segments", []):
+                seg = dict(seg)
+                seg["id"] = len(segments)
+                seg["start"] = seg.get("start", 0) + offset
+                seg["end"] = seg.get("end", 0) + offset
+                if seg.get("words"):
+                    seg["words"] = [
+                        dict(word, start=word["start"] + offset, end=word["end"] + offset)
+                        for word in seg["words"]
+                    ]
+                segments.append(seg)
+            if on_segments is not None:
+                on_segments(segments[first:])
+
+        return {
+            "text": "".join(seg.get("text", "") for seg in segments),
+            "segments": segments,
+            "language": "en"
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Runtime configuration for the analysis backend.
+All settings are read from environment variables so they can be tuned per deployment.
+"""
+
+import os
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    return int(value)
+
+
+def _env_bool(name, default):
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# --- Analysis scheduler ---
+# Number of worker processes running analyze_audio_sync concurrently
+ANALYSIS_WORKERS = max(1, _env_int("ANALYSIS_WORKERS", 2))
+# Maximum number of jobs waiting for a free worker before uploads get a 429
+ANALYSIS_QUEUE_SIZE = max(0, _env_int("ANALYSIS_QUEUE_SIZE", 20))
+# Seconds clients are asked to wait before retrying when the queue is full
+ANALYSIS_RETRY_AFTER = _env_int("ANALYSIS_RETRY_AFTER", 30)
+
+# --- Uploads ---
+# Uploads are streamed to disk, so this can be raised for long talks without memory spikes
+MAX_UPLOAD_MB = _env_int("MAX_UPLOAD_MB", 10)
+MAX_UPLOAD_BYTES = MAX_UPLOAD_MB * 1024 * 1024
+# hashlib algorithm used to fingerprint uploads while streaming ("" disables hashing)
+UPLOAD_HASH_ALGORITHM = os.environ.get("UPLOAD_HASH_ALGORITHM", "")
+
+# --- Long recordings ---
+# Audio features are computed block by block while decoding, so their memory use doesn't grow
+# with length; the decoded PCM kept for Whisper stays in RAM up to this many seconds
+# (~3.8 MB per minute) and is memory-mapped from a temporary file beyond it
+AUDIO_IN_MEMORY_MAX_SEC = _env_int("AUDIO_IN_MEMORY_MAX_SEC", 600)
+
+# --- Retained audio ---
+# Keep the decoded PCM of every analysed recording on disk (by content hash), so analysing it
+# again skips decoding; workers read it through shared memory maps
+RETAIN_AUDIO = _env_bool("RETAIN_AUDIO", False)
+RETAINED_AUDIO_DIR = os.environ.get("RETAINED_AUDIO_DIR", "cache/audio")
+# Seconds since last use before a recording is deleted
+RETAINED_AUDIO_TTL = _env_int("RETAINED_AUDIO_TTL", 24 * 60 * 60)
+# "float32" (~3.8 MB per minute, exact) or "int16" (half the size, re-analysis results may differ marginally)
+RETAINED_AUDIO_DTYPE = os.environ.get("RETAINED_AUDIO_DTYPE", "float32")
+
+# --- Batch uploads (/batch/upload) ---
+# Recordings per batch; each still obeys MAX_UPLOAD_MB
+BATCH_MAX_FILES = max(1, _env_int("BATCH_MAX_FILES", 50))
+# Total size of one batch request, zip archives included
+BATCH_MAX_UPLOAD_MB = _env_int("BATCH_MAX_UPLOAD_MB", 200)
+BATCH_MAX_UPLOAD_BYTES = BATCH_MAX_UPLOAD_MB * 1024 * 1024
+
+# --- Whisper model ---
+# Transcription engine: "whisper" (openai-whisper) or "faster-whisper" (CTranslate2)
+TRANSCRIPTION_BACKEND = os.environ.get("TRANSCRIPTION_BACKEND", "whisper")
+WHISPER_MODEL = os.environ.get("WHISPER_MODEL", "tiny")
+# Weight quantization (faster-whisper only) and CPU threads per worker (0 = library default)
+WHISPER_COMPUTE_TYPE = os.environ.get("WHISPER_COMPUTE_TYPE", "int8")
+WHISPER_CPU_THREADS = _env_int("WHISPER_CPU_THREADS", 0)
+# Load and warm up the model when each worker process starts instead of on the first job
+WHISPER_EAGER_LOAD = _env_bool("WHISPER_EAGER_LOAD", False)
+# Per-word timings, used to timestamp each filler word. Off by default: alignment adds
+# decoding time to every job, and without it fillers are placed at their segment's start
+WHISPER_WORD_TIMESTAMPS = _env_bool("WHISPER_WORD_TIMESTAMPS", False)
+
+# --- Chunked transcription ---
+# Processes per analysis worker that transcribe silence-aligned chunks of long recordings
+# in parallel (0 disables). Each holds its own model, so memory grows with this value.
+TRANSCRIPTION_CHUNK_WORKERS = max(0, _env_int("TRANSCRIPTION_CHUNK_WORKERS", 0))
+# Only recordings at least this long are chunked; shorter ones are not worth the overhead
+CHUNKED_TRANSCRIPTION_MIN_SEC = _env_int("CHUNKED_TRANSCRIPTION_MIN_SEC", 300)
+# Target chunk length; speech with no pause at all is split hard at twice this length
+TRANSCRIPTION_CHUNK_SEC = max(5, _env_int("TRANSCRIPTION_CHUNK_SEC", 60))
+
+# --- Filler words ---
+# Comma-separated built-in lexicons (en, es, fr, de) matched together
+FILLER_LEXICON = os.environ.get("FILLER_LEXICON", "en")
+# Optional JSON file of {"language": ["filler", "multi word filler", ...]} adding or replacing lexicons
+FILLER_LEXICON_FILE = os.environ.get("FILLER_LEXICON_FILE", "")
+
+# --- Result cache ---
+# Finished results keyed by audio hash + analysis config; 0 MB disables the cache
+RESULT_CACHE_DIR = os.environ.get("RESULT_CACHE_DIR", "cache/results")
+RESULT_CACHE_MAX_MB = _env_int("RESULT_CACHE_MAX_MB", 256)
+
+# --- PDF reports ---
+# Rendered reports are cached per (job, audience) and evicted by age and total size
+REPORT_DIR = os.environ.get("REPORT_DIR", "reports")
+REPORT_CACHE_MAX_MB = _env_int("REPORT_CACHE_MAX_MB", 200)
+REPORT_CACHE_TTL = _env_int("REPORT_CACHE_TTL", 24 * 60 * 60)
+# Threads rendering reports for downloads in the API process
+REPORT_WORKERS = max(1, _env_int("REPORT_WORKERS", 2))
+# Findings listed per report section before the rest moves to an appendix (0 = no limit)
+REPORT_MAX_ITEMS = max(0, _env_int("REPORT_MAX_ITEMS", 50))
+# Render the default report in the analysis worker right after a job completes
+REPORT_PRERENDER = _env_bool("REPORT_PRERENDER", False)
+
+# --- Job store ---
+# "sqlite" shares job state across processes and restarts; "memory" keeps it in the API process
+JOB_STORE = os.environ.get("JOB_STORE", "sqlite")
+JOB_STORE_PATH = os.environ.get("JOB_STORE_PATH", "data/jobs.db")
+# Seconds a finished job (and its result) stays available
+JOB_RESULT_TTL = _env_int("JOB_RESULT_TTL", 24 * 60 * 60)
+JOB_PURGE_INTERVAL = _env_int("JOB_PURGE_INTERVAL", 60)
+
+# --- Progress events ---
+# /events re-reads the job store at least this often (seconds); also the keep-alive period
+EVENTS_POLL_INTERVAL = max(1, _env_int("EVENTS_POLL_INTERVAL", 2))
+# Publish the energy curve, silences and scored segments while a job is still running
+PARTIAL_RESULTS = _env_bool("PARTIAL_RESULTS", True)
+# Minimum seconds between partial segment updates (each one rewrites the job record)
+PARTIAL_RESULT_INTERVAL = float(os.environ.get("PARTIAL_RESULT_INTERVAL", "1") or 1)
+
+# --- Live recording (/live WebSocket) ---
+# Concurrent live sessions; all share one transcription thread in the API process
+LIVE_MAX_SESSIONS = max(0, _env_int("LIVE_MAX_SESSIONS", 2))
+# Untranscribed seconds that trigger the next rolling window (cut at the last pause)
+LIVE_WINDOW_SEC = max(2, _env_int("LIVE_WINDOW_SEC", 8))
+LIVE_MAX_MINUTES = _env_int("LIVE_MAX_MINUTES", 30)
+
+# --- Instrumentation (/metrics) ---
+# Seconds between memory samples while a job runs (0 = only at stage changes)
+JOB_MEMORY_SAMPLE_INTERVAL = float(os.environ.get("JOB_MEMORY_SAMPLE_INTERVAL", "0.5") or 0)
+
+# --- Profiling ---
+# Fraction of analyses and report renders profiled at random (0 = only when an admin asks)
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0") or 0)
+# Milliseconds between stack samples of a profiled job
+PROFILE_INTERVAL_MS = max(1, _env_int("PROFILE_INTERVAL_MS", 5))
+# Profiles are written to PROFILE_DIR/<job_id>/ and deleted after PROFILE_TTL seconds
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "profiles")
+PROFILE_TTL = _env_int("PROFILE_TTL", 7 * 24 * 60 * 60)
+
+# --- Admin ---
+# Expected in the X-Admin-Token header of /admin requests and per-request profiling (empty disables both)
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "")
+
+# --- Timeline resolution ---
+# Fixed seconds between timeline points (0 = ~5 s apart, capped at TIMELINE_MAX_POINTS)
+TIMELINE_INTERVAL_SEC = float(os.environ.get("TIMELINE_INTERVAL_SEC", "0") or 0)
+TIMELINE_MAX_POINTS = _env_int("TIMELINE_MAX_POINTS", 60)
+# Hard limits for per-upload resolution options
+TIMELINE_MIN_INTERVAL_SEC = 0.5
+TIMELINE_POINT_LIMIT = _env_int("TIMELINE_POINT_LIMIT", 10000)
+# /result serves a downsampled timeline of at most this many points (?resolution=full for all)
+TIMELINE_LOD_POINTS = _env_int("TIMELINE_LOD_POINTS", 120)
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+In-process fan-out of job updates to Server-Sent Events subscribers.
+Updates arrive on scheduler and worker threads; subscribers are asyncio queues on the
+API event loop, so every hand-off goes through call_soon_threadsafe.
+"""
+
+import asyncio
+import json
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any
+
+
+class JobEventBroker:
+    def __init__(self):
+        self._loop = None
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        """Attach the event loop subscribers live on (call once at start-up)."""
+        self._loop = loop
+
+    @contextmanager
+    def subscribe(self, job_id: str):
+        """Yield an asyncio.Queue receiving every update published for `job_id`."""
+        queue = asyncio.Queue()
+        with self._lock:
+            self._subscribers.setdefault(job_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            with self._lock:
+                queues = self._subscribers.get(job_id)
+                if queues is not None:
+                    queues.discard(queue)
+                    if not queues:
+                        del self._subscribers[job_id]
+
+    def publish(self, job_id: str, fields: Dict[str, Any]):
+        """Thread-safe: hand `fields` to every subscriber of `job_id`."""
+        if self._loop is None:
+            return
+        with self._lock:
+            queues = list(self._subscribers.get(job_id, ()))
+        for queue in queues:
+            try:
+                self._loop.call_soon_threadsafe(queue.put_nowait, fields)
+            except RuntimeError:
+                # Loop already closed during shutdown
+                return
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Encode one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data, default=float)}\n\n"
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Filler-word detection.
+Fillers are matched on word tokens with a trie built once from the configured lexicons, so
+multi-word fillers ("you know") are found in the same single pass over a segment as
+one-word ones. When Whisper word timings are available each filler gets its own timestamps.
+"""
+
+import json
+import re
+from bisect import bisect_right
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+# Built-in lexicons by language code; FILLER_LEXICON selects which ones are used
+FILLER_LEXICONS = {
+    "en": ["um", "uh", "like", "you know", "so", "actually", "basically", "literally"],
+    "es": ["eh", "este", "pues", "o sea", "bueno", "entonces", "digamos"],
+    "fr": ["euh", "ben", "bah", "genre", "en fait", "du coup", "tu vois"],
+    "de": ["äh", "ähm", "also", "halt", "quasi", "sozusagen", "weißt du"],
+}
+
+# Same notion of a word as the \b...\b pattern this replaced
+_TOKEN = re.compile(r"\w+")
+# Trie key marking the end of a filler phrase
+_END = ""
+
+
+def _tokenize(text: str) -> Tuple[List[str], List[int], List[bool]]:
+    """
+    Lower-cased word tokens of `text`, their start offsets, and whether each one follows
+    the previous token after exactly one space (multi-word fillers must, as they had to
+    in the pattern, so "you, know", "you-know" or "you  know" don't count as "you know").
+    """
+    tokens = []
+    offsets = []
+    joined = []
+    previous_end = None
+    for match in _TOKEN.finditer(text):
+        tokens.append(match.group().lower())
+        offsets.append(match.start())
+        joined.append(previous_end is not None and text[previous_end:match.start()] == " ")
+        previous_end = match.end()
+    return tokens, offsets, joined
+
+
+class FillerDetector:
+    """Matches a fixed set of filler phrases (leftmost, longest first, without overlaps)."""
+
+    def __init__(self, fillers: Iterable[str]):
+        self._trie = {}
+        phrases = set()
+        for filler in fillers:
+            tokens = _TOKEN.findall(filler.lower())
+            if not tokens:
+                continue
+            phrases.add(" ".join(tokens))
+            node = self._trie
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node[_END] = True
+        # Sorted so the set can be stored with results and compared or hashed
+        self.fillers = sorted(phrases)
+
+    def _match(self, tokens: List[str], joined: List[bool]) -> List[Tuple[int, int]]:
+        """(first token, token after the last) of every filler in `tokens`."""
+        matches = []
+        i = 0
+        while i < len(tokens):
+            node = self._trie
+            end = None
+            j = i
+            while j < len(tokens) and tokens[j] in node and (j == i or joined[j]):
+                node = node[tokens[j]]
+                j += 1
+                if _END in node:
+                    end = j
+            if end is None:
+                i += 1
+            else:
+                matches.append((i, end))
+                i = end
+        return matches
+
+    def find(self, text: str) -> List[str]:
+        """Filler phrases in `text`, in order of appearance."""
+        tokens, _, joined = _tokenize(text)
+        return [" ".join(tokens[start:end]) for start, end in self._match(tokens, joined)]
+
+    def count(self, text: str) -> int:
+        tokens, _, joined = _tokenize(text)
+        return len(self._match(tokens, joined))
+
+    def find_in_segment(self, segment: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Fillers of a Whisper segment as {"word", "start", "end"}. Times come from the
+        segment's word timings when it has them, otherwise they are the segment's bounds.
+        """
+        words = segment.get("words")
+        if not words:
+            start = segment.get("start", 0)
+            end = segment.get("end", 0)
+            return [{"word": word, "start": start, "end": end} for word in self.find(segment.get("text", ""))]
+
+        # Whisper words carry their leading space, so joined they give back the segment text;
+        # each token is traced back to the word it starts in
+        word_starts = []
+        text = ""
+        for word in words:
+            word_starts.append(len(text))
+            text += word.get("word", "")
+        tokens, offsets, joined = _tokenize(text)
+        owners = [bisect_right(word_starts, offset) - 1 for offset in offsets]
+        return [
+            {
+                "word": " ".join(tokens[start:end]),
+                "start": float(words[owners[start]]["start"]),
+                "end": float(words[owners[end - 1]]["end"])
+            }
+            for start, end in self._match(tokens, joined)
+        ]
+
+
+def load_fillers(languages: str, lexicon_file: Optional[str] = None) -> List[str]:
+    """
+    Filler phrases for a comma-separated list of language codes. `lexicon_file` is a JSON
+    object of {language: [fillers]} that adds languages or replaces the built-in lists.
+    """
+    lexicons = dict(FILLER_LEXICONS)
+    if lexicon_file:
+        with open(lexicon_file, encoding="utf-8") as f:
+            lexicons.update(json.load(f))
+    fillers = []
+    for language in languages.split(","):
+        language = language.strip()
+        if not language:
+            continue
+        if language not in lexicons:
+            raise ValueError(f"Unknown filler lexicon '{language}'. Choose one of: {', '.join(sorted(lexicons))}")
+        fillers.extend(lexicons[language])
+    return fillers
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Pipeline instrumentation.
+JobMetrics times the stages of one job in the worker process running it and sums them up
+as a plain dict. The dict reaches the API process with the job's other updates; there it is
+attached to the job (/status) and observed into the Prometheus histograms served on /metrics.
+"""
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+
+# Job stages that end a job rather than start a stage
+FINAL_STAGES = ("done", "failed")
+
+STAGE_SECONDS = Histogram(
+    "listendrift_stage_duration_seconds", "Wall time of each pipeline stage", ["stage"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+)
+JOB_SECONDS = Histogram(
+    "listendrift_job_duration_seconds", "Wall time of a whole analysis, from decoding to the stored result",
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+)
+AUDIO_SECONDS = Histogram(
+    "listendrift_job_audio_seconds", "Length of the analyzed recordings",
+    buckets=(10, 30, 60, 120, 300, 600, 1200, 1800, 3600, 7200)
+)
+AUDIO_SECONDS_PROCESSED = Counter("listendrift_audio_processed_seconds", "Seconds of audio analyzed")
+REALTIME_FACTOR = Histogram(
+    "listendrift_realtime_factor", "Analysis wall time divided by the recording's length",
+    buckets=(0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 5)
+)
+QUEUE_WAIT_SECONDS = Histogram(
+    "listendrift_queue_wait_seconds", "Time jobs wait in the scheduler queue for a free worker",
+    buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600, 1800)
+)
+PEAK_RSS_BYTES = Histogram(
+    "listendrift_job_peak_rss_bytes", "Peak resident memory of the worker process during a job",
+    buckets=tuple(mb * 1024 * 1024 for mb in (256, 512, 768, 1024, 1536, 2048, 3072, 4096, 6144, 8192))
+)
+JOB_ERRORS = Counter("listendrift_job_errors", "Failed jobs by the stage they failed in", ["stage"])
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes (None where it can't be read)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # No /proc (macOS): fall back to the process's peak so far
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class JobMetrics:
+    """
+    Stage timings and resource use of one job. `on_stage` is a stage hook (see
+    main.stage_hooks): each stage lasts until the job enters the next one. Memory is sampled
+    at every stage change and, with a `sample_interval`, by a background thread in between.
+    """
+
+    def __init__(self, job_id: str, sample_interval: float = 0):
+        self.job_id = job_id
+        self.stages: Dict[str, float] = {}
+        self.audio_seconds: Optional[float] = None
+        self.current_stage: Optional[str] = None
+        self.peak_rss = current_rss()
+        self._started = time.perf_counter()
+        self._stage_started = None
+        self._finished = None
+        self._stop = threading.Event()
+        self._sampler = None
+        if sample_interval > 0 and self.peak_rss is not None:
+            self._sampler = threading.Thread(
+                target=self._sample_memory_every, args=(sample_interval,), name="job-memory", daemon=True
+            )
+            self._sampler.start()
+
+    def on_stage(self, job_id: str, stage: str):
+        if job_id != self.job_id:
+            return
+        now = time.perf_counter()
+        self._end_stage(now)
+        if stage in FINAL_STAGES:
+            self._finished = now
+        else:
+            self.current_stage = stage
+            self._stage_started = now
+        self._sample_memory()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time work that happens outside the job's own stage updates (e.g. pre-rendering the report)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0) + time.perf_counter() - start
+            self._sample_memory()
+
+    def stop(self):
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-friendly totals, as attached to the job and observed by observe_job."""
+        self._end_stage(time.perf_counter())
+        total = (self._finished or time.perf_counter()) - self._started
+        realtime_factor = None
+        if self.audio_seconds:
+            realtime_factor = round(total / self.audio_seconds, 4)
+        return {
+            "stages": {stage: round(seconds, 3) for stage, seconds in self.stages.items()},
+            "total_seconds": round(total, 3),
+            "audio_seconds": round(self.audio_seconds, 3) if self.audio_seconds is not None else None,
+            "realtime_factor": realtime_factor,
+            "peak_rss_mb": round(self.peak_rss / (1024 * 1024), 1) if self.peak_rss is not None else None
+        }
+
+    def _end_stage(self, now: float):
+        if self.current_stage is not None:
+            self.stages[self.current_stage] = self.stages.get(self.current_stage, 0) + now - self._stage_started
+            self.current_stage = None
+
+    def _sample_memory(self):
+        rss = current_rss()
+        if rss is not None and (self.peak_rss is None or rss > self.peak_rss):
+            self.peak_rss = rss
+
+    def _sample_memory_every(self, interval: float):
+        while not self._stop.wait(interval):
+            self._sample_memory()
+
+
+def observe_job(metrics: Dict[str, Any]):
+    """Record a finished job's JobMetrics summary (API process)."""
+    for stage, seconds in metrics.get("stages", {}).items():
+        STAGE_SECONDS.labels(stage).observe(seconds)
+    JOB_SECONDS.observe(metrics["total_seconds"])
+    if metrics.get("audio_seconds"):
+        AUDIO_SECONDS.observe(metrics["audio_seconds"])
+        AUDIO_SECONDS_PROCESSED.inc(metrics["audio_seconds"])
+    if metrics.get("realtime_factor") is not None:
+        REALTIME_FACTOR.observe(metrics["realtime_factor"])
+    if metrics.get("peak_rss_mb") is not None:
+        PEAK_RSS_BYTES.observe(metrics["peak_rss_mb"] * 1024 * 1024)
+
+
+def observe_stage(stage: str, seconds: float):
+    STAGE_SECONDS.labels(stage).observe(seconds)
+
+
+def observe_queue_wait(seconds: float):
+    QUEUE_WAIT_SECONDS.observe(seconds)
+
+
+def observe_error(stage: str):
+    JOB_ERRORS.labels(stage).inc()
+
+
+def timed_stage(stage: str, func, *args):
+    """Call func(*args) and observe its wall time as `stage` (for work done in the API process)."""
+    start = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        observe_stage(stage, time.perf_counter() - start)
+
+
+def render_metrics():
+    """(body, content type) of the /metrics response."""
+    return generate_latest(), CONTENT_TYPE_LATEST
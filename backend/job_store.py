@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+"""
+Job state storage.
+MemoryJobStore keeps jobs in a dict (single process only); SQLiteJobStore keeps them in an
+embedded WAL-mode database that every worker process and every uvicorn worker can share.
+Finished jobs expire `ttl` seconds after they complete.
+A running job's partial result is kept apart from its fields: each update only carries the
+segments scored since the previous one, and status reads never load it.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional
+
+FINISHED_STATUSES = ("done", "failed")
+
+
+class JobStore:
+    """Interface shared by the job store backends."""
+
+    # True when updates written by one process are visible to all others
+    shared = False
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+
+    def create(self, job_id: str, fields: Dict[str, Any]):
+        raise NotImplementedError
+
+    def get(self, job_id: str, include_result: bool = True) -> Optional[Dict[str, Any]]:
+        """Return the job's fields, or None if it doesn't exist or has expired."""
+        raise NotImplementedError
+
+    def update(self, job_id: str, fields: Dict[str, Any]):
+        """
+        Merge `fields` into the job's top-level fields. `partial` is merged into the job's
+        partial result instead, its `segments` appended to those already stored;
+        `partial=None` drops the partial result.
+        """
+        raise NotImplementedError
+
+    def get_partial(self, job_id: str, segment_offset: int = 0) -> Optional[Dict[str, Any]]:
+        """The job's partial result with only the segments from `segment_offset` on, or None."""
+        raise NotImplementedError
+
+    def delete(self, job_id: str):
+        raise NotImplementedError
+
+    def purge_expired(self) -> int:
+        """Delete expired jobs. Returns how many were removed."""
+        raise NotImplementedError
+
+    def _expires_at(self, fields):
+        if fields.get("status") in FINISHED_STATUSES:
+            return time.time() + self.ttl
+        return None
+
+
+class MemoryJobStore(JobStore):
+    def __init__(self, ttl: int):
+        super().__init__(ttl)
+        self._jobs = {}
+        self._expiry = {}
+        # job_id -> (partial fields, scored segments)
+        self._partials = {}
+        self._lock = threading.Lock()
+
+    def create(self, job_id, fields):
+        with self._lock:
+            self._jobs[job_id] = dict(fields)
+            self._set_expiry(job_id, fields)
+            self._partials.pop(job_id, None)
+
+    def get(self, job_id, include_result=True):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or self._is_expired(job_id):
+                return None
+            job = dict(job)
+        if not include_result:
+            job.pop("result", None)
+        return job
+
+    def update(self, job_id, fields):
+        fields = dict(fields)
+        has_partial = "partial" in fields
+        partial = fields.pop("partial", None)
+        with self._lock:
+            self._jobs.setdefault(job_id, {}).update(fields)
+            self._set_expiry(job_id, fields)
+            if partial is not None:
+                partial = dict(partial)
+                stored_fields, segments = self._partials.setdefault(job_id, ({}, []))
+                segments.extend(partial.pop("segments", []))
+                stored_fields.update(partial)
+            elif has_partial:
+                self._partials.pop(job_id, None)
+
+    def get_partial(self, job_id, segment_offset=0):
+        with self._lock:
+            if job_id not in self._jobs or self._is_expired(job_id) or job_id not in self._partials:
+                return None
+            stored_fields, segments = self._partials[job_id]
+            return dict(stored_fields, segments=segments[segment_offset:])
+
+    def delete(self, job_id):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+            self._expiry.pop(job_id, None)
+            self._partials.pop(job_id, None)
+
+    def purge_expired(self):
+        with self._lock:
+            expired = [job_id for job_id in self._expiry if self._is_expired(job_id)]
+            for job_id in expired:
+                self._jobs.pop(job_id, None)
+                self._expiry.pop(job_id, None)
+                self._partials.pop(job_id, None)
+        return len(expired)
+
+    def _set_expiry(self, job_id, fields):
+        expires_at = self._expires_at(fields)
+        if expires_at is not None:
+            self._expiry[job_id] = expires_at
+
+    def _is_expired(self, job_id):
+        expires_at = self._expiry.get(job_id)
+        return expires_at is not None and expires_at < time.time()
+
+
+class SQLiteJobStore(JobStore):
+    """
+    Jobs in a single SQLite table. The (potentially large) result and partial result are kept
+    in their own columns so status polling never has to parse them; partial segments get a
+    row each, so publishing a batch of them doesn't rewrite the ones before.
+    """
+
+    shared = True
+
+    def __init__(self, path: str, ttl: int):
+        super().__init__(ttl)
+        self.path = path
+        self._local = threading.local()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = self._conn()
+        # WAL lets readers (status polling) proceed while a worker is writing
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " job_id TEXT PRIMARY KEY,"
+            " data TEXT NOT NULL,"
+            " result TEXT,"
+            " expires_at REAL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS jobs_expires_at ON jobs (expires_at)")
+        # Databases created before partial results were split out lack the column
+        if "partial" not in {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}:
+            conn.execute("ALTER TABLE jobs ADD COLUMN partial TEXT")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS partial_segments ("
+            " job_id TEXT NOT NULL,"
+            " idx INTEGER NOT NULL,"
+            " data TEXT NOT NULL,"
+            " PRIMARY KEY (job_id, idx))"
+        )
+
+    def _conn(self):
+        # sqlite3 connections must not be shared between threads; keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def create(self, job_id, fields):
+        fields = dict(fields)
+        result = fields.pop("result", None)
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO jobs (job_id, data, result, expires_at) VALUES (?, ?, ?, ?)",
+            (job_id, json.dumps(fields, default=float), self._dump_result(result), self._expires_at(fields))
+        )
+        conn.execute("DELETE FROM partial_segments WHERE job_id = ?", (job_id,))
+
+    def get(self, job_id, include_result=True):
+        columns = "data, result, expires_at" if include_result else "data, NULL, expires_at"
+        row = self._conn().execute(f"SELECT {columns} FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        data, result, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            return None
+        job = json.loads(data)
+        if include_result:
+            job["result"] = json.loads(result) if result is not None else None
+        return job
+
+    def update(self, job_id, fields):
+        fields = dict(fields)
+        has_result = "result" in fields
+        result = fields.pop("result", None)
+        has_partial = "partial" in fields
+        partial = fields.pop("partial", None)
+        conn = self._conn()
+        # IMMEDIATE takes the write lock up front so concurrent read-modify-writes serialize
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT data, expires_at FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            data = json.loads(row[0]) if row else {}
+            data.update(fields)
+            expires_at = self._expires_at(fields) or (row[1] if row else None)
+            if row is None:
+                conn.execute(
+                    "INSERT INTO jobs (job_id, data, result, expires_at) VALUES (?, ?, ?, ?)",
+                    (job_id, json.dumps(data, default=float), self._dump_result(result), expires_at)
+                )
+            elif has_result:
+                conn.execute(
+                    "UPDATE jobs SET data = ?, result = ?, expires_at = ? WHERE job_id = ?",
+                    (json.dumps(data, default=float), self._dump_result(result), expires_at, job_id)
+                )
+            else:
+                conn.execute(
+                    "UPDATE jobs SET data = ?, expires_at = ? WHERE job_id = ?",
+                    (json.dumps(data, default=float), expires_at, job_id)
+                )
+            if has_partial:
+                self._update_partial(conn, job_id, partial)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _update_partial(conn, job_id, partial):
+        if partial is None:
+            conn.execute("UPDATE jobs SET partial = NULL WHERE job_id = ?", (job_id,))
+            conn.execute("DELETE FROM partial_segments WHERE job_id = ?", (job_id,))
+            return
+        partial = dict(partial)
+        segments = partial.pop("segments", [])
+        row = conn.execute("SELECT partial FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        stored_fields = json.loads(row[0]) if row and row[0] is not None else {}
+        stored_fields.update(partial)
+        conn.execute("UPDATE jobs SET partial = ? WHERE job_id = ?", (json.dumps(stored_fields, default=float), job_id))
+        if segments:
+            (first,) = conn.execute(
+                "SELECT COALESCE(MAX(idx) + 1, 0) FROM partial_segments WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            conn.executemany(
+                "INSERT INTO partial_segments (job_id, idx, data) VALUES (?, ?, ?)",
+                [(job_id, first + i, json.dumps(seg, default=float)) for i, seg in enumerate(segments)]
+            )
+
+    def get_partial(self, job_id, segment_offset=0):
+        conn = self._conn()
+        # One read transaction, so the fields and segments come from the same snapshot
+        conn.execute("BEGIN")
+        try:
+            row = conn.execute("SELECT partial, expires_at FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None or row[0] is None or (row[1] is not None and row[1] < time.time()):
+                return None
+            rows = conn.execute(
+                "SELECT data FROM partial_segments WHERE job_id = ? AND idx >= ? ORDER BY idx",
+                (job_id, segment_offset)
+            ).fetchall()
+        finally:
+            conn.execute("COMMIT")
+        return dict(json.loads(row[0]), segments=[json.loads(data) for (data,) in rows])
+
+    def delete(self, job_id):
+        conn = self._conn()
+        conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+        conn.execute("DELETE FROM partial_segments WHERE job_id = ?", (job_id,))
+
+    def purge_expired(self):
+        conn = self._conn()
+        cursor = conn.execute("DELETE FROM jobs WHERE expires_at < ?", (time.time(),))
+        conn.execute("DELETE FROM partial_segments WHERE job_id NOT IN (SELECT job_id FROM jobs)")
+        return cursor.rowcount
+
+    @staticmethod
+    def _dump_result(result):
+        return json.dumps(result, default=float) if result is not None else None
+
+
+def create_job_store(kind: str, path: str, ttl: int) -> JobStore:
+    if kind == "sqlite":
+        return SQLiteJobStore(path, ttl)
+    if kind == "memory":
+        return MemoryJobStore(ttl)
+    raise ValueError(f"Unknown job store '{kind}'. Choose 'sqlite' or 'memory'")
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Incremental analysis of a recording while it is still being made.
+The browser streams 16 kHz mono float32 PCM; energy is tracked per block as it arrives and
+speech is transcribed in rolling windows that end inside a pause. When the speaker stops,
+only the last window is left to transcribe before the regular analysis runs.
+"""
+
+import time
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+import librosa
+import numpy as np
+
+from audio_io import SAMPLE_RATE
+from fillers import FillerDetector
+from timeline import score_segments
+
+# Frames quieter than this many dB below the loudest frame count as silence (as in librosa.effects.split)
+SILENCE_TOP_DB = 30
+
+
+class LiveSession:
+    """
+    Audio and transcript state of one live recording.
+    Call everything from the event loop except `transcribe_next_window`, which plans and
+    transcribes a window on another thread; it may run alongside `add_audio`, but never twice at once.
+    """
+
+    def __init__(self, filler_detector: FillerDetector, sr: int = SAMPLE_RATE, window_sec: float = 8.0,
+                 max_window_sec: float = 20.0, hop_length: int = 512):
+        self.filler_detector = filler_detector
+        self.sr = sr
+        self.window = int(window_sec * sr)
+        self.max_window = int(max_window_sec * sr)
+        self.hop_length = hop_length
+        self.started_at = time.monotonic()
+
+        # Received audio, in a buffer that doubles when full so appending stays O(1) per sample
+        self._buffer = np.zeros(60 * sr, dtype=np.float32)
+        self.num_samples = 0
+        # Samples before this offset have been handed to the transcriber
+        self.transcribed_samples = 0
+        self.segments = []
+        self.filler_count = 0
+
+        # Block RMS, one value per hop_length samples
+        self._rms = []
+        self._rms_carry = np.zeros(0, dtype=np.float32)
+
+    @property
+    def duration(self) -> float:
+        return self.num_samples / self.sr
+
+    def add_audio(self, pcm: np.ndarray):
+        if len(pcm) == 0:
+            return
+        needed = self.num_samples + len(pcm)
+        if needed > len(self._buffer):
+            buffer = np.zeros(max(needed, 2 * len(self._buffer)), dtype=np.float32)
+            buffer[:self.num_samples] = self._buffer[:self.num_samples]
+            # Swap in the copy before num_samples grows (see audio())
+            self._buffer = buffer
+        self._buffer[self.num_samples:needed] = pcm
+        self.num_samples = needed
+
+        # Only the new samples are framed; a partial hop waits for the next block
+        samples = np.concatenate((self._rms_carry, pcm))
+        whole = len(samples) - len(samples) % self.hop_length
+        if whole:
+            frames = samples[:whole].reshape(-1, self.hop_length)
+            self._rms.extend(np.sqrt(np.mean(frames ** 2, axis=1)).tolist())
+        self._rms_carry = samples[whole:]
+
+    def audio(self) -> np.ndarray:
+        """All audio received so far (a view, not a copy)."""
+        # Length first: whichever buffer is current then holds at least that many samples
+        num_samples = self.num_samples
+        return self._buffer[:num_samples]
+
+    def has_window(self) -> bool:
+        """Whether enough audio is pending for next_window to be worth planning."""
+        return self.num_samples - self.transcribed_samples >= self.window
+
+    def next_window(self, final: bool = False) -> Optional[Tuple[int, np.ndarray]]:
+        """
+        The next stretch of untranscribed audio as (start sample, samples), or None if it's
+        not worth transcribing yet. Windows end in the middle of the last pause once at least
+        `window_sec` is pending; without a pause they are cut at `max_window_sec`.
+        With `final`, everything that is left is returned.
+        """
+        start = self.transcribed_samples
+        audio = self.audio()[start:]
+        pending = len(audio)
+        if pending <= 0 or (not final and pending < self.window):
+            return None
+
+        end = len(audio)
+        if not final:
+            intervals = librosa.effects.split(audio, top_db=SILENCE_TOP_DB)
+            # Midpoints of the gaps between speech, skipping any in the first half of the window
+            gaps = [
+                (prev_end + next_start) // 2
+                for (_, prev_end), (next_start, _) in zip(intervals[:-1], intervals[1:])
+                if (prev_end + next_start) // 2 >= self.window // 2
+            ]
+            if gaps:
+                end = int(gaps[-1])
+            elif pending >= self.max_window:
+                end = self.max_window
+            else:
+                return None
+
+        self.transcribed_samples = start + end
+        return start, audio[:end]
+
+    def transcribe_next_window(self, transcribe: Callable[[np.ndarray], Dict[str, Any]],
+                               final: bool = False) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """next_window and `transcribe` of its samples, for a worker thread. Returns (start, transcription) or None."""
+        window = self.next_window(final)
+        if window is None:
+            return None
+        return window[0], transcribe(window[1])
+
+    def add_transcription(self, start: int, transcription: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Store a window's segments on the absolute timeline. Returns them."""
+        offset = start / self.sr
+        new_segments = []
+        for seg in transcription.get("segments", []):
+            seg = dict(seg)
+            seg["id"] = len(self.segments) + len(new_segments)
+            seg["start"] = seg.get("start", 0) + offset
+            seg["end"] = seg.get("end", 0) + offset
+            new_segments.append(seg)
+            self.filler_count += self.filler_detector.count(seg.get("text", ""))
+        self.segments.extend(new_segments)
+        return new_segments
+
+    def transcription(self) -> Dict[str, Any]:
+        """Everything transcribed so far, in the openai-whisper result shape."""
+        return {
+            "text": "".join(seg.get("text", "") for seg in self.segments),
+            "segments": self.segments,
+            "language": "en"
+        }
+
+    def feedback(self, new_segments: Optional[List[Dict[str, Any]]] = None, recent_sec: float = 30) -> Dict[str, Any]:
+        """Live pace, filler, energy and pause indicators for the speaker."""
+        rms = np.asarray(self._rms)
+        hops_per_sec = self.sr / self.hop_length
+        energy = None
+        current_pause = 0.0
+        if len(rms):
+            # Energy of the last second relative to the session average
+            recent = rms[-max(1, int(hops_per_sec)):]
+            mean = rms.mean()
+            energy = float(recent.mean() / mean) if mean > 0 else 0.0
+            # Trailing quiet frames, against the same threshold librosa.effects.split uses
+            threshold = rms.max() * 10 ** (-SILENCE_TOP_DB / 20)
+            loud = np.flatnonzero(rms > threshold)
+            trailing = len(rms) - (loud[-1] + 1) if len(loud) else len(rms)
+            current_pause = trailing / hops_per_sec
+
+        # Pace and fillers over the most recent transcribed stretch
+        transcribed_until = self.transcribed_samples / self.sr
+        recent_segments = [seg for seg in self.segments if seg["end"] > transcribed_until - recent_sec]
+        recent_words = sum(len(seg.get("text", "").split()) for seg in recent_segments)
+        recent_span = (
+            recent_segments[-1]["end"] - recent_segments[0]["start"] if recent_segments else 0
+        )
+        filler_count = self.filler_count
+
+        feedback = {
+            "type": "feedback",
+            "elapsed": round(self.duration, 1),
+            "transcribed_until": round(transcribed_until, 1),
+            "wpm": round(recent_words / recent_span * 60, 1) if recent_span > 0 else None,
+            "filler_count": filler_count,
+            "filler_per_min": round(filler_count / transcribed_until * 60, 1) if transcribed_until > 0 else 0,
+            "energy": round(energy, 2) if energy is not None else None,
+            "current_pause": round(current_pause, 1)
+        }
+        if new_segments:
+            feedback["segments"] = score_segments(new_segments, self.filler_detector)
+        return feedback
@@ -1,62 +1,112 @@
 # -*- coding: utf-8 -*-
-from fastapi import FastAPI, UploadFile, File, BackgroundTasks
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 import asyncio
+import atexit
+import hmac
 import uuid
 import os
 import shutil
 import logging
-from typing import Dict, Any, List
-import whisper
+from typing import Callable, Dict, Any, List, Optional, Tuple
 import librosa
 import numpy as np
 import textstat
 import re
-import imageio_ffmpeg
-import shutil
 import gc
-import torch
+import json
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from pdf_generator import generate_detailed_report
+import config
+from audio_io import SAMPLE_RATE, PCMSpool, iter_pcm_blocks
+from transcription import create_backend
+from chunking import ChunkedTranscriber, plan_chunks
+import scheduler as job_scheduler
+from scheduler import JobScheduler, QueueFullError
+from streaming_features import analyze_blocks
+from uploads import InvalidUploadError, UploadTooLargeError, receive_multipart
+from batch import BatchTooLargeError, compare_recordings, extract_audio_files, is_zip
+from result_cache import ResultCache, cache_key
+from report_cache import ReportCache
+from job_store import create_job_store
+from events import JobEventBroker, format_sse
+from fillers import FillerDetector, load_fillers
+from instrumentation import (
+    JobMetrics, observe_error, observe_job, observe_queue_wait, render_metrics, timed_stage
+)
+from timeline import (
+    build_timeline, compute_segment_features, downsample_timeline, energy_curve, find_silence_sections,
+    load_segment_features, segment_feature_table, timeline_point_count
+)
+from partial_results import PartialResultPublisher
+from pcm_store import PCMStore
+from profiling import JobProfile, artifact_path, list_artifacts, profile_job, purge_profiles, should_profile
+from scoring import load_scoring_inputs, resolve_scoring_profile, scoring_inputs
+from live_analysis import LiveSession
+from starlette.concurrency import run_in_threadpool
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Configure FFMPEG path
-system_ffmpeg = shutil.which("ffmpeg")
+# Load the transcription model lazily to save memory on start
+_transcriber = None
 
-if system_ffmpeg:
-    ffmpeg_path = system_ffmpeg
-    logger.info(f"Using system FFMPEG at: {ffmpeg_path}")
-else:
-    # Copy to local directory fallback (mostly for Windows local dev)
-    original_ffmpeg = imageio_ffmpeg.get_ffmpeg_exe()
-    ffmpeg_path = os.path.abspath("ffmpeg.exe")
-    
-    if not os.path.exists(ffmpeg_path):
-        try:
-            shutil.copy(original_ffmpeg, ffmpeg_path)
-        except Exception as e:
-            logger.warning(f"Could not copy ffmpeg: {e}")
-            ffmpeg_path = original_ffmpeg # Fallback
-    
-    logger.info(f"Using FFMPEG binary at: {ffmpeg_path}")
+def get_transcriber():
+    global _transcriber
+    if _transcriber is None:
+        _transcriber = create_backend(
+            config.TRANSCRIPTION_BACKEND,
+            config.WHISPER_MODEL,
+            compute_type=config.WHISPER_COMPUTE_TYPE,
+            cpu_threads=config.WHISPER_CPU_THREADS,
+            word_timestamps=config.WHISPER_WORD_TIMESTAMPS
+        )
+    return _transcriber
+
+# Pool of chunk transcribers, started on the first long recording this worker sees
+_chunked_transcriber = None
+
+def get_chunked_transcriber():
+    global _chunked_transcriber
+    if _chunked_transcriber is None:
+        _chunked_transcriber = ChunkedTranscriber(
+            config.TRANSCRIPTION_BACKEND,
+            config.WHISPER_MODEL,
+            config.TRANSCRIPTION_CHUNK_WORKERS,
+            compute_type=config.WHISPER_COMPUTE_TYPE,
+            word_timestamps=config.WHISPER_WORD_TIMESTAMPS
+        )
+        # Stop the chunk workers with the process that started them
+        atexit.register(_chunked_transcriber.shutdown)
+    return _chunked_transcriber
+
+def init_analysis_worker():
+    """Runs once in every analysis worker process."""
+    if config.WHISPER_EAGER_LOAD:
+        get_transcriber().warm_up()
 
-# Load Whisper model lazily to save memory on start
-_model = None
 
-def get_model():
-    global _model
-    if _model is None:
-        logger.info("Loading Whisper model...")
-        _model = whisper.load_model("tiny", device="cpu")
-        logger.info("Whisper model loaded.")
-    return _model
+@asynccontextmanager
+async def lifespan(app):
+    job_events.bind(asyncio.get_running_loop())
+    scheduler.start()
+    purge_task = asyncio.create_task(purge_expired_jobs())
+    yield
+    purge_task.cancel()
+    scheduler.shutdown()
+    live_executor.shutdown(wait=False)
+    report_executor.shutdown(wait=False)
+    if _chunked_transcriber is not None:
+        _chunked_transcriber.shutdown()
 
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Configure CORS
 origins = [
@@ -74,907 +124,1346 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory storage for jobs
-jobs: Dict[str, Dict[str, Any]] = {}
+# Job state storage (SQLite by default so it survives restarts and is shared across processes)
+job_store = create_job_store(config.JOB_STORE, config.JOB_STORE_PATH, config.JOB_RESULT_TTL)
+
+# Live subscribers to job updates (/events)
+job_events = JobEventBroker()
+
+# Called as hook(job_id, stage) in the process running the job whenever it enters a
+# pipeline stage ("decoding", "transcribing", ..., "done"); used for per-stage timings
+stage_hooks: List[Callable[[str, str], None]] = []
+
+def update_job(job_id: str, **fields):
+    """
+    Update job fields. Shared stores are written directly; with the in-memory store,
+    updates made inside a worker process are forwarded to the API process.
+    Either way the API process is notified so /events subscribers hear about it.
+    """
+    if "stage" in fields:
+        for hook in stage_hooks:
+            hook(job_id, fields["stage"])
+    if job_store.shared:
+        job_store.update(job_id, fields)
+        # Subscribers read the result from the store, so don't ship it over the queue
+        fields = {key: value for key, value in fields.items() if key != "result"}
+        if not job_scheduler.publish(job_id, fields):
+            apply_job_update(job_id, fields)
+    elif not job_scheduler.publish(job_id, fields):
+        apply_job_update(job_id, fields)
+
+
+def apply_job_update(job_id: str, fields: Dict[str, Any]):
+    """Apply an update published by a worker process (or made in the API process)."""
+    if not job_store.shared:
+        job_store.update(job_id, fields)
+    if "metrics" in fields:
+        observe_job(fields["metrics"])
+    if fields.get("status") == "failed":
+        # Without failed_stage the worker process itself died
+        observe_error(fields.get("failed_stage", "worker"))
+    job_events.publish(job_id, fields)
+
+
+def record_worker_crash(job_id: str, fields: Dict[str, Any]):
+    """
+    Scheduler callback for a job whose worker process died. The worker never stored the
+    failure, so it is stored here, along with the unfinished recordings of a crashed batch.
+    """
+    fields = dict(fields, partial=None)
+    job = job_store.get(job_id, include_result=False)
+    if job is not None and job.get("type") == "batch":
+        for member in batch_members(job):
+            if member["status"] not in ("done", "failed"):
+                job_store.update(member["job_id"], fields)
+                job_events.publish(member["job_id"], fields)
+    update_job(job_id, **fields)
+
+
+def record_queue_wait(job_id: str, queue_wait: float):
+    """Scheduler callback for a job that just left the queue for a worker."""
+    observe_queue_wait(queue_wait)
+    job_store.update(job_id, {"queue_wait": round(queue_wait, 3)})
+
+
+async def purge_expired_jobs():
+    """Periodically drop finished jobs older than JOB_RESULT_TTL, and reports past their age or size budget."""
+    while True:
+        await asyncio.sleep(config.JOB_PURGE_INTERVAL)
+        try:
+            removed = await run_in_threadpool(job_store.purge_expired)
+            if removed:
+                logger.info(f"Purged {removed} expired job(s)")
+            await run_in_threadpool(report_cache.evict)
+            if pcm_store is not None:
+                await run_in_threadpool(pcm_store.evict)
+            await run_in_threadpool(purge_profiles, config.PROFILE_DIR, config.PROFILE_TTL)
+        except Exception as e:
+            logger.error(f"Failed to purge expired jobs: {e}", exc_info=True)
+
+
+# Filler words from the configured lexicons, matched in one pass per segment
+filler_detector = FillerDetector(load_fillers(config.FILLER_LEXICON, config.FILLER_LEXICON_FILE or None))
+
+# Bump whenever scoring/summary logic or the stored result's fields change, so cached
+# results are not reused (2: segment features, audience matrix, scoring profile and inputs;
+# 3: timeline points placed exactly as before vectorization)
+ANALYSIS_VERSION = 3
+
+result_cache = ResultCache(config.RESULT_CACHE_DIR, config.RESULT_CACHE_MAX_MB * 1024 * 1024)
+
+# Rendered PDF reports, shared by the API process (downloads) and workers (pre-rendering)
+report_cache = ReportCache(config.REPORT_DIR, config.REPORT_CACHE_MAX_MB * 1024 * 1024, config.REPORT_CACHE_TTL)
+# Decoded audio kept for re-analysis, keyed by content hash (RETAIN_AUDIO)
+pcm_store = (
+    PCMStore(config.RETAINED_AUDIO_DIR, config.RETAINED_AUDIO_TTL, config.RETAINED_AUDIO_DTYPE)
+    if config.RETAIN_AUDIO else None
+)
+
+def retained_audio_key(job_id: str, content_hash: Optional[str]) -> str:
+    """Recordings are retained by content, so re-uploads find them too; unhashed ones by job."""
+    return content_hash or job_id
+
+# ReportLab is CPU-bound; render on a few dedicated threads instead of the event loop
+report_executor = ThreadPoolExecutor(max_workers=config.REPORT_WORKERS, thread_name_prefix="report")
+
+def analysis_fingerprint(options: Dict[str, Any]) -> str:
+    """Everything besides the audio itself that changes the analysis result."""
+    return json.dumps({
+        "options": options,
+        "version": ANALYSIS_VERSION,
+        "backend": config.TRANSCRIPTION_BACKEND,
+        "model": config.WHISPER_MODEL,
+        "compute_type": config.WHISPER_COMPUTE_TYPE if config.TRANSCRIPTION_BACKEND == "faster-whisper" else None,
+        # Chunk boundaries can shift segmentation slightly, so chunked results are keyed separately
+        "chunk_sec": config.TRANSCRIPTION_CHUNK_SEC if config.TRANSCRIPTION_CHUNK_WORKERS > 0 else None,
+        "word_timestamps": config.WHISPER_WORD_TIMESTAMPS,
+        "fillers": filler_detector.fillers
+    }, sort_keys=True)
+
 
 class AnalysisResult(BaseModel):
     drop_risks: List[Dict[str, Any]]
     timeline: List[Dict[str, Any]]
     summary: Dict[str, Any]
 
-import subprocess
-
-def convert_to_wav(input_path: str, output_path: str):
-    """Converts input audio to WAV using the bundled FFMPEG binary."""
-    try:
-        command = [
-            ffmpeg_path,
-            "-y", # Overwrite output
-            "-i", input_path,
-            "-ar", "16000", # Convert to 16k Hz (good for Whisper/Analysis)
-            "-ac", "1", # Mono
-            output_path
-        ]
-        # Run ffmpeg command, suppressing output unless error
-        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
-        return True
-    except subprocess.CalledProcessError as e:
-        logger.error(f"FFMPEG failed: {e.stderr.decode()}")
-        raise Exception(f"Audio conversion failed: {e.stderr.decode()}")
-
-def analyze_audio_sync(job_id: str, file_path: str):
+def build_analysis_result(job_id: str, duration: float, rms: np.ndarray, silence_sections: List[Dict[str, float]],
+                          transcription: Dict[str, Any], options: Dict[str, Any],
+                          scoring_profile: Dict[str, Any] = None, segment_features: Dict[str, Any] = None,
+                          report_progress: bool = True) -> Dict[str, Any]:
     """
-    Performs the heavy lifting of audio/text analysis.
+    Everything after transcription: text analysis, timeline scoring and the summary.
+    Shared by uploaded files, live recording sessions and re-analysis (which passes the
+    stored `segment_features` and reports no progress).
     """
-    wav_path = file_path + ".wav"
-    try:
-        logger.info(f"Starting analysis for job {job_id}")
-        jobs[job_id]["status"] = "processing"
-        jobs[job_id]["progress"] = 5
-        
-        # --- 0. Pre-processing: Convert to WAV ---
-        # Librosa and Whisper can accept WAV reliably without complex backend detection
-        logger.info(f"Converting {file_path} to WAV...")
-        convert_to_wav(file_path, wav_path)
-        
-        jobs[job_id]["progress"] = 10
+    scoring_profile = scoring_profile or resolve_scoring_profile()
+    # Detect "Monotone" or "Low Energy" sections
+    # We'll normalize RMS and look for extended periods of low variance or low energy
+    rms_mean = np.mean(rms)
+    rms_std = np.std(rms)
+    # Threshold for "quiet/boring" could be refined
 
-        # --- 1. Audio Processing (Librosa) ---
-        # Load the WAV file
-        y, sr = librosa.load(wav_path, sr=16000) # We forced 16k in conversion
-        duration = librosa.get_duration(y=y, sr=sr)
-        
-        jobs[job_id]["progress"] = 15
-        
-        # Analyze RMS energy (volume/pacing indicators)
-        hop_length = 512
-        rms = librosa.feature.rms(y=y, hop_length=hop_length)[0]
-        times = librosa.times_like(rms, sr=sr, hop_length=hop_length)
-        
-        # Detect "Monotone" or "Low Energy" sections
-        # We'll normalize RMS and look for extended periods of low variance or low energy
-        rms_mean = np.mean(rms)
-        rms_std = np.std(rms)
-        # Threshold for "quiet/boring" could be refined
-        
-        jobs[job_id]["progress"] = 30
-
-        # --- 2. Transcription (Whisper) ---
-        # Model is now loaded lazily
-        jobs[job_id]["progress"] = 35
-        logger.info("Transcribing...")
-        
-        model = get_model()
-        # fp16=False is crucial for CPU execution
-        # Using torch.no_grad() to significantly reduce memory overhead
-        with torch.no_grad():
-            result = model.transcribe(
-                wav_path, 
-                fp16=False, 
-                language='en', 
-                beam_size=1, 
-                best_of=1, 
-                temperature=0.0,
-                condition_on_previous_text=False,
-                verbose=False
-            )
-        
-        # Explicitly clear memory after transcription
-        gc.collect()
-        
-        transcript_text = result["text"]
-        segments = result.get("segments", [])
-        
-        jobs[job_id]["progress"] = 60
+    transcript_text = transcription["text"]
+    segments = transcription.get("segments", [])
+    
+    if report_progress:
+        update_job(job_id, progress=60, stage="text_analysis")
         logger.info("Transcription complete. Analyzing text...")
-        
-        # --- 3. Text Analysis ---
-        # Filler words detection
-        filler_pattern = r'\b(um|uh|like|you know|so|actually|basically|literally)\b'
-        filler_matches = re.findall(filler_pattern, transcript_text.lower())
-        filler_count = len(filler_matches)
-        
-        # Jargon/complexity analysis
-        # Using Flesch Reading Ease - lower score = harder to read
-        reading_ease = textstat.flesch_reading_ease(transcript_text)
-        if reading_ease < 30:
-            jargon_density = "Very High"
-        elif reading_ease < 50:
-            jargon_density = "High"
-        elif reading_ease < 70:
-            jargon_density = "Medium"
+    
+    # --- 3. Text Analysis ---
+    # Per-segment features (pace, fillers, readability) are computed once and reused by the
+    # timeline, the summary and the PDF report
+    if segment_features is None:
+        segment_features = compute_segment_features(segments, filler_detector)
+    
+    # Filler words detection
+    filler_count = int(segment_features["fillers"].sum())
+    
+    # Jargon/complexity analysis
+    # Using Flesch Reading Ease - lower score = harder to read
+    reading_ease = textstat.flesch_reading_ease(transcript_text)
+    if reading_ease < 30:
+        jargon_density = "Very High"
+    elif reading_ease < 50:
+        jargon_density = "High"
+    elif reading_ease < 70:
+        jargon_density = "Medium"
+    else:
+        jargon_density = "Low"
+    
+    if report_progress:
+        update_job(job_id, progress=75, stage="timeline")
+    
+    
+    # --- 4. Build Timeline with Enhanced Analysis ---
+    # Create evenly-spaced timeline covering ENTIRE audio duration
+    # This ensures timeline matches exact audio length (e.g., 0:00 to 2:00 for 2-min audio)
+    
+    # Determine number of timeline points: ~5 sec apart by default (20-60 points),
+    # or a fixed interval that scales linearly with duration
+    num_timeline_points = timeline_point_count(
+        duration,
+        interval=options.get("timeline_interval") or config.TIMELINE_INTERVAL_SEC,
+        max_points=options.get("timeline_max_points") or config.TIMELINE_MAX_POINTS,
+        point_limit=config.TIMELINE_POINT_LIMIT
+    )
+    
+    # Calculate overall speech rate for comparison
+    total_words = len(transcript_text.split())
+    overall_speech_rate = (total_words / duration) * 60 if duration > 0 else 0
+    
+    # Timeline points are scored from the segment features with NumPy
+    timeline, drop_risks = build_timeline(
+        duration, segments, segment_features, rms, silence_sections, num_timeline_points, scoring_profile
+    )
+    
+    if report_progress:
+        update_job(job_id, progress=90, stage="summary")
+    
+    # --- 5. Generate Summary & Insights ---
+    # ALWAYS find the highest risk section from the ENTIRE timeline
+    # Even if no section exceeds 70%, we still want to show the worst moment
+    
+    max_risk_entry = None
+    if timeline:
+        # Find the timeline entry with the highest risk
+        max_timeline_entry = max(timeline, key=lambda x: x["risk"])
+        max_risk_value = max_timeline_entry["risk"]
+        max_risk_time = max_timeline_entry["time"]
+        
+        # Check if this point exists in drop_risks (>70%)
+        # If yes, use the detailed drop_risks entry
+        # If no, create an entry from the timeline data
+        if drop_risks:
+            max_risk_entry = max(drop_risks, key=lambda x: int(x["risk"].rstrip("%")))
         else:
-            jargon_density = "Low"
-        
-        jobs[job_id]["progress"] = 75
-        
-        
-        # --- 4. Build Timeline with Enhanced Analysis ---
-        # Create evenly-spaced timeline covering ENTIRE audio duration
-        # This ensures timeline matches exact audio length (e.g., 0:00 to 2:00 for 2-min audio)
-        
-        timeline = []
-        drop_risks = []
-        
-        # Determine number of timeline points (aim for ~5-10 second intervals)
-        num_timeline_points = max(20, min(60, int(duration / 5)))  # 20-60 points, ~5 sec apart
-        
-        # Calculate overall speech rate for comparison
-        total_words = len(transcript_text.split())
-        overall_speech_rate = (total_words / duration) * 60 if duration > 0 else 0
-        
-        # Detect silence/pause sections using librosa
-        # Get intervals where audio is below a threshold (silence detection)
-        non_silent_intervals = librosa.effects.split(y, top_db=30)  # 30dB threshold for silence
-        
-        # Create silence map for quick lookup
-        silence_sections = []
-        prev_end = 0
-        for interval in non_silent_intervals:
-            start_sample, end_sample = interval
-            start_time = librosa.samples_to_time(start_sample, sr=sr)
-            end_time = librosa.samples_to_time(end_sample, sr=sr)
+            # No sections >70%, but we still want to show the highest risk point
+            # Use the detailed analysis from the timeline entry
             
-            # Check if there's a gap (silence) before this interval
-            if start_time - prev_end > 2.0:  # Silence longer than 2 seconds
-                silence_sections.append({
-                    "start": prev_end,
-                    "end": start_time,
-                    "duration": start_time - prev_end
-                })
-            prev_end = end_time
-        
-        # Generate evenly-spaced timeline points with enhanced analysis
-        for i in range(num_timeline_points):
-            # Calculate time for this point
-            time_sec = (i / (num_timeline_points - 1)) * duration if num_timeline_points > 1 else 0
-            minutes = int(time_sec // 60)
-            seconds = int(time_sec % 60)
-            time_str = f"{minutes}:{seconds:02d}"
-            
-            # Calculate risk for this time point
-            base_risk = 20
-            risk_reasons = []
-            detailed_problems = []  # Store detailed problem descriptions
+            # Calculate end time (10 seconds after start)
+            time_parts = max_risk_time.split(":")
+            start_minutes = int(time_parts[0])
+            start_seconds = int(time_parts[1])
+            start_time_sec = start_minutes * 60 + start_seconds
+            end_time_sec = min(start_time_sec + 10, duration)
+            end_minutes = int(end_time_sec // 60)
+            end_seconds = int(end_time_sec % 60)
             
-            # Find corresponding audio segment (if any)
-            current_segment = None
-            segment_start_time = 0
-            segment_end_time = 0
+            # Use the DATA tied to this timeline point
+            max_risk_entry = {
+                "start": max_risk_time,
+                "end": f"{end_minutes}:{end_seconds:02d}",
+                "risk": f"{int(max_risk_value)}%",
+                "description": max_timeline_entry.get("detailed_problems", ["This is the highest risk point in your speech."])[0] if max_timeline_entry.get("detailed_problems") else "This is your weakest moment, but still acceptable.",
+                "reasons": max_timeline_entry.get("reasons", []),
+                "detailed_problems": max_timeline_entry.get("detailed_problems", []),
+                "segment_text": max_timeline_entry.get("segment_text", ""),
+                "risk_value": max_risk_value
+            }
+    
+    # --- 5.1 Enforce Specific Reasons for "Soft" Critical Moments ---
+    # If we have a max_risk_entry but NO reasons (because it didn't cross the high thresholds),
+    # we MUST find the "soft" reason why it was the highest risk point.
+    if max_risk_entry and not max_risk_entry.get("reasons"):
+        # Get the segment text if we don't have it
+        if not max_risk_entry.get("segment_text"):
+            # Find segment matching time
+            time_parts = max_risk_entry["start"].split(":")
+            start_sec = int(time_parts[0]) * 60 + int(time_parts[1])
             for seg in segments:
-                if seg.get("start", 0) <= time_sec <= seg.get("end", 0):
-                    current_segment = seg
-                    segment_start_time = seg.get("start", 0)
-                    segment_end_time = seg.get("end", 0)
-                    break
-            
-            # Analyze segment content if available
-            if current_segment:
-                text = current_segment.get("text", "").strip()
-                segment_duration = segment_end_time - segment_start_time
-                
-                # 1. SPEECH RATE ANALYSIS (per segment)
-                # Only flag SERIOUS speech rate issues
-                if len(text) > 0 and segment_duration > 0.5:  # Ignore very short segments
-                    segment_words = len(text.split())
-                    segment_speech_rate = (segment_words / segment_duration) * 60
-                    
-                    # Speaking TOO FAST (serious comprehension issue)
-                    # Only flag if SIGNIFICANTLY too fast (>220 wpm = serious problem)
-                    if segment_speech_rate > 220:
-                        base_risk += 35
-                        risk_reasons.append(f"speaking way too fast")
-                        detailed_problems.append(f"You spoke way too fast here ({segment_speech_rate:.0f} words/min). Listeners cannot keep up with this speed.")
-                    elif segment_speech_rate > 190:
-                        base_risk += 20
-                        risk_reasons.append(f"speaking too fast")
-                        detailed_problems.append(f"You spoke too fast here ({segment_speech_rate:.0f} words/min). It is hard to follow your points.")
-                    
-                    # Speaking TOO SLOW (serious boredom issue)
-                    # Only flag if SIGNIFICANTLY too slow (<90 wpm = serious problem)
-                    elif segment_speech_rate < 90:
-                        base_risk += 30
-                        risk_reasons.append(f"speaking way too slow")
-                        detailed_problems.append(f"You spoke way too slowly here (only {segment_speech_rate:.0f} words/min). The audience will get bored waiting for your next word.")
-                    elif segment_speech_rate < 110:
-                        base_risk += 15
-                        risk_reasons.append(f"speaking too slow")
-                        detailed_problems.append(f"You spoke a bit too slowly here ({segment_speech_rate:.0f} words/min). You risk losing the audience's interest.")
-                
-                # 2. FILLER WORDS ANALYSIS
-                # Only flag if SERIOUSLY excessive (5+ fillers in one segment = real problem)
-                segment_fillers = len(re.findall(filler_pattern, text.lower()))
-                if segment_fillers >= 5:
-                    base_risk += 30
-                    risk_reasons.append(f"too many filler words")
-                    detailed_problems.append(f"You used {segment_fillers} filler words ('um', 'uh', 'like') in this short clip. This makes you sound unsure of yourself.")
-                elif segment_fillers >= 3:
-                    base_risk += 15
-                    risk_reasons.append(f"several filler words")
-                    detailed_problems.append(f"You used {segment_fillers} filler words here. Try to pause silently instead of saying 'um' or 'uh'.")
-                
-                # 3. SENTENCE LENGTH ANALYSIS
-                # Only flag if SERIOUSLY too long (50+ words = real cognitive overload)
-                word_count = len(text.split())
-                if word_count > 50:
-                    base_risk += 30
-                    risk_reasons.append(f"extremely long section")
-                    detailed_problems.append(f"You spoke {word_count} words without a single pause. Listeners need a break to process this much information.")
-                elif word_count > 40:
-                    base_risk += 15
-                    risk_reasons.append(f"very long section")
-                    detailed_problems.append(f"This section is too long ({word_count} words) without a break. You need to pause to let your audience digest what you said.")
-                
-                # 4. LANGUAGE COMPLEXITY ANALYSIS
-                # Only flag if SERIOUSLY complex (reading ease < 30 = college level)
-                if len(text) > 20:  # Need enough text to analyze
-                    segment_reading_ease = textstat.flesch_reading_ease(text)
-                    if segment_reading_ease < 20:
-                        base_risk += 30
-                        risk_reasons.append("very difficult language")
-                        detailed_problems.append(f"You used very complicated words here. The audience likely didn't understand what you meant.")
-                    elif segment_reading_ease < 30:
-                        base_risk += 15
-                        risk_reasons.append("complex language")
-                        detailed_problems.append(f"The language here is dense and hard to follow. Try simpler words.")
-            
-            # 5. ENERGY/MONOTONE ANALYSIS
-            # Only flag if SERIOUSLY low energy
-            rms_idx = int((time_sec / duration) * len(rms)) if duration > 0 else 0
-            rms_idx = min(rms_idx, len(rms) - 1)
-            
-            if rms_idx < len(rms):
-                segment_rms = rms[rms_idx]
-                # Only flag SERIOUS energy drops
-                if segment_rms < rms_mean - (2.0 * rms_std):  # Very extreme drop
-                    base_risk += 35
-                    risk_reasons.append("extremely low energy")
-                    detailed_problems.append("Your voice became completely flat here. You stopped varying your pitch and volume, which sounds robotic.")
-                elif segment_rms < rms_mean - (1.5 * rms_std):
-                    base_risk += 20
-                    risk_reasons.append("low energy")
-                    detailed_problems.append("Your voice got much quieter and flatter here. It sounds like you lost interest in what you were saying.")
-            
-            # 6. SILENCE/PAUSE ANALYSIS
-            # Only flag SERIOUSLY long pauses (4+ seconds = awkward silence)
-            for silence in silence_sections:
-                if silence["start"] <= time_sec <= silence["end"]:
-                    silence_duration = silence["duration"]
-                    if silence_duration > 6:
-                        # Calculate time range for silence
-                        silence_start_min = int(silence["start"] // 60)
-                        silence_start_sec = int(silence["start"] % 60)
-                        silence_end_min = int(silence["end"] // 60)
-                        silence_end_sec = int(silence["end"] % 60)
-                        silence_time_range = f"{silence_start_min}:{silence_start_sec:02d} - {silence_end_min}:{silence_end_sec:02d}"
-                        
-                        base_risk += 65 # CRITICAL penalty for dead air
-                        risk_reasons.append(f"no speech detected ({silence_duration:.1f}s)")
-                        detailed_problems.append(f"⚠️ Long silence detected ({silence_duration:.1f}s). This dead air kills the momentum of your speech.")
-                    elif silence_duration > 4:
-                        # Calculate time range for silence
-                        silence_start_min = int(silence["start"] // 60)
-                        silence_start_sec = int(silence["start"] % 60)
-                        silence_end_min = int(silence["end"] // 60)
-                        silence_end_sec = int(silence["end"] % 60)
-                        silence_time_range = f"{silence_start_min}:{silence_start_sec:02d} - {silence_end_min}:{silence_end_sec:02d}"
-                        
-                        base_risk += 40 # HIGH penalty for long pauses
-                        risk_reasons.append(f"long silence ({silence_duration:.1f}s)")
-                        detailed_problems.append(f"🔇 Awkward pause ({silence_duration:.1f}s). This break is too long and feels unnatural.")
+                if seg.get("start", 0) <= start_sec <= seg.get("end", 0):
+                    max_risk_entry["segment_text"] = seg.get("text", "")
                     break
+        
+        segment_text = max_risk_entry.get("segment_text", "")
+        # Calculate local metrics for this specific segment to find deviation
+        if len(segment_text) > 5:
+            # Estimate duration (default 10s if not precise)
+            seg_duration = 10 
+            # Calculate simple WPM
+            words = len(segment_text.split())
+            local_wpm = (words / seg_duration) * 60
             
+            new_reasons = []
+            new_problems = []
             
-            # Cap at 100
-            risk = min(base_risk, 100)
-            
-            timeline_entry = {
-                "time": time_str,
-                "risk": risk,
-                "reasons": risk_reasons,
-                "detailed_problems": detailed_problems,
-                "segment_text": current_segment.get("text", "") if current_segment else ""
-            }
-            
-            # Track all high-risk sections (>70%) for analysis
-            # But we'll only show the HIGHEST risk one as the critical moment
-            if risk > 70:
-                # Build detailed description with exact problems
-                if current_segment:
-                    text = current_segment.get("text", "")
-                    transcript_preview = text[:100] + "..." if len(text) > 100 else text
-                    
-                    # Create comprehensive problem description
-                    if detailed_problems:
-                        issue_description = " ".join(detailed_problems)
-                        issue_description += f"\n\nTranscript: \"{transcript_preview}\""
-                    else:
-                        issue_description = f"Multiple issues detected. Transcript: \"{transcript_preview}\""
-                else:
-                    issue_description = " ".join(detailed_problems) if detailed_problems else "Critical attention drop detected."
-                
-                # Calculate end time (next 5-10 seconds)
-                end_time_sec = min(time_sec + 10, duration)
-                end_minutes = int(end_time_sec // 60)
-                end_seconds = int(end_time_sec % 60)
-                
-                drop_risks.append({
-                    "start": time_str,
-                    "end": f"{end_minutes}:{end_seconds:02d}",
-                    "risk": f"{risk}%",
-                    "description": issue_description,
-                    "reasons": risk_reasons,
-                    "detailed_problems": detailed_problems,
-                    "risk_value": risk,  # Store numeric value for comparison
-                    "segment_text": current_segment.get("text", "") if current_segment else ""
-                })
-            
-            timeline.append(timeline_entry)
-        
-        # After generating all timeline points, mark ONLY the highest risk point as critical
-        if drop_risks:
-            # Find the single most critical moment (highest risk)
-            most_critical = max(drop_risks, key=lambda x: x["risk_value"])
+            # Check for "Soft" deviations
+            if local_wpm < 130:
+                new_reasons.append("speaking too slow")
+                new_problems.append(f"This section is a bit slow ({int(local_wpm)} words/min). Ideally, pick up the pace slightly.")
+            elif local_wpm > 170:
+                new_reasons.append("speaking too fast") 
+                new_problems.append(f"You create a small speed spike here ({int(local_wpm)} words/min). Make sure to enunciate clearly.")
             
-            # Update timeline to mark only this point as critical
-            for entry in timeline:
-                if entry["time"] == most_critical["start"]:
-                    entry["label"] = "CRITICAL MOMENT - Maximum attention drop"
-                    break
-
-        
-        jobs[job_id]["progress"] = 90
-        
-        # --- 5. Generate Summary & Insights ---
-        # ALWAYS find the highest risk section from the ENTIRE timeline
-        # Even if no section exceeds 70%, we still want to show the worst moment
-        
-        max_risk_entry = None
-        if timeline:
-            # Find the timeline entry with the highest risk
-            max_timeline_entry = max(timeline, key=lambda x: x["risk"])
-            max_risk_value = max_timeline_entry["risk"]
-            max_risk_time = max_timeline_entry["time"]
+            # Check for silence using the timeline data we already have? 
+            # If we can't easily check silence here, rely on WPM and length.
             
-            # Check if this point exists in drop_risks (>70%)
-            # If yes, use the detailed drop_risks entry
-            # If no, create an entry from the timeline data
-            if drop_risks:
-                max_risk_entry = max(drop_risks, key=lambda x: int(x["risk"].rstrip("%")))
-            else:
-                # No sections >70%, but we still want to show the highest risk point
-                # Use the detailed analysis from the timeline entry
-                
-                # Calculate end time (10 seconds after start)
-                time_parts = max_risk_time.split(":")
-                start_minutes = int(time_parts[0])
-                start_seconds = int(time_parts[1])
-                start_time_sec = start_minutes * 60 + start_seconds
-                end_time_sec = min(start_time_sec + 10, duration)
-                end_minutes = int(end_time_sec // 60)
-                end_seconds = int(end_time_sec % 60)
-                
-                # Use the DATA tied to this timeline point
-                max_risk_entry = {
-                    "start": max_risk_time,
-                    "end": f"{end_minutes}:{end_seconds:02d}",
-                    "risk": f"{int(max_risk_value)}%",
-                    "description": max_timeline_entry.get("detailed_problems", ["This is the highest risk point in your speech."])[0] if max_timeline_entry.get("detailed_problems") else "This is your weakest moment, but still acceptable.",
-                    "reasons": max_timeline_entry.get("reasons", []),
-                    "detailed_problems": max_timeline_entry.get("detailed_problems", []),
-                    "segment_text": max_timeline_entry.get("segment_text", ""),
-                    "risk_value": max_risk_value
-                }
-        
-        # --- 5.1 Enforce Specific Reasons for "Soft" Critical Moments ---
-        # If we have a max_risk_entry but NO reasons (because it didn't cross the high thresholds),
-        # we MUST find the "soft" reason why it was the highest risk point.
-        if max_risk_entry and not max_risk_entry.get("reasons"):
-            # Get the segment text if we don't have it
-            if not max_risk_entry.get("segment_text"):
-                # Find segment matching time
-                time_parts = max_risk_entry["start"].split(":")
-                start_sec = int(time_parts[0]) * 60 + int(time_parts[1])
-                for seg in segments:
-                    if seg.get("start", 0) <= start_sec <= seg.get("end", 0):
-                        max_risk_entry["segment_text"] = seg.get("text", "")
-                        break
+            if len(segment_text.split()) > 40:
+                new_reasons.append("long explanation")
+                new_problems.append("This is a long sentence. A small pause would help here.")
             
-            segment_text = max_risk_entry.get("segment_text", "")
-            # Calculate local metrics for this specific segment to find deviation
-            if len(segment_text) > 5:
-                # Estimate duration (default 10s if not precise)
-                seg_duration = 10 
-                # Calculate simple WPM
-                words = len(segment_text.split())
-                local_wpm = (words / seg_duration) * 60
-                
-                new_reasons = []
-                new_problems = []
-                
-                # Check for "Soft" deviations
-                if local_wpm < 130:
-                    new_reasons.append("speaking too slow")
-                    new_problems.append(f"This section is a bit slow ({int(local_wpm)} words/min). Ideally, pick up the pace slightly.")
-                elif local_wpm > 170:
-                    new_reasons.append("speaking too fast") 
-                    new_problems.append(f"You create a small speed spike here ({int(local_wpm)} words/min). Make sure to enunciate clearly.")
-                
-                # Check for silence using the timeline data we already have? 
-                # If we can't easily check silence here, rely on WPM and length.
-                
-                if len(segment_text.split()) > 40:
-                    new_reasons.append("long explanation")
-                    new_problems.append("This is a long sentence. A small pause would help here.")
-                
-                # If still no reason, default to energy/monotone as safe bet if it's the "worst" part
-                if not new_reasons:
-                    new_reasons.append("energy dips")
-                    new_problems.append("Your energy dips slightly here compared to the rest of your speech. Keep the energy up!")
-                
-                # FORCE update the entry
-                max_risk_entry["reasons"] = new_reasons
-                max_risk_entry["detailed_problems"] = new_problems
-                max_risk_entry["description"] = new_problems[0]
-        
-        # Build detailed problematic section description in SIMPLE LANGUAGE
-        if max_risk_entry:
-            reasons = max_risk_entry.get("reasons", [])
-            detailed_problems = max_risk_entry.get("detailed_problems", [])
-            risk_value = int(max_risk_entry["risk"].rstrip("%"))
+            # If still no reason, default to energy/monotone as safe bet if it's the "worst" part
+            if not new_reasons:
+                new_reasons.append("energy dips")
+                new_problems.append("Your energy dips slightly here compared to the rest of your speech. Keep the energy up!")
             
-            # Create a simple, clear title based on the main problem
+            # FORCE update the entry
+            max_risk_entry["reasons"] = new_reasons
+            max_risk_entry["detailed_problems"] = new_problems
+            max_risk_entry["description"] = new_problems[0]
+    
+    # Build detailed problematic section description in SIMPLE LANGUAGE
+    if max_risk_entry:
+        reasons = max_risk_entry.get("reasons", [])
+        detailed_problems = max_risk_entry.get("detailed_problems", [])
+        risk_value = int(max_risk_entry["risk"].rstrip("%"))
+        
+        # Create a simple, clear title based on the main problem
+        if any("too fast" in r for r in reasons):
+            section_title = "You're Speaking Too Fast"
+        elif any("too slow" in r for r in reasons):
+            section_title = "You're Speaking Too Slow"
+        elif any("silence" in r or "pause" in r for r in reasons):
+            section_title = "Long Awkward Silence"
+        elif any("energy" in r for r in reasons):
+            section_title = "Your Voice Sounds Flat and Boring"
+        elif any("filler" in r for r in reasons):
+            section_title = "Too Many 'Um' and 'Uh' Words"
+        elif any("difficult" in r or "complex" in r for r in reasons):
+            section_title = "Using Words That Are Too Complicated"
+        elif any("long" in r for r in reasons):
+            section_title = "Talking Too Long Without a Break"
+        else:
+            section_title = "Attention Risk Detected"
+        
+        # Use the detailed problems (already in simple language) if available
+        if detailed_problems:
+            # Join all problems with clear separation
+            problematic_description = " ".join(detailed_problems)
+            # Add simple summary
+            problematic_description += f"\n\nThis is the biggest problem in your speech - fix this first to keep your audience engaged."
+        else:
+            # Fallback: Create simple description from reasons
             if any("too fast" in r for r in reasons):
-                section_title = "You're Speaking Too Fast"
+                problematic_description = "You're talking too quickly here. When you speak this fast, people can't keep up with what you're saying and they'll miss your important points."
+            
             elif any("too slow" in r for r in reasons):
-                section_title = "You're Speaking Too Slow"
+                problematic_description = "You're talking too slowly here. When the pace is this slow, people get bored and their minds start to wander."
+            
             elif any("silence" in r or "pause" in r for r in reasons):
-                section_title = "Long Awkward Silence"
+                problematic_description = "There's a long silence here. Pauses this long make people uncomfortable and break your flow."
+            
             elif any("energy" in r for r in reasons):
-                section_title = "Your Voice Sounds Flat and Boring"
+                problematic_description = "Your voice became quiet and flat here. When you lose vocal energy, your audience stops listening."
+            
             elif any("filler" in r for r in reasons):
-                section_title = "Too Many 'Um' and 'Uh' Words"
+                problematic_description = "You are saying 'um', 'uh', and 'like' too many times here. It breaks your flow."
+            
             elif any("difficult" in r or "complex" in r for r in reasons):
-                section_title = "Using Words That Are Too Complicated"
+                problematic_description = "You're using complicated words here. Use simpler, everyday language so everyone understands."
+            
             elif any("long" in r for r in reasons):
-                section_title = "Talking Too Long Without a Break"
-            else:
-                section_title = "Attention Risk Detected"
+                problematic_description = "This section is too long without a pause. Listeners can't absorb all this info at once."
             
-            # Use the detailed problems (already in simple language) if available
-            if detailed_problems:
-                # Join all problems with clear separation
-                problematic_description = " ".join(detailed_problems)
-                # Add simple summary
-                problematic_description += f"\n\nThis is the biggest problem in your speech - fix this first to keep your audience engaged."
             else:
-                # Fallback: Create simple description from reasons
-                if any("too fast" in r for r in reasons):
-                    problematic_description = "You're talking too quickly here. When you speak this fast, people can't keep up with what you're saying and they'll miss your important points."
-                
-                elif any("too slow" in r for r in reasons):
-                    problematic_description = "You're talking too slowly here. When the pace is this slow, people get bored and their minds start to wander."
-                
-                elif any("silence" in r or "pause" in r for r in reasons):
-                    problematic_description = "There's a long silence here. Pauses this long make people uncomfortable and break your flow."
-                
-                elif any("energy" in r for r in reasons):
-                    problematic_description = "Your voice became quiet and flat here. When you lose vocal energy, your audience stops listening."
-                
-                elif any("filler" in r for r in reasons):
-                    problematic_description = "You are saying 'um', 'uh', and 'like' too many times here. It breaks your flow."
-                
-                elif any("difficult" in r or "complex" in r for r in reasons):
-                    problematic_description = "You're using complicated words here. Use simpler, everyday language so everyone understands."
-                
-                elif any("long" in r for r in reasons):
-                    problematic_description = "This section is too long without a pause. Listeners can't absorb all this info at once."
-                
-                else:
-                    problematic_description = max_risk_entry.get("description", "There's a problem here that needs attention.")
-                
-                problematic_description += f"\n\nThis is the biggest improvement area in your recording."
-        else:
-            section_title = "No Serious Problems Found"
-            problematic_description = "Your speech looks good! No major issues that would cause your audience to lose attention."
-        
-        # --- ADVANCED ANALYSIS FOR SUGGESTIONS ---
-        
-        # Calculate speech rate (words per minute)
-        total_words = len(transcript_text.split())
-        speech_rate = (total_words / duration) * 60 if duration > 0 else 0
-        
-        # Calculate filler word density (fillers per minute)
-        filler_density = (filler_count / duration) * 60 if duration > 0 else 0
-        
-        # Analyze energy patterns
-        energy_variation_ratio = rms_std / rms_mean if rms_mean > 0 else 0
-        low_energy_sections = sum(1 for r in rms if r < rms_mean - rms_std)
-        low_energy_percentage = (low_energy_sections / len(rms)) * 100 if len(rms) > 0 else 0
-        
-        # Find patterns in high-risk sections
-        high_risk_count = len(drop_risks)
-        common_issues = []
-        if drop_risks:
-            all_reasons = []
-            for dr in drop_risks:
-                all_reasons.extend(dr.get("reasons", []))
+                problematic_description = max_risk_entry.get("description", "There's a problem here that needs attention.")
             
-            # Count issue frequency
-            issue_counts = {}
-            for reason in all_reasons:
-                if "filler" in reason:
-                    issue_counts["filler"] = issue_counts.get("filler", 0) + 1
-                elif "complex" in reason:
-                    issue_counts["complex"] = issue_counts.get("complex", 0) + 1
-                elif "long explanation" in reason:
-                    issue_counts["long"] = issue_counts.get("long", 0) + 1
-                elif "monotone" in reason or "energy" in reason:
-                    issue_counts["energy"] = issue_counts.get("energy", 0) + 1
+            problematic_description += f"\n\nThis is the biggest improvement area in your recording."
+    else:
+        section_title = "No Serious Problems Found"
+        problematic_description = "Your speech looks good! No major issues that would cause your audience to lose attention."
+    
+    # --- ADVANCED ANALYSIS FOR SUGGESTIONS ---
+    
+    # Calculate speech rate (words per minute)
+    total_words = len(transcript_text.split())
+    speech_rate = (total_words / duration) * 60 if duration > 0 else 0
+    
+    # Calculate filler word density (fillers per minute)
+    filler_density = (filler_count / duration) * 60 if duration > 0 else 0
+    
+    # Analyze energy patterns
+    energy_variation_ratio = rms_std / rms_mean if rms_mean > 0 else 0
+    low_energy_sections = sum(1 for r in rms if r < rms_mean - rms_std)
+    low_energy_percentage = (low_energy_sections / len(rms)) * 100 if len(rms) > 0 else 0
+    
+    # Find patterns in high-risk sections
+    high_risk_count = len(drop_risks)
+    common_issues = []
+    if drop_risks:
+        all_reasons = []
+        for dr in drop_risks:
+            all_reasons.extend(dr.get("reasons", []))
+        
+        # Count issue frequency
+        issue_counts = {}
+        for reason in all_reasons:
+            if "filler" in reason:
+                issue_counts["filler"] = issue_counts.get("filler", 0) + 1
+            elif "complex" in reason:
+                issue_counts["complex"] = issue_counts.get("complex", 0) + 1
+            elif "long explanation" in reason:
+                issue_counts["long"] = issue_counts.get("long", 0) + 1
+            elif "monotone" in reason or "energy" in reason:
+                issue_counts["energy"] = issue_counts.get("energy", 0) + 1
+        
+        # Identify most common issues
+        if issue_counts:
+            common_issues = sorted(issue_counts.items(), key=lambda x: x[1], reverse=True)
+    
+    # --- GENERATE INTELLIGENT SUGGESTIONS ---
+    suggestions = []
+    
+    # Priority 1: Address the CRITICAL MOMENT first with SPECIFIC, ACTIONABLE suggestions
+    if max_risk_entry:
+        reasons = max_risk_entry.get("reasons", [])
+        detailed_problems = max_risk_entry.get("detailed_problems", [])
+        critical_time = max_risk_entry["start"]
+        risk_value = int(max_risk_entry["risk"].rstrip("%"))
+        segment_text = max_risk_entry.get("segment_text", "")
+        
+        # Build specific recommendation for the critical moment based on exact issues
+        critical_title = f"🚨 Fix Critical Moment at {critical_time}"
+        
+        # Extract specific metrics from detailed_problems to give precise advice
+        # Determine primary issue and create targeted recommendation with EXACT STEPS
+        if any("too fast" in r or "way too fast" in r for r in reasons):
+            # Extract WPM if available
+            wpm_match = re.search(r'(\d+)\s+words per minute', detailed_problems[0] if detailed_problems else "")
+            current_wpm = wpm_match.group(1) if wpm_match else "high"
             
-            # Identify most common issues
-            if issue_counts:
-                common_issues = sorted(issue_counts.items(), key=lambda x: x[1], reverse=True)
-        
-        # --- GENERATE INTELLIGENT SUGGESTIONS ---
-        suggestions = []
+            critical_description = (
+                f"🎯 PROBLEM: {detailed_problems[0] if detailed_problems else 'You are speaking too fast here.'}\n\n"
+                f"✅ SOLUTION: Slow Down.\n"
+                f"1. Breathe after every sentence.\n"
+                f"2. Aim for 140-160 words per minute (you are much faster).\n"
+                f"3. Pause for 0.5 seconds between phrases."
+            )
         
-        # Priority 1: Address the CRITICAL MOMENT first with SPECIFIC, ACTIONABLE suggestions
-        if max_risk_entry:
-            reasons = max_risk_entry.get("reasons", [])
-            detailed_problems = max_risk_entry.get("detailed_problems", [])
-            critical_time = max_risk_entry["start"]
-            risk_value = int(max_risk_entry["risk"].rstrip("%"))
-            segment_text = max_risk_entry.get("segment_text", "")
-            
-            # Build specific recommendation for the critical moment based on exact issues
-            critical_title = f"🚨 Fix Critical Moment at {critical_time}"
-            
-            # Extract specific metrics from detailed_problems to give precise advice
-            # Determine primary issue and create targeted recommendation with EXACT STEPS
-            if any("too fast" in r or "way too fast" in r for r in reasons):
-                # Extract WPM if available
-                wpm_match = re.search(r'(\d+)\s+words per minute', detailed_problems[0] if detailed_problems else "")
-                current_wpm = wpm_match.group(1) if wpm_match else "high"
-                
-                critical_description = (
-                    f"🎯 PROBLEM: {detailed_problems[0] if detailed_problems else 'You are speaking too fast here.'}\n\n"
-                    f"✅ SOLUTION: Slow Down.\n"
-                    f"1. Breathe after every sentence.\n"
-                    f"2. Aim for 140-160 words per minute (you are much faster).\n"
-                    f"3. Pause for 0.5 seconds between phrases."
-                )
-            
-            elif any("too slow" in r or "way too slow" in r for r in reasons):
-                wpm_match = re.search(r'(\d+)\s+words per minute', detailed_problems[0] if detailed_problems else "")
-                current_wpm = wpm_match.group(1) if wpm_match else "low"
-                
-                critical_description = (
-                    f"🎯 PROBLEM: {detailed_problems[0] if detailed_problems else 'You are speaking too slowly here.'}\n\n"
-                    f"✅ SOLUTION: Speed Up and Add Energy.\n"
-                    f"1. Remove unnecessary pauses between words.\n"
-                    f"2. Stand up while recording to boost energy naturally.\n"
-                    f"3. Imagine you are excitedly telling a friend about this."
-                )
-            
-            elif any("pause" in r or "silence" in r or "no speech" in r for r in reasons):
-                # Extract silence duration
-                silence_match = re.search(r'(\d+\.?\d*)\s+second', detailed_problems[0] if detailed_problems else "")
-                silence_duration = silence_match.group(1) if silence_match else "several"
-                
-                critical_description = (
-                    f"🎯 PROBLEM: {detailed_problems[0] if detailed_problems else 'There is a long awkward silence here.'}\n\n"
-                    f"✅ SOLUTION: Remove the Dead Air.\n"
-                    f"1. Edit out the silence using your audio editor.\n"
-                    f"2. Or re-record and fill the gap with a transition phrase like 'Let me explain...'\n"
-                    f"3. Keep pauses under 2 seconds."
-                )
-            
-            elif any("energy" in r or "monotone" in r or "flat" in r for r in reasons):
-                critical_description = (
-                    f"🎯 PROBLEM: {detailed_problems[0] if detailed_problems else 'Your voice sounds flat and boring here.'}\n\n"
-                    f"✅ SOLUTION: Boost Your Vocal Energy.\n"
-                    f"1. Stand up and smile while recording (this automatically changes your tone).\n"
-                    f"2. Vary your pitch: Go higher on questions, lower on statements.\n"
-                    f"3. Emphasize key words by saying them slightly louder."
-                )
-            
-            elif any("filler" in r for r in reasons):
-                # Extract filler count
-                filler_match = re.search(r'(\d+)\s+times', detailed_problems[0] if detailed_problems else "")
-                filler_count_segment = filler_match.group(1) if filler_match else "multiple"
-                
-                critical_description = (
-                    f"🎯 PROBLEM: {detailed_problems[0] if detailed_problems else 'You are saying um, uh, and like too many times.'}\n\n"
-                    f"✅ SOLUTION: Pause Instead of Filler Words.\n"
-                    f"1. When you need to think, just stay silent for 1-2 seconds.\n"
-                    f"2. Silence sounds confident. 'Um' sounds unsure.\n"
-                    f"3. Re-record this section until you have zero filler words."
-                )
-            
-            elif any("difficult" in r or "complex" in r or "complicated" in r for r in reasons):
-                critical_description = (
-                    f"🎯 PROBLEM: {detailed_problems[0] if detailed_problems else 'You are using words that are too complicated.'}\n\n"
-                    f"✅ SOLUTION: Use Simpler Words.\n"
-                    f"1. Replace complex terms with everyday language.\n"
-                    f"2. Use shorter sentences.\n"
-                    f"3. Testing rule: Identify the hardest word and remove it."
-                )
-            
-            elif any("long" in r for r in reasons):
-                # Extract word count
-                word_match = re.search(r'(\d+)\s+word', detailed_problems[0] if detailed_problems else "")
-                word_count_segment = word_match.group(1) if word_match else "many"
-                
-                critical_description = (
-                    f"🎯 PROBLEM: {detailed_problems[0] if detailed_problems else 'This section is too long without any breaks.'}\n\n"
-                    f"✅ SOLUTION: Break It Down.\n"
-                    f"1. Add a pause after every main point.\n"
-                    f"2. Split long sentences into two shorter ones.\n"
-                    f"3. Give the audience 2 seconds to digest information before moving on."
-                )
+        elif any("too slow" in r or "way too slow" in r for r in reasons):
+            wpm_match = re.search(r'(\d+)\s+words per minute', detailed_problems[0] if detailed_problems else "")
+            current_wpm = wpm_match.group(1) if wpm_match else "low"
             
-            else:
-                # Multiple issues combined - give comprehensive advice
-                critical_description = (
-                    f"🎯 PROBLEM: {detailed_problems[0] if detailed_problems else 'Multiple issues detected here.'}\n\n"
-                    f"✅ SOLUTION: Simplify and Re-record.\n"
-                    f"1. Stand up and smile to fix energy.\n"
-                    f"2. Use simpler words to fix clarity.\n"
-                    f"3. Pause more often to fix pacing."
-                )
+            critical_description = (
+                f"🎯 PROBLEM: {detailed_problems[0] if detailed_problems else 'You are speaking too slowly here.'}\n\n"
+                f"✅ SOLUTION: Speed Up and Add Energy.\n"
+                f"1. Remove unnecessary pauses between words.\n"
+                f"2. Stand up while recording to boost energy naturally.\n"
+                f"3. Imagine you are excitedly telling a friend about this."
+            )
+        
+        elif any("pause" in r or "silence" in r or "no speech" in r for r in reasons):
+            # Extract silence duration
+            silence_match = re.search(r'(\d+\.?\d*)\s+second', detailed_problems[0] if detailed_problems else "")
+            silence_duration = silence_match.group(1) if silence_match else "several"
             
-            suggestions.append({
-                "title": critical_title,
-                "description": critical_description
-            })
+            critical_description = (
+                f"🎯 PROBLEM: {detailed_problems[0] if detailed_problems else 'There is a long awkward silence here.'}\n\n"
+                f"✅ SOLUTION: Remove the Dead Air.\n"
+                f"1. Edit out the silence using your audio editor.\n"
+                f"2. Or re-record and fill the gap with a transition phrase like 'Let me explain...'\n"
+                f"3. Keep pauses under 2 seconds."
+            )
         
+        elif any("energy" in r or "monotone" in r or "flat" in r for r in reasons):
+            critical_description = (
+                f"🎯 PROBLEM: {detailed_problems[0] if detailed_problems else 'Your voice sounds flat and boring here.'}\n\n"
+                f"✅ SOLUTION: Boost Your Vocal Energy.\n"
+                f"1. Stand up and smile while recording (this automatically changes your tone).\n"
+                f"2. Vary your pitch: Go higher on questions, lower on statements.\n"
+                f"3. Emphasize key words by saying them slightly louder."
+            )
         
-        # Priority 2: Speech Rate Analysis
-        if speech_rate < 110:
-            suggestions.append({
-                "title": "⚡ Increase Your Speaking Pace",
-                "description": f"You're speaking at {speech_rate:.0f} words/minute (optimal: 140-160 wpm). Slow pace causes attention drift. TIP: Practice with a metronome app, aim for 150 wpm. Mark your script to speed up boring sections."
-            })
-        elif speech_rate > 180:
-            suggestions.append({
-                "title": "🐌 Slow Down Your Delivery",
-                "description": f"You're speaking at {speech_rate:.0f} words/minute (optimal: 140-160 wpm). Too fast makes comprehension difficult. TIP: Add deliberate pauses after key points. Breathe between sentences."
-            })
-        elif 140 <= speech_rate <= 160:
-            suggestions.append({
-                "title": "✅ Perfect Speaking Pace",
-                "description": f"Your {speech_rate:.0f} wpm is in the optimal range (140-160 wpm). This pace maximizes comprehension and engagement. Keep it up!"
-            })
+        elif any("filler" in r for r in reasons):
+            # Extract filler count
+            filler_match = re.search(r'(\d+)\s+times', detailed_problems[0] if detailed_problems else "")
+            filler_count_segment = filler_match.group(1) if filler_match else "multiple"
+            
+            critical_description = (
+                f"🎯 PROBLEM: {detailed_problems[0] if detailed_problems else 'You are saying um, uh, and like too many times.'}\n\n"
+                f"✅ SOLUTION: Pause Instead of Filler Words.\n"
+                f"1. When you need to think, just stay silent for 1-2 seconds.\n"
+                f"2. Silence sounds confident. 'Um' sounds unsure.\n"
+                f"3. Re-record this section until you have zero filler words."
+            )
         
-        # Priority 3: Filler Word Analysis
-        if filler_density > 3:
-            suggestions.append({
-                "title": "🚫 Eliminate Filler Words",
-                "description": f"You're using {filler_density:.1f} filler words per minute ({filler_count} total). This screams nervousness. SOLUTION: (1) Record yourself daily for 2 minutes, (2) Count fillers, (3) Replace with 1-second silence. Goal: Under 2 fillers/minute."
-            })
-        elif filler_density > 1.5:
-            suggestions.append({
-                "title": "⚠️ Reduce Filler Words",
-                "description": f"Detected {filler_density:.1f} fillers/minute ({filler_count} total). Noticeable but fixable. TIP: When you feel 'um' coming, pause instead. Silence is powerful. Practice the 'pause technique' for 5 minutes daily."
-            })
-        elif filler_count > 0:
-            suggestions.append({
-                "title": "👍 Minimal Filler Words",
-                "description": f"Only {filler_count} filler words in {duration:.0f} seconds. Excellent control! You sound confident and prepared."
-            })
+        elif any("difficult" in r or "complex" in r or "complicated" in r for r in reasons):
+            critical_description = (
+                f"🎯 PROBLEM: {detailed_problems[0] if detailed_problems else 'You are using words that are too complicated.'}\n\n"
+                f"✅ SOLUTION: Use Simpler Words.\n"
+                f"1. Replace complex terms with everyday language.\n"
+                f"2. Use shorter sentences.\n"
+                f"3. Testing rule: Identify the hardest word and remove it."
+            )
         
-        # Priority 4: Energy & Vocal Variety
-        if energy_variation_ratio < 0.25:
-            suggestions.append({
-                "title": "🎤 Add Vocal Variety & Energy",
-                "description": f"Your vocal energy is too flat ({low_energy_percentage:.0f}% of speech is monotone). EXERCISE: Read your script aloud, marking words to EMPHASIZE, whisper, or shout. Vary pitch every 15 seconds. Record and compare."
-            })
-        elif low_energy_percentage > 40:
-            suggestions.append({
-                "title": "⚡ Boost Energy Levels",
-                "description": f"{low_energy_percentage:.0f}% of your speech has low energy. Audience hears this as boredom. QUICK FIX: Stand up while recording, smile (it changes your voice), and imagine you're talking to an excited friend."
-            })
+        elif any("long" in r for r in reasons):
+            # Extract word count
+            word_match = re.search(r'(\d+)\s+word', detailed_problems[0] if detailed_problems else "")
+            word_count_segment = word_match.group(1) if word_match else "many"
+            
+            critical_description = (
+                f"🎯 PROBLEM: {detailed_problems[0] if detailed_problems else 'This section is too long without any breaks.'}\n\n"
+                f"✅ SOLUTION: Break It Down.\n"
+                f"1. Add a pause after every main point.\n"
+                f"2. Split long sentences into two shorter ones.\n"
+                f"3. Give the audience 2 seconds to digest information before moving on."
+            )
         
-        # Priority 5: Language Complexity
-        if jargon_density == "Very High":
-            suggestions.append({
-                "title": "📚 Drastically Simplify Language",
-                "description": f"PROBLEM: Your words are too complicated (Score: {reading_ease:.0f}/100).\nSOLUTION: Use Everyday Words.\n1. Replace technical terms with simple words.\n2. Explain it like you're talking to a 12-year-old.\n3. Use examples for every hard concept."
-            })
-        elif jargon_density == "High":
-            suggestions.append({
-                "title": "📖 Simplify Your Language",
-                "description": f"PROBLEM: Your language is hard to follow (Score: {reading_ease:.0f}/100).\nSOLUTION: Define Hard Terms.\n1. If a word has 4+ syllables, avoid it.\n2. When using a technical term, explain it immediately.\n3. Use analogies: 'It's like...'"
-            })
-        elif jargon_density == "Medium":
-            suggestions.append({
-                "title": "✓ Good Language Balance",
-                "description": f"Your complexity is balanced (Score: {reading_ease:.0f}/100). You are easy to understand but still sound professional. tip: Keep clear specific examples."
-            })
+        else:
+            # Multiple issues combined - give comprehensive advice
+            critical_description = (
+                f"🎯 PROBLEM: {detailed_problems[0] if detailed_problems else 'Multiple issues detected here.'}\n\n"
+                f"✅ SOLUTION: Simplify and Re-record.\n"
+                f"1. Stand up and smile to fix energy.\n"
+                f"2. Use simpler words to fix clarity.\n"
+                f"3. Pause more often to fix pacing."
+            )
         
-        # Priority 6: Pattern-Based Suggestions
-        if common_issues:
-            top_issue = common_issues[0][0]
-            
-            if top_issue == "long" and common_issues[0][1] >= 2:
-                suggestions.append({
-                    "title": "✂️ Break Up Long Explanations",
-                    "description": f"You have {common_issues[0][1]} sections with 30+ word explanations. FORMULA: Explain (15 sec) → Example (10 sec) → Pause (2 sec) → Repeat. Use 'For instance...' to transition to examples."
-                })
-            
-            if top_issue == "energy" and common_issues[0][1] >= 3:
-                suggestions.append({
-                    "title": "🔋 Energy Drops Repeatedly",
-                    "description": f"Your energy drops {common_issues[0][1]} times. Pattern detected: You lose energy during explanations. FIX: Mark your script with 'ENERGY!' reminders before complex sections. Take a breath and amp up."
-                })
+        suggestions.append({
+            "title": critical_title,
+            "description": critical_description
+        })
+    
+    
+    # Priority 2: Speech Rate Analysis
+    if speech_rate < 110:
+        suggestions.append({
+            "title": "⚡ Increase Your Speaking Pace",
+            "description": f"You're speaking at {speech_rate:.0f} words/minute (optimal: 140-160 wpm). Slow pace causes attention drift. TIP: Practice with a metronome app, aim for 150 wpm. Mark your script to speed up boring sections."
+        })
+    elif speech_rate > 180:
+        suggestions.append({
+            "title": "🐌 Slow Down Your Delivery",
+            "description": f"You're speaking at {speech_rate:.0f} words/minute (optimal: 140-160 wpm). Too fast makes comprehension difficult. TIP: Add deliberate pauses after key points. Breathe between sentences."
+        })
+    elif 140 <= speech_rate <= 160:
+        suggestions.append({
+            "title": "✅ Perfect Speaking Pace",
+            "description": f"Your {speech_rate:.0f} wpm is in the optimal range (140-160 wpm). This pace maximizes comprehension and engagement. Keep it up!"
+        })
+    
+    # Priority 3: Filler Word Analysis
+    if filler_density > 3:
+        suggestions.append({
+            "title": "🚫 Eliminate Filler Words",
+            "description": f"You're using {filler_density:.1f} filler words per minute ({filler_count} total). This screams nervousness. SOLUTION: (1) Record yourself daily for 2 minutes, (2) Count fillers, (3) Replace with 1-second silence. Goal: Under 2 fillers/minute."
+        })
+    elif filler_density > 1.5:
+        suggestions.append({
+            "title": "⚠️ Reduce Filler Words",
+            "description": f"Detected {filler_density:.1f} fillers/minute ({filler_count} total). Noticeable but fixable. TIP: When you feel 'um' coming, pause instead. Silence is powerful. Practice the 'pause technique' for 5 minutes daily."
+        })
+    elif filler_count > 0:
+        suggestions.append({
+            "title": "👍 Minimal Filler Words",
+            "description": f"Only {filler_count} filler words in {duration:.0f} seconds. Excellent control! You sound confident and prepared."
+        })
+    
+    # Priority 4: Energy & Vocal Variety
+    if energy_variation_ratio < 0.25:
+        suggestions.append({
+            "title": "🎤 Add Vocal Variety & Energy",
+            "description": f"Your vocal energy is too flat ({low_energy_percentage:.0f}% of speech is monotone). EXERCISE: Read your script aloud, marking words to EMPHASIZE, whisper, or shout. Vary pitch every 15 seconds. Record and compare."
+        })
+    elif low_energy_percentage > 40:
+        suggestions.append({
+            "title": "⚡ Boost Energy Levels",
+            "description": f"{low_energy_percentage:.0f}% of your speech has low energy. Audience hears this as boredom. QUICK FIX: Stand up while recording, smile (it changes your voice), and imagine you're talking to an excited friend."
+        })
+    
+    # Priority 5: Language Complexity
+    if jargon_density == "Very High":
+        suggestions.append({
+            "title": "📚 Drastically Simplify Language",
+            "description": f"PROBLEM: Your words are too complicated (Score: {reading_ease:.0f}/100).\nSOLUTION: Use Everyday Words.\n1. Replace technical terms with simple words.\n2. Explain it like you're talking to a 12-year-old.\n3. Use examples for every hard concept."
+        })
+    elif jargon_density == "High":
+        suggestions.append({
+            "title": "📖 Simplify Your Language",
+            "description": f"PROBLEM: Your language is hard to follow (Score: {reading_ease:.0f}/100).\nSOLUTION: Define Hard Terms.\n1. If a word has 4+ syllables, avoid it.\n2. When using a technical term, explain it immediately.\n3. Use analogies: 'It's like...'"
+        })
+    elif jargon_density == "Medium":
+        suggestions.append({
+            "title": "✓ Good Language Balance",
+            "description": f"Your complexity is balanced (Score: {reading_ease:.0f}/100). You are easy to understand but still sound professional. tip: Keep clear specific examples."
+        })
+    
+    # Priority 6: Pattern-Based Suggestions
+    if common_issues:
+        top_issue = common_issues[0][0]
         
-        # Priority 7: Overall Performance Summary
-        if not max_risk_entry and filler_count < 3 and 140 <= speech_rate <= 160:
+        if top_issue == "long" and common_issues[0][1] >= 2:
             suggestions.append({
-                "title": "🌟 Excellent Overall Performance",
-                "description": f"Strong fundamentals: Good pace ({speech_rate:.0f} wpm), minimal fillers, clear language. To reach expert level: Add more vocal variety and strategic pauses for emphasis."
+                "title": "✂️ Break Up Long Explanations",
+                "description": f"You have {common_issues[0][1]} sections with 30+ word explanations. FORMULA: Explain (15 sec) → Example (10 sec) → Pause (2 sec) → Repeat. Use 'For instance...' to transition to examples."
             })
         
-        # Ensure we have 3-5 suggestions (most actionable ones)
-        if len(suggestions) < 3:
+        if top_issue == "energy" and common_issues[0][1] >= 3:
             suggestions.append({
-                "title": "📈 Keep Practicing",
-                "description": "Your speech shows good fundamentals. Focus on consistency: Record yourself weekly, track your filler count and speaking pace, and gradually increase vocal variety."
+                "title": "🔋 Energy Drops Repeatedly",
+                "description": f"Your energy drops {common_issues[0][1]} times. Pattern detected: You lose energy during explanations. FIX: Mark your script with 'ENERGY!' reminders before complex sections. Take a breath and amp up."
             })
+    
+    # Priority 7: Overall Performance Summary
+    if not max_risk_entry and filler_count < 3 and 140 <= speech_rate <= 160:
+        suggestions.append({
+            "title": "🌟 Excellent Overall Performance",
+            "description": f"Strong fundamentals: Good pace ({speech_rate:.0f} wpm), minimal fillers, clear language. To reach expert level: Add more vocal variety and strategic pauses for emphasis."
+        })
+    
+    # Ensure we have 3-5 suggestions (most actionable ones)
+    if len(suggestions) < 3:
+        suggestions.append({
+            "title": "📈 Keep Practicing",
+            "description": "Your speech shows good fundamentals. Focus on consistency: Record yourself weekly, track your filler count and speaking pace, and gradually increase vocal variety."
+        })
 
-        
-        summary = {
-            "drop_risk": max_risk_entry["risk"] if max_risk_entry else "Low",
-            "jargon_density": jargon_density,
-            "filler_words": str(filler_count),
-            "speech_rate": overall_speech_rate,
-            "reading_ease": reading_ease,
-            "suggestions": suggestions[:5],  # Limit to top 5 suggestions
-            "problematic_section": {
-                "range": f"{max_risk_entry['start']} - {max_risk_entry['end']}" if max_risk_entry else "N/A",
-                "title": section_title,
-                "description": problematic_description
+    
+    summary = {
+        "drop_risk": max_risk_entry["risk"] if max_risk_entry else "Low",
+        "jargon_density": jargon_density,
+        "filler_words": str(filler_count),
+        "speech_rate": overall_speech_rate,
+        "reading_ease": reading_ease,
+        "suggestions": suggestions[:5],  # Limit to top 5 suggestions
+        "problematic_section": {
+            "range": f"{max_risk_entry['start']} - {max_risk_entry['end']}" if max_risk_entry else "N/A",
+            "title": section_title,
+            "description": problematic_description
+        },
+        "insights": {
+            "jargon": {
+                "title": f"{jargon_density} Jargon Density",
+                "desc": f"Readability score: {reading_ease:.1f}. " + 
+                       ("Consider simplifying." if reading_ease < 50 else "Good clarity!")
+            },
+            "explanation": {
+                "title": "Speech Duration",
+                "desc": f"Total duration: {int(duration // 60)}:{int(duration % 60):02d}"
             },
-            "insights": {
-                "jargon": {
-                    "title": f"{jargon_density} Jargon Density",
-                    "desc": f"Readability score: {reading_ease:.1f}. " + 
-                           ("Consider simplifying." if reading_ease < 50 else "Good clarity!")
-                },
-                "explanation": {
-                    "title": "Speech Duration",
-                    "desc": f"Total duration: {int(duration // 60)}:{int(duration % 60):02d}"
-                },
-                "monotone": {
-                    "title": "Energy Analysis",
-                    "desc": f"Average energy: {rms_mean:.3f}, variation: {rms_std:.3f}"
-                },
-                "fillers": {
-                    "title": f"{filler_count} Filler Words",
-                    "desc": "Great job!" if filler_count < 5 else f"Try to reduce usage of 'um', 'like', etc."
-                }
+            "monotone": {
+                "title": "Energy Analysis",
+                "desc": f"Average energy: {rms_mean:.3f}, variation: {rms_std:.3f}"
+            },
+            "fillers": {
+                "title": f"{filler_count} Filler Words",
+                "desc": "Great job!" if filler_count < 5 else f"Try to reduce usage of 'um', 'like', etc."
             }
         }
+    }
+    
+    
+    # --- 6. Store Result ---
+    # Send ONLY the single most critical moment (highest risk), not all high-risk sections
+    # This ensures "Critical Moment Detected" shows the exact short window, not entire timeline
+    critical_moments = []
+    if max_risk_entry:
+        # Send only the HIGHEST risk moment
+        critical_moments = [max_risk_entry]
+    else:
+        # No critical moment found
+        critical_moments = [{
+            "start": "0:00",
+            "end": "0:00",
+            "risk": "Low",
+            "description": "No critical sections detected. Your speech maintains good audience attention throughout."
+        }]
+    
+    result = {
+        "drop_risks": critical_moments,  # Only the SINGLE most critical moment
+        "timeline": timeline,
+        "summary": summary,
+        # Store detailed data for PDF generation
+        "segments": segments,  # For filler word and complex language analysis
+        "segment_features": segment_feature_table(segment_features),  # Per-segment metrics for reports
+        "transcript": transcript_text,  # Full transcript
+        "duration": duration,  # Total duration
+        "fillers": filler_detector.fillers,  # Filler lexicon the result was analyzed with
+        # What /reanalyze needs to score the recording again without the audio
+        "scoring_profile": scoring_profile,
+        "scoring_inputs": scoring_inputs(rms, silence_sections),
+        "timeline_options": options
+    }
+    
+    # Long, fine-grained timelines also get a small peak-preserving view for the chart
+    if len(timeline) > config.TIMELINE_LOD_POINTS:
+        result["timeline_lod"] = downsample_timeline(timeline, config.TIMELINE_LOD_POINTS)
+    
+    # Every audience profile is scored now, so switching audience later is a lookup
+    result["audiences"] = generate_audience_matrix(job_id, result)
+    return result
+
+def analyze_audio_sync(job_id: str, file_path: str, cache_key: str = None, options: Dict[str, Any] = None,
+                       filename: str = None, profile: bool = False, audio_key: str = None):
+    """
+    Performs the heavy lifting of audio/text analysis.
+    When `cache_key` is given, the finished result is stored in the result cache under it.
+    `options` may set "timeline_interval" (seconds) and/or "timeline_max_points".
+    With REPORT_PRERENDER, the default PDF report is rendered as soon as the result is stored.
+    With `profile`, a CPU and memory profile of the job is written to PROFILE_DIR.
+    With RETAIN_AUDIO, the decoded audio is kept under `audio_key`, and audio retained
+    under it before is read instead of decoding the file again.
+    Returns the result, or None if the analysis failed.
+    """
+    options = options or {}
+    # Stage timings and memory use, attached to the job and exported on /metrics
+    job_metrics = JobMetrics(job_id, config.JOB_MEMORY_SAMPLE_INTERVAL)
+    stage_hooks.append(job_metrics.on_stage)
+    job_profile = None
+    if profile:
+        job_profile = JobProfile(job_id, "analysis", config.PROFILE_DIR, config.PROFILE_INTERVAL_MS / 1000)
+        # Memory snapshots at every stage change
+        stage_hooks.append(job_profile.on_stage)
+        job_profile.start()
+    spool = None
+    try:
+        logger.info(f"Starting analysis for job {job_id}")
+        update_job(job_id, status="processing", progress=5, stage="decoding")
+        
+        # --- 0. Pre-processing: Decode once ---
+        # ffmpeg streams 16k mono float32 PCM in blocks; RMS frames are computed as they arrive.
+        # The PCM itself is only kept for Whisper: in memory for short recordings,
+        # memory-mapped from a temporary file for long ones, or in the retained audio store
+        retain = pcm_store is not None and audio_key is not None
+        retained = pcm_store.open(audio_key) if retain else None
+        if retained is not None:
+            logger.info(f"Using retained audio {audio_key} instead of decoding {file_path}")
+            features = analyze_blocks(pcm_store.blocks(retained, 10 * SAMPLE_RATE), SAMPLE_RATE)
+        else:
+            logger.info(f"Decoding {file_path}...")
+            if retain:
+                spool = pcm_store.writer(audio_key)
+            else:
+                spool = PCMSpool(f"{file_path}.pcm", config.AUDIO_IN_MEMORY_MAX_SEC * SAMPLE_RATE * 4)
+            features = analyze_blocks(iter_pcm_blocks(file_path), SAMPLE_RATE, spool)
+        sr = SAMPLE_RATE
         
+        update_job(job_id, progress=10, stage="audio_analysis")
+
+        # --- 1. Audio Processing (Librosa) ---
+        duration = features.duration
+        job_metrics.audio_seconds = duration
+        
+        update_job(job_id, progress=15)
+        
+        # RMS energy (volume/pacing indicators), one value per 512-sample frame
+        rms = features.rms
+        
+        # Detect silence/pause sections from the frame energies (same result as librosa.effects.split)
+        # Non-silent intervals are reused for chunked transcription and for pause detection
+        non_silent_intervals = features.non_silent_intervals(top_db=30)  # 30dB threshold for silence
+        silence_sections = find_silence_sections(non_silent_intervals, sr)
+        
+        # Energy curve and silence map are final already; publish them before transcription starts
+        partial = None
+        if config.PARTIAL_RESULTS:
+            partial = PartialResultPublisher(
+                lambda fields: update_job(job_id, **fields),
+                filler_detector,
+                min_interval=config.PARTIAL_RESULT_INTERVAL
+            )
+            partial.set_audio(duration, energy_curve(rms, duration, config.TIMELINE_LOD_POINTS), silence_sections)
         
-        # --- 6. Store Result ---
-        # Send ONLY the single most critical moment (highest risk), not all high-risk sections
-        # This ensures "Critical Moment Detected" shows the exact short window, not entire timeline
-        critical_moments = []
-        if max_risk_entry:
-            # Send only the HIGHEST risk moment
-            critical_moments = [max_risk_entry]
+        update_job(job_id, progress=30)
+
+        # --- 2. Transcription (Whisper) ---
+        # Model is now loaded lazily
+        update_job(job_id, progress=35, stage="transcribing")
+        logger.info("Transcribing...")
+        
+        on_segments = partial.add_segments if partial is not None else None
+        y = pcm_store.as_float32(retained) if retained is not None else spool.array()
+        retained = None
+        if config.TRANSCRIPTION_CHUNK_WORKERS > 0 and duration >= config.CHUNKED_TRANSCRIPTION_MIN_SEC:
+            # Long recording: transcribe silence-aligned chunks in parallel
+            chunks = plan_chunks(
+                non_silent_intervals, len(y), sr,
+                target_sec=config.TRANSCRIPTION_CHUNK_SEC,
+                max_sec=2 * config.TRANSCRIPTION_CHUNK_SEC
+            )
+            transcription = get_chunked_transcriber().transcribe(y, chunks, sr, on_segments=on_segments)
         else:
-            # No critical moment found
-            critical_moments = [{
-                "start": "0:00",
-                "end": "0:00",
-                "risk": "Low",
-                "description": "No critical sections detected. Your speech maintains good audience attention throughout."
-            }]
+            transcription = get_transcriber().transcribe(y, on_segments=on_segments)
+        if partial is not None:
+            partial.flush()
         
-        jobs[job_id]["result"] = {
-            "drop_risks": critical_moments,  # Only the SINGLE most critical moment
-            "timeline": timeline,
-            "summary": summary,
-            # Store detailed data for PDF generation
-            "segments": segments,  # For filler word and complex language analysis
-            "transcript": transcript_text,  # Full transcript
-            "duration": duration,  # Total duration
-            "filler_pattern": filler_pattern  # Filler word regex pattern
-        }
-
+        # Explicitly clear memory after transcription (and let go of the audio's memory map)
+        y = None
+        gc.collect()
         
-        jobs[job_id]["status"] = "done"
-        jobs[job_id]["progress"] = 100
+        result = build_analysis_result(job_id, duration, rms, silence_sections, transcription, options)
+
+        if cache_key:
+            try:
+                result_cache.put(cache_key, result)
+            except Exception as e:
+                logger.warning(f"Could not cache result for job {job_id}: {e}")
+
+        update_job(job_id, result=result, partial=None, status="done", progress=100, stage="done")
         logger.info(f"Analysis complete for job {job_id}")
 
+        if config.REPORT_PRERENDER:
+            try:
+                with job_metrics.stage("report"):
+                    render_report(job_id, result, filename or "audio.mp3")
+            except Exception as e:
+                logger.warning(f"Could not pre-render report for job {job_id}: {e}")
+        return result
+
     except Exception as e:
         logger.error(f"Error processing job {job_id}: {e}", exc_info=True)
-        jobs[job_id]["status"] = "failed"
-        jobs[job_id]["error"] = str(e)
+        update_job(job_id, status="failed", stage="failed", failed_stage=job_metrics.current_stage or "decoding",
+                   error=str(e), partial=None)
     finally:
         # Cleanup temp file
         if os.path.exists(file_path):
             os.remove(file_path)
-        if os.path.exists(wav_path):
-            os.remove(wav_path)
+        if spool is not None:
+            spool.cleanup()
+        if job_profile is not None:
+            stage_hooks.remove(job_profile.on_stage)
+            job_profile.finish()
+        stage_hooks.remove(job_metrics.on_stage)
+        job_metrics.stop()
+        update_job(job_id, metrics=job_metrics.summary())
+
+def analyze_batch_sync(batch_id: str, items: List[Tuple[str, str, Optional[str], str, str]],
+                       options: Dict[str, Any] = None):
+    """
+    Analyze the recordings of a batch back to back in one worker, so the model is loaded
+    once and stays warm between them. `items` are (job_id, file_path, cache_key, filename, audio_key).
+    Each recording updates its own job; the batch record only tracks the batch as a whole.
+    Recordings are profiled at PROFILE_SAMPLE_RATE like single uploads.
+    """
+    update_job(batch_id, status="processing")
+    for job_id, file_path, key, filename, audio_key in items:
+        analyze_audio_sync(
+            job_id, file_path, key, options, filename, should_profile(config.PROFILE_SAMPLE_RATE), audio_key
+        )
+    update_job(batch_id, status="done", progress=100)
+
+def timeline_options(timeline_interval: Optional[float], timeline_max_points: Optional[int]) -> Dict[str, Any]:
+    """Validate per-request timeline resolution. Raises ValueError with a client-facing message."""
+    options = {}
+    if timeline_interval is not None:
+        if timeline_interval < config.TIMELINE_MIN_INTERVAL_SEC:
+            raise ValueError(f"timeline_interval must be at least {config.TIMELINE_MIN_INTERVAL_SEC} seconds")
+        options["timeline_interval"] = timeline_interval
+    if timeline_max_points is not None:
+        if not 2 <= timeline_max_points <= config.TIMELINE_POINT_LIMIT:
+            raise ValueError(f"timeline_max_points must be between 2 and {config.TIMELINE_POINT_LIMIT}")
+        options["timeline_max_points"] = timeline_max_points
+    return options
+
+def form_options(fields: Dict[str, str]) -> Dict[str, Any]:
+    """Timeline options from streamed form fields. Raises ValueError with a client-facing message."""
+    try:
+        timeline_interval = float(fields["timeline_interval"]) if fields.get("timeline_interval") else None
+    except ValueError:
+        raise ValueError("timeline_interval must be a number")
+    try:
+        timeline_max_points = int(fields["timeline_max_points"]) if fields.get("timeline_max_points") else None
+    except ValueError:
+        raise ValueError("timeline_max_points must be an integer")
+    return timeline_options(timeline_interval, timeline_max_points)
+
+def form_flag(fields: Dict[str, str], name: str) -> bool:
+    """Boolean form field, accepting the same spellings as FastAPI's Form(bool)."""
+    value = fields.get(name, "").strip().lower()
+    if value in ("", "0", "false", "off", "no", "n", "f"):
+        return False
+    if value in ("1", "true", "on", "yes", "y", "t"):
+        return True
+    raise ValueError(f"{name} must be true or false")
+
+def is_admin(request: Request) -> bool:
+    """True when the request carries ADMIN_TOKEN in X-Admin-Token (never when no token is configured)."""
+    token = request.headers.get("x-admin-token", "")
+    return bool(config.ADMIN_TOKEN) and hmac.compare_digest(token.encode(), config.ADMIN_TOKEN.encode())
+
+ADMIN_REQUIRED = {"error": "This requires a valid X-Admin-Token header."}
 
 @app.post("/upload")
-async def upload_audio(file: UploadFile = File(...), background_tasks: BackgroundTasks = None):
-    # Backend safeguard: Limit file size to 10MB to prevent OOM
-    MAX_SIZE = 10 * 1024 * 1024
-    content = await file.read()
-    if len(content) > MAX_SIZE:
-        return JSONResponse(status_code=413, content={"error": "File too large. Max 10MB."})
-    
-    # Seek back to start after reading
-    await file.seek(0)
-    
+async def upload_audio(request: Request):
+    """
+    Multipart form with the recording as `file`, plus optional `timeline_interval`,
+    `timeline_max_points` and `profile` fields.
+    """
     job_id = str(uuid.uuid4())
     
-    # Save UploadFile to a temporary file locally
+    # Stream the upload to a temporary file locally
     # Ensure 'temp' directory exists
     os.makedirs("temp", exist_ok=True)
-    temp_file_path = f"temp/{job_id}_{file.filename}"
+    # The result cache is content-addressed, so it needs a hash even if none is configured
+    hash_algorithm = config.UPLOAD_HASH_ALGORITHM or ("sha256" if result_cache.enabled else None)
     
-    with open(temp_file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    def destination(field, index, filename):
+        if field != "file" or index > 0:
+            return None
+        return f"temp/{job_id}_{os.path.basename(filename or 'audio')}", hash_algorithm
     
-    jobs[job_id] = {
+    # Backend safeguard: the body is parsed as it arrives and cut off at the size limit,
+    # so oversized files are never buffered or written out whole
+    try:
+        fields, files = await receive_multipart(request, destination, config.MAX_UPLOAD_BYTES)
+    except UploadTooLargeError:
+        return JSONResponse(status_code=413, content={"error": f"File too large. Max {config.MAX_UPLOAD_MB}MB."})
+    except InvalidUploadError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    if not files:
+        return JSONResponse(status_code=400, content={"error": "No file uploaded."})
+    _, filename, temp_file_path, size, content_hash = files[0]
+    
+    # Per-upload timeline resolution (falls back to the server defaults)
+    try:
+        options = form_options(fields)
+        profile = form_flag(fields, "profile")
+    except ValueError as e:
+        os.remove(temp_file_path)
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    
+    # Admins can profile a specific upload; others are profiled at PROFILE_SAMPLE_RATE
+    if profile and not is_admin(request):
+        os.remove(temp_file_path)
+        return JSONResponse(status_code=403, content=ADMIN_REQUIRED)
+    profile = profile or should_profile(config.PROFILE_SAMPLE_RATE)
+    
+    await run_in_threadpool(job_store.create, job_id, {
         "status": "queued",
         "progress": 0,
-        "filename": file.filename,
+        "stage": "queued",
+        "filename": filename,
+        "size": size,
+        "content_hash": content_hash,
         "result": None
-    }
+    })
+    
+    # Re-uploads of the same audio with the same analysis config complete instantly
+    key = None
+    if result_cache.enabled and content_hash:
+        key = cache_key(content_hash, analysis_fingerprint(options))
+        cached_result = await run_in_threadpool(result_cache.get, key)
+        if cached_result is not None:
+            logger.info(f"Result cache hit for {filename} (job {job_id})")
+            os.remove(temp_file_path)
+            await run_in_threadpool(job_store.update, job_id, {"status": "done", "progress": 100, "result": cached_result, "cached": True})
+            return {"job_id": job_id, "cached": True}
     
-    # Start processing in background (FastAPI runs this in a threadpool)
-    background_tasks.add_task(analyze_audio_sync, job_id, temp_file_path)
+    # Hand the job to the analysis worker pool; reject it if the queue is full
+    try:
+        # submit() records the queue wait in the job store when a worker is free
+        await run_in_threadpool(
+            scheduler.submit,
+            job_id, temp_file_path, key, options, filename, profile, retained_audio_key(job_id, content_hash)
+        )
+    except QueueFullError as e:
+        logger.warning(f"Rejecting upload {filename}: {e}")
+        await run_in_threadpool(job_store.delete, job_id)
+        os.remove(temp_file_path)
+        return JSONResponse(
+            status_code=429,
+            content={"error": "Server is busy analyzing other recordings. Please try again shortly."},
+            headers={"Retry-After": str(config.ANALYSIS_RETRY_AFTER)}
+        )
     
     return {"job_id": job_id}
 
+
+def _remove_files(paths):
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+@app.post("/batch/upload")
+async def upload_batch(request: Request):
+    """
+    Analyze many recordings at once: audio files and/or zip archives of them, sent as `files`
+    parts of a multipart form (with optional `timeline_interval` and `timeline_max_points`).
+    Every recording becomes a regular job; the batch runs as a single queue entry, so its
+    recordings are transcribed back to back by one worker.
+    """
+    batch_id = str(uuid.uuid4())
+    os.makedirs("temp", exist_ok=True)
+    hash_algorithm = config.UPLOAD_HASH_ALGORITHM or ("sha256" if result_cache.enabled else None)
+    
+    def destination(field, index, filename):
+        if field != "files":
+            return None
+        filename = os.path.basename(filename or "audio")
+        # Zips aren't hashed, their members are
+        zipped = filename.lower().endswith(".zip")
+        return f"temp/{batch_id}_{index}_{filename}", None if zipped else hash_algorithm
+    
+    # The whole request shares one size budget
+    try:
+        fields, files = await receive_multipart(request, destination, config.BATCH_MAX_UPLOAD_BYTES)
+    except UploadTooLargeError:
+        return JSONResponse(status_code=413, content={
+            "error": f"File too large. Max {config.MAX_UPLOAD_MB}MB per recording and {config.BATCH_MAX_UPLOAD_MB}MB per batch."
+        })
+    except InvalidUploadError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    uploaded = [path for _, _, path, _, _ in files]
+    
+    try:
+        options = form_options(fields)
+    except ValueError as e:
+        _remove_files(uploaded)
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    
+    recordings = []  # (filename, path, size, content hash)
+    try:
+        for index, (_, filename, path, size, content_hash) in enumerate(files):
+            filename = os.path.basename(filename or "audio")
+            if filename.lower().endswith(".zip"):
+                if not is_zip(filename, path):
+                    raise zipfile.BadZipFile(f"{filename} is not a valid zip archive")
+                try:
+                    recordings.extend(await run_in_threadpool(
+                        extract_audio_files, path, f"temp/{batch_id}_{index}_",
+                        config.BATCH_MAX_FILES - len(recordings), config.MAX_UPLOAD_BYTES, hash_algorithm
+                    ))
+                finally:
+                    os.remove(path)
+                continue
+            recordings.append((filename, path, size, content_hash))
+            if size > config.MAX_UPLOAD_BYTES:
+                raise UploadTooLargeError(f"{filename} is larger than {config.MAX_UPLOAD_MB}MB")
+            if len(recordings) > config.BATCH_MAX_FILES:
+                raise BatchTooLargeError(f"Batches are limited to {config.BATCH_MAX_FILES} recordings")
+    except UploadTooLargeError:
+        # Uploads not looked at yet are removed along with the recordings
+        _remove_files(uploaded + [path for _, path, _, _ in recordings])
+        return JSONResponse(status_code=413, content={
+            "error": f"File too large. Max {config.MAX_UPLOAD_MB}MB per recording and {config.BATCH_MAX_UPLOAD_MB}MB per batch."
+        })
+    except (BatchTooLargeError, zipfile.BadZipFile) as e:
+        _remove_files(uploaded + [path for _, path, _, _ in recordings])
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    
+    if not recordings:
+        return JSONResponse(status_code=400, content={"error": "No audio files found in the upload."})
+    
+    # One regular job per recording; cached recordings are done right away
+    job_ids = []
+    items = []
+    for filename, path, size, content_hash in recordings:
+        job_id = str(uuid.uuid4())
+        job_ids.append(job_id)
+        await run_in_threadpool(job_store.create, job_id, {
+            "status": "queued",
+            "progress": 0,
+            "stage": "queued",
+            "filename": filename,
+            "size": size,
+            "content_hash": content_hash,
+            "batch_id": batch_id,
+            "result": None
+        })
+        key = None
+        if result_cache.enabled and content_hash:
+            key = cache_key(content_hash, analysis_fingerprint(options))
+            cached_result = await run_in_threadpool(result_cache.get, key)
+            if cached_result is not None:
+                os.remove(path)
+                await run_in_threadpool(job_store.update, job_id, {"status": "done", "progress": 100, "result": cached_result, "cached": True})
+                continue
+        items.append((job_id, path, key, filename, retained_audio_key(job_id, content_hash)))
+    
+    await run_in_threadpool(job_store.create, batch_id, {
+        "type": "batch",
+        "status": "queued" if items else "done",
+        "progress": 0 if items else 100,
+        "job_ids": job_ids,
+        "result": None
+    })
+    
+    if items:
+        try:
+            await run_in_threadpool(scheduler.submit, batch_id, items, options, target=analyze_batch_sync)
+        except QueueFullError as e:
+            logger.warning(f"Rejecting batch of {len(recordings)} recording(s): {e}")
+            for job_id in job_ids + [batch_id]:
+                await run_in_threadpool(job_store.delete, job_id)
+            _remove_files(path for _, path, _, _, _ in items)
+            return JSONResponse(
+                status_code=429,
+                content={"error": "Server is busy analyzing other recordings. Please try again shortly."},
+                headers={"Retry-After": str(config.ANALYSIS_RETRY_AFTER)}
+            )
+    
+    logger.info(f"Batch {batch_id}: {len(recordings)} recording(s), {len(recordings) - len(items)} from cache")
+    return {
+        "batch_id": batch_id,
+        "jobs": [{"job_id": job_id, "filename": recording[0]} for job_id, recording in zip(job_ids, recordings)]
+    }
+
+def batch_members(batch: Dict[str, Any], include_result: bool = False) -> List[Dict[str, Any]]:
+    """The batch's jobs, in upload order. Jobs lost with a crashed worker or expired count as failed."""
+    members = []
+    for job_id in batch["job_ids"]:
+        job = job_store.get(job_id, include_result=include_result) or {"status": "failed", "progress": 0, "error": "Job expired"}
+        if batch["status"] == "failed" and job["status"] not in ("done", "failed"):
+            job = dict(job, status="failed", error=batch.get("error", "Batch failed"))
+        members.append(dict(job, job_id=job_id))
+    return members
+
+@app.get("/batch/{batch_id}")
+async def get_batch_status(batch_id: str):
+    """Aggregate progress of a batch and the status of each of its recordings."""
+    batch = await run_in_threadpool(job_store.get, batch_id, include_result=False)
+    if batch is None or batch.get("type") != "batch":
+        return JSONResponse(status_code=404, content={"error": "Batch not found"})
+    
+    members = await run_in_threadpool(batch_members, batch)
+    finished = [job for job in members if job["status"] in ("done", "failed")]
+    status = {
+        "batch_id": batch_id,
+        "status": batch["status"],
+        "progress": 100 if batch["status"] in ("done", "failed") else int(
+            sum(job.get("progress", 0) for job in members) / len(members)
+        ),
+        "total": len(members),
+        "completed": sum(job["status"] == "done" for job in finished),
+        "failed": sum(job["status"] == "failed" for job in finished),
+        "jobs": [
+            {
+                "job_id": job["job_id"],
+                "filename": job.get("filename"),
+                "status": job["status"],
+                "progress": job.get("progress", 0),
+                "stage": job.get("stage")
+            }
+            for job in members
+        ]
+    }
+    if batch["status"] == "queued":
+        status["queue_position"] = scheduler.position(batch_id)
+    return status
+
+@app.get("/batch/{batch_id}/result")
+async def get_batch_result(batch_id: str):
+    """Side-by-side comparison of a finished batch's recordings."""
+    batch = await run_in_threadpool(job_store.get, batch_id)
+    if batch is None or batch.get("type") != "batch":
+        return JSONResponse(status_code=404, content={"error": "Batch not found"})
+    if batch["status"] not in ("done", "failed"):
+        return JSONResponse(status_code=409, content={"status": batch["status"], "error": "Batch not complete"})
+    
+    comparison = batch.get("result")
+    if comparison is None:
+        members = await run_in_threadpool(batch_members, batch, True)
+        comparison = compare_recordings(members)
+        # Built once; later requests read it from the store
+        await run_in_threadpool(job_store.update, batch_id, {"result": comparison})
+    return dict(comparison, batch_id=batch_id, status=batch["status"])
+
+
+# Live recordings are transcribed on one dedicated thread in the API process with its own model,
+# loaded on the first live session
+_live_transcriber = None
+live_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="live-transcribe")
+live_session_count = 0
+
+def get_live_transcriber():
+    global _live_transcriber
+    if _live_transcriber is None:
+        _live_transcriber = create_backend(
+            config.TRANSCRIPTION_BACKEND,
+            config.WHISPER_MODEL,
+            compute_type=config.WHISPER_COMPUTE_TYPE,
+            cpu_threads=config.WHISPER_CPU_THREADS,
+            word_timestamps=config.WHISPER_WORD_TIMESTAMPS
+        )
+    return _live_transcriber
+
+def finalize_live_session(job_id: str, session: LiveSession, options: Dict[str, Any]):
+    """Run the regular analysis on a finished live recording, reusing its transcript."""
+    y = session.audio()
+    sr = session.sr
+    duration = librosa.get_duration(y=y, sr=sr)
+    rms = librosa.feature.rms(y=y, hop_length=512)[0]
+    silence_sections = find_silence_sections(librosa.effects.split(y, top_db=30), sr)
+    result = build_analysis_result(job_id, duration, rms, silence_sections, session.transcription(), options)
+    update_job(job_id, result=result, status="done", progress=100, stage="done")
+
+@app.websocket("/live")
+async def live_analysis(websocket: WebSocket, timeline_interval: Optional[float] = None,
+                        timeline_max_points: Optional[int] = None):
+    """
+    Live recording: the client sends 16 kHz mono float32 PCM as binary messages and gets
+    {"type": "feedback"} messages back while it talks. Sending {"type": "stop"} finalizes the
+    recording as a regular job and answers {"type": "done", "job_id"}; results are then
+    served by /result like any upload.
+    """
+    global live_session_count
+    await websocket.accept()
+    try:
+        options = timeline_options(timeline_interval, timeline_max_points)
+    except ValueError as e:
+        await websocket.send_json({"type": "error", "error": str(e)})
+        await websocket.close(code=1008)
+        return
+    if live_session_count >= config.LIVE_MAX_SESSIONS:
+        await websocket.send_json({"type": "error", "error": "Too many live sessions. Please try again shortly."})
+        await websocket.close(code=1013)
+        return
+
+    live_session_count += 1
+    job_id = str(uuid.uuid4())
+    await run_in_threadpool(job_store.create, job_id, {
+        "status": "processing",
+        "progress": 0,
+        "stage": "live",
+        "filename": "live-recording.wav",
+        "result": None
+    })
+    session = LiveSession(filler_detector, window_sec=config.LIVE_WINDOW_SEC, max_window_sec=2.5 * config.LIVE_WINDOW_SEC)
+    loop = asyncio.get_running_loop()
+    transcriber = get_live_transcriber()
+    pending = None  # future of the window being planned and transcribed
+    last_feedback = loop.time()
+    finished = False
+
+    try:
+        await websocket.send_json({"type": "started", "job_id": job_id})
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes") is not None:
+                if len(message["bytes"]) % 4:
+                    await websocket.send_json({"type": "error", "error": "Audio frames must be float32 PCM (a multiple of 4 bytes); frame dropped."})
+                    continue
+                session.add_audio(np.frombuffer(message["bytes"], dtype=np.float32))
+                if session.duration > config.LIVE_MAX_MINUTES * 60:
+                    await websocket.send_json({"type": "error", "error": f"Live recordings are limited to {config.LIVE_MAX_MINUTES} minutes."})
+                    break
+            elif message.get("text"):
+                if json.loads(message["text"]).get("type") == "stop":
+                    finished = True
+                    break
+
+            # Collect a finished window, then start on the next one
+            new_segments = None
+            if pending is not None and pending.done():
+                window = pending.result()
+                pending = None
+                if window is not None:
+                    new_segments = session.add_transcription(*window)
+            if pending is None and session.has_window():
+                # Finding the pause to cut at scans the pending audio, so it runs off the loop too
+                pending = loop.run_in_executor(live_executor, session.transcribe_next_window, transcriber.transcribe)
+
+            if new_segments or loop.time() - last_feedback >= 1:
+                await websocket.send_json(jsonable_encoder(session.feedback(new_segments)))
+                last_feedback = loop.time()
+
+        if finished:
+            # Only the tail after the last transcribed window is left
+            await run_in_threadpool(update_job, job_id, progress=50, stage="finalizing")
+            windows = [await pending] if pending is not None else []
+            windows.append(await loop.run_in_executor(live_executor, session.transcribe_next_window, transcriber.transcribe, True))
+            for window in windows:
+                if window is not None:
+                    session.add_transcription(*window)
+            await run_in_threadpool(finalize_live_session, job_id, session, options)
+            await websocket.send_json({"type": "done", "job_id": job_id})
+            await websocket.close()
+
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Live session {job_id} failed: {e}", exc_info=True)
+        await run_in_threadpool(update_job, job_id, status="failed", error=str(e))
+        try:
+            await websocket.send_json({"type": "error", "error": str(e)})
+            await websocket.close(code=1011)
+        except Exception:
+            pass
+    finally:
+        live_session_count -= 1
+        # Abandoned recordings leave nothing behind
+        if not finished:
+            await run_in_threadpool(job_store.delete, job_id)
+
 @app.get("/status/{job_id}")
 async def get_status(job_id: str):
-    if job_id not in jobs:
+    job = await run_in_threadpool(job_store.get, job_id, include_result=False)
+    if job is None:
         return {"status": "failed", "error": "Job not found"}
     
-    return {
-        "status": jobs[job_id]["status"],
-        "progress": jobs[job_id]["progress"]
-    }
+    return job_progress(job_id, job)
 
-def generate_audience_analysis(job_id: str, audience: str) -> Dict[str, Any]:
-    """Generate audience-specific analysis"""
-    result = jobs[job_id]["result"]
+@app.get("/ready")
+async def readiness():
+    """Readiness probe: with WHISPER_EAGER_LOAD, healthy only once every worker has a warm model."""
+    ready_workers = scheduler.ready_workers
+    if config.WHISPER_EAGER_LOAD and ready_workers < scheduler.workers:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "warming_up", "ready_workers": ready_workers, "workers": scheduler.workers}
+        )
+    return {"status": "ready", "ready_workers": ready_workers, "workers": scheduler.workers}
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus metrics: stage durations, real-time factor, queue wait, peak memory and errors."""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+# Ideal pace (WPM), readability (Flesch) and sentence length (seconds) per audience profile
+AUDIENCE_PROFILES = {
+    "students": {"wpm": (120, 150), "complexity": (60, 100), "length": (10, 20)},
+    "professionals": {"wpm": (140, 170), "complexity": (40, 70), "length": (15, 30)},
+    "interviews": {"wpm": (130, 160), "complexity": (50, 80), "length": (20, 45)},
+    "marketing": {"wpm": (150, 180), "complexity": (60, 90), "length": (5, 15)},
+    "general": {"wpm": (140, 160), "complexity": (60, 80), "length": (10, 25)}
+}
+
+def audience_metrics(result: Dict[str, Any]) -> Dict[str, float]:
+    """Audience-independent inputs of the audience analysis, read from the stored result."""
     summary = result.get("summary", {})
     transcript = result.get("transcript", "")
     duration = result.get("duration", 0)
     
     # Get speech rate from summary or calculate if missing (legacy support)
-    speech_rate = summary.get("speech_rate", 0)
-    words_count = len(transcript.split())
-    if not speech_rate or speech_rate == 0:
-        speech_rate = (words_count / duration) * 60 if duration > 0 else 0
+    speech_rate = summary.get("speech_rate")
+    if speech_rate is None:
+        speech_rate = (len(transcript.split()) / duration) * 60 if duration > 0 else 0
         
     filler_count = int(summary.get("filler_words", "0"))
     filler_density = (filler_count / duration * 60) if duration > 0 else 0
     
-    # Get reading ease from summary or calculate if missing
-    reading_ease = summary.get("reading_ease", 0)
-    if not reading_ease or reading_ease == 0:
+    # Get reading ease from summary or calculate if missing (legacy support)
+    reading_ease = summary.get("reading_ease")
+    if reading_ease is None:
         reading_ease = textstat.flesch_reading_ease(transcript) if transcript else 50
         
     avg_response_length = duration / max(len(transcript.split('.')), 1) if transcript else 0
     
-    configs = {
-        "students": {"wpm": (120, 150), "complexity": (60, 100), "length": (10, 20)},
-        "professionals": {"wpm": (140, 170), "complexity": (40, 70), "length": (15, 30)},
-        "interviews": {"wpm": (130, 160), "complexity": (50, 80), "length": (20, 45)},
-        "marketing": {"wpm": (150, 180), "complexity": (60, 90), "length": (5, 15)},
-        "general": {"wpm": (140, 160), "complexity": (60, 80), "length": (10, 25)}
+    return {
+        "duration": duration,
+        "speech_rate": speech_rate,
+        "filler_count": filler_count,
+        "filler_density": filler_density,
+        "reading_ease": reading_ease,
+        "avg_response_length": avg_response_length
     }
-    config = configs.get(audience, configs["general"])
+
+def generate_audience_analysis(job_id: str, audience: str, result: Dict[str, Any],
+                               metrics: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """Generate audience-specific analysis"""
+    if metrics is None:
+        metrics = audience_metrics(result)
+    duration = metrics["duration"]
+    speech_rate = metrics["speech_rate"]
+    filler_count = metrics["filler_count"]
+    filler_density = metrics["filler_density"]
+    reading_ease = metrics["reading_ease"]
+    avg_response_length = metrics["avg_response_length"]
+    
+    config = AUDIENCE_PROFILES.get(audience, AUDIENCE_PROFILES["general"])
     fit_score = 100
     mismatches = []
     suggestions = []
@@ -1090,7 +1579,7 @@ def generate_audience_analysis(job_id: str, audience: str) -> Dict[str, Any]:
     }.get(audience, "Standard")
 
     # Debug logging for calculation verification
-    print(f"DEBUG: Job={job_id}, Audience={audience}, Duration={duration:.2f}s, Words={words_count}, Rate={speech_rate:.2f}")
+    logger.debug(f"Job={job_id}, Audience={audience}, Duration={duration:.2f}s, Rate={speech_rate:.2f}")
 
     return {
         "audience": audience,
@@ -1109,113 +1598,357 @@ def generate_audience_analysis(job_id: str, audience: str) -> Dict[str, Any]:
         }
     }
 
+def generate_audience_matrix(job_id: str, result: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Audience analysis for every profile, sharing one pass over the result's metrics."""
+    metrics = audience_metrics(result)
+    return {
+        audience: generate_audience_analysis(job_id, audience, result, metrics)
+        for audience in AUDIENCE_PROFILES
+    }
+
+def audience_matrix(job_id: str, job: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    The job's audience matrix. Results finish with it; results stored before it existed
+    get it computed on first request and saved with the job.
+    """
+    result = job["result"]
+    matrix = result.get("audiences")
+    if matrix is None:
+        matrix = generate_audience_matrix(job_id, result)
+        job["result"] = dict(result, audiences=matrix)
+        job_store.update(job_id, {"result": job["result"]})
+    return matrix
+
+def cached_audience_analysis(job_id: str, job: Dict[str, Any], audience: str) -> Dict[str, Any]:
+    matrix = audience_matrix(job_id, job)
+    if audience in matrix:
+        return matrix[audience]
+    # Unknown audiences are scored against the general profile under their own name
+    return generate_audience_analysis(job_id, audience, job["result"])
+
+@app.get("/audiences/{job_id}")
+async def get_audiences(job_id: str):
+    """Audience analysis for all profiles at once, so switching audience needs no further requests."""
+    job = await run_in_threadpool(job_store.get, job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": "Job not found"})
+    if job["status"] != "done":
+        return JSONResponse(status_code=409, content={"status": job["status"], "error": "Analysis not complete"})
+    return await run_in_threadpool(audience_matrix, job_id, job)
+
 @app.get("/result/{job_id}")
-async def get_result(job_id: str, audience: str = None):
-    if job_id not in jobs:
+async def get_result(job_id: str, audience: str = None, resolution: str = "lod"):
+    job = await run_in_threadpool(job_store.get, job_id)
+    # Batches have their own result endpoint
+    if job is None or job.get("type") == "batch":
         return {"error": "Job not found"}
     
-    if jobs[job_id]["status"] == "failed":
-        return {"status": "failed", "error": jobs[job_id].get("error", "Unknown error")}
+    if job["status"] == "failed":
+        return {"status": "failed", "error": job.get("error", "Unknown error")}
 
-    if jobs[job_id]["status"] != "done":
-        return {"status": jobs[job_id]["status"], "error": "Analysis not complete"}
+    if job["status"] != "done":
+        return {"status": job["status"], "error": "Analysis not complete"}
     
     if audience:
-        return generate_audience_analysis(job_id, audience)
-        
-    return jobs[job_id]["result"]
+        return await run_in_threadpool(cached_audience_analysis, job_id, job, audience)
+    
+    return serve_result(job["result"], resolution)
+
+def serve_result(result: Dict[str, Any], resolution: str = "lod") -> Dict[str, Any]:
+    """Serve the downsampled timeline unless the full resolution is asked for."""
+    # Copy: the in-memory job store hands out the stored result itself
+    result = dict(result)
+    # Per-segment metrics and scoring inputs only feed reports and re-analysis;
+    # audience analysis is served by /audiences
+    result.pop("segment_features", None)
+    result.pop("scoring_inputs", None)
+    result.pop("audiences", None)
+    timeline_lod = result.pop("timeline_lod", None)
+    if timeline_lod is not None and resolution != "full":
+        result["timeline_points_total"] = len(result["timeline"])
+        result["timeline"] = timeline_lod
+    return result
+
+class ReanalyzeRequest(BaseModel):
+    # Any subset of scoring.DEFAULT_SCORING_PROFILE; the rest keeps its defaults
+    scoring_profile: Dict[str, Any] = {}
+    # Timeline resolution; defaults to the one the job was analyzed with
+    timeline_interval: Optional[float] = None
+    timeline_max_points: Optional[int] = None
+
+def rescore_result(job_id: str, job: Dict[str, Any], scoring_profile: Dict[str, Any],
+                   options: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Score a finished job again from its stored transcript, segment features, RMS curve and
+    silence map: no decoding or transcription. Results stored before the scoring inputs were
+    fall back to the job's retained audio. Returns None when neither is available.
+    """
+    result = job["result"]
+    inputs = load_scoring_inputs(result)
+    if inputs is None and pcm_store is not None:
+        retained = pcm_store.open(retained_audio_key(job_id, job.get("content_hash")))
+        if retained is not None:
+            features = analyze_blocks(pcm_store.blocks(retained, 10 * SAMPLE_RATE), SAMPLE_RATE)
+            inputs = features.rms, find_silence_sections(features.non_silent_intervals(top_db=30), SAMPLE_RATE)
+    if inputs is None:
+        return None
+    rms, silence_sections = inputs
+    transcription = {"text": result["transcript"], "segments": result.get("segments", [])}
+    return build_analysis_result(
+        job_id, result["duration"], rms, silence_sections, transcription, options,
+        scoring_profile=scoring_profile,
+        segment_features=load_segment_features(result, filler_detector),
+        report_progress=False
+    )
+
+@app.post("/reanalyze/{job_id}")
+async def reanalyze(job_id: str, body: ReanalyzeRequest):
+    """
+    Re-score a finished job with another scoring profile (thresholds and penalties):
+    timeline, drop risks, summary and audience analysis are rebuilt from the stored
+    artefacts and replace the job's result. Cached reports are dropped with the old result.
+    """
+    job = await run_in_threadpool(job_store.get, job_id)
+    if job is None or job.get("type") == "batch":
+        return JSONResponse(status_code=404, content={"error": "Job not found"})
+    if job["status"] != "done":
+        return JSONResponse(status_code=409, content={"status": job["status"], "error": "Analysis not complete"})
+
+    try:
+        scoring_profile = resolve_scoring_profile(body.scoring_profile)
+        options = dict(job["result"].get("timeline_options") or {})
+        options.update(timeline_options(body.timeline_interval, body.timeline_max_points))
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
+    result = await run_in_threadpool(timed_stage, "reanalysis", rescore_result, job_id, job, scoring_profile, options)
+    if result is None:
+        return JSONResponse(
+            status_code=409,
+            content={"error": "This result was stored without its scoring inputs; upload the recording again to re-analyze it."}
+        )
+
+    # A new revision changes the report ETags, so clients fetch the re-scored report
+    revision = job.get("revision", 0) + 1
+    await run_in_threadpool(update_job, job_id, result=result, revision=revision)
+    await run_in_threadpool(report_cache.invalidate, job_id)
+    return {"job_id": job_id, "revision": revision, "result": serve_result(result)}
+
+def job_progress(job_id: str, job: Dict[str, Any]) -> Dict[str, Any]:
+    """Progress fields shared by /status and /events."""
+    status = {
+        "status": job["status"],
+        "progress": job["progress"],
+        "stage": job.get("stage")
+    }
+    if status["status"] == "queued":
+        # Recordings of a batch wait in the queue as part of their batch
+        status["queue_position"] = scheduler.position(job.get("batch_id") or job_id)
+    # Where the job spent its time, for debugging slow jobs
+    metrics = dict(job.get("metrics") or {})
+    if job.get("queue_wait") is not None:
+        metrics["queue_wait_seconds"] = job["queue_wait"]
+    if metrics:
+        status["metrics"] = metrics
+    return status
+
+@app.get("/events/{job_id}")
+async def job_event_stream(job_id: str, request: Request, resolution: str = "lod"):
+    """
+    Server-Sent Events stream of a job: `progress` events as it moves through the pipeline,
+    `partial` events with the energy curve, silences and newly scored segments while it runs,
+    then a single `result` (or `failed`) event, after which the stream closes.
+    """
+    if await run_in_threadpool(job_store.get, job_id, include_result=False) is None:
+        return JSONResponse(status_code=404, content={"error": "Job not found"})
+
+    async def stream():
+        with job_events.subscribe(job_id) as updates:
+            last_progress = None
+            sent_audio = False
+            sent_segments = 0
+            while True:
+                # The store is the source of truth; notifications only say when to look again
+                job = await run_in_threadpool(job_store.get, job_id, False)
+                if job is None:
+                    yield format_sse("failed", {"status": "failed", "error": "Job not found"})
+                    return
+
+                progress = job_progress(job_id, job)
+                if progress != last_progress:
+                    yield format_sse("progress", progress)
+                    last_progress = progress
+
+                # Partial results: audio features once, then only segments not sent yet
+                partial = None
+                if job["status"] not in ("done", "failed"):
+                    partial = await run_in_threadpool(job_store.get_partial, job_id, sent_segments)
+                if partial:
+                    event = {}
+                    if not sent_audio and partial.get("energy"):
+                        event.update({key: partial[key] for key in ("duration", "energy", "silences")})
+                        sent_audio = True
+                    new_segments = partial["segments"]
+                    if new_segments:
+                        event.update({
+                            "segment_offset": sent_segments,
+                            "segments": new_segments,
+                            "transcribed_until": partial.get("transcribed_until", 0)
+                        })
+                        sent_segments += len(new_segments)
+                    if event:
+                        yield format_sse("partial", event)
+
+                if job["status"] == "failed":
+                    yield format_sse("failed", {"status": "failed", "error": job.get("error", "Unknown error")})
+                    return
+                if job["status"] == "done":
+                    job = await run_in_threadpool(job_store.get, job_id)
+                    yield format_sse("result", serve_result(job["result"], resolution))
+                    return
+
+                # Updates published by another API process never reach this broker,
+                # so fall back to re-reading the store every EVENTS_POLL_INTERVAL
+                try:
+                    await asyncio.wait_for(updates.get(), timeout=config.EVENTS_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keep-alive\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        # Stop reverse proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def render_report(job_id: str, result: Dict[str, Any], filename: str, audience: Optional[str] = None,
+                  profile: bool = False) -> str:
+    """
+    Render a job's PDF report into the report cache (blocking). Returns its path.
+    With `profile`, the render is profiled into PROFILE_DIR/<job_id>/report_<audience>.*
+    """
+    if profile:
+        audience_part = re.sub(r'[^a-zA-Z0-9_\-]', '_', audience) if audience else "all"
+        with profile_job(job_id, f"report_{audience_part}", config.PROFILE_DIR, config.PROFILE_INTERVAL_MS / 1000):
+            return render_report(job_id, result, filename, audience)
+    audience_analysis = None
+    if audience:
+        # Precomputed with the result unless the audience isn't one of the profiles
+        audience_analysis = (result.get("audiences") or {}).get(audience) or generate_audience_analysis(job_id, audience, result)
+    logger.info(f"Generating PDF report for job {job_id}, filename: {filename}, audience: {audience}")
+    return report_cache.put(job_id, audience, lambda path: generate_detailed_report(
+        result, filename, path,
+        audience_analysis=audience_analysis,
+        filler_detector=filler_detector,
+        max_items=config.REPORT_MAX_ITEMS
+    ))
+
+# Reports being rendered right now, so simultaneous downloads share one render
+_report_renders: Dict[Any, asyncio.Future] = {}
+
+async def get_report(job_id: str, job: Dict[str, Any], audience: Optional[str], profile: bool = False) -> str:
+    """
+    Path of the job's report, rendering it on the report executor if it isn't cached.
+    With `profile`, the report is rendered again under the profiler even if it is cached.
+    """
+    loop = asyncio.get_running_loop()
+    if profile:
+        return await loop.run_in_executor(
+            report_executor, timed_stage, "report",
+            render_report, job_id, job["result"], job.get("filename", "audio.mp3"), audience, True
+        )
+
+    pdf_path = await run_in_threadpool(report_cache.get, job_id, audience)
+    if pdf_path is not None:
+        return pdf_path
+
+    key = (job_id, audience)
+    render = _report_renders.get(key)
+    if render is None:
+        render = loop.run_in_executor(
+            report_executor, timed_stage, "report",
+            render_report, job_id, job["result"], job.get("filename", "audio.mp3"), audience,
+            should_profile(config.PROFILE_SAMPLE_RATE)
+        )
+        _report_renders[key] = render
+        render.add_done_callback(lambda _: _report_renders.pop(key, None))
+    return await asyncio.shield(render)
 
 @app.get("/download-report/{job_id}")
-async def download_report(job_id: str, audience: str = None):
-    """Generate and download detailed PDF report"""
-    if job_id not in jobs:
+async def download_report(job_id: str, request: Request, audience: str = None, profile: bool = False):
+    """
+    Download the detailed PDF report. Rendered once per (job, audience), then served from disk.
+    Admins can pass profile=true to re-render it under the profiler.
+    """
+    if profile and not is_admin(request):
+        return JSONResponse(status_code=403, content=ADMIN_REQUIRED)
+    job = await run_in_threadpool(job_store.get, job_id)
+    if job is None:
         return {"error": "Job not found"}
     
-    if jobs[job_id]["status"] != "done":
+    if job["status"] != "done":
         return {"error": "Analysis not complete"}
     
-    try:
-        # Get analysis result
-        result = jobs[job_id]["result"]
-        filename = jobs[job_id].get("filename", "audio.mp3")
-        
-        logger.info(f"Generating PDF report for job {job_id}, filename: {filename}, audience: {audience}")
-        
-        # Create reports directory if it doesn't exist
-        os.makedirs("reports", exist_ok=True)
-        
-        # Generate PDF
-        pdf_path = f"reports/report_{job_id}.pdf"
-        
-        # Update PDF generator to use detailed data
-        from pdf_generator import PDFReportGenerator
-        
-        pdf = PDFReportGenerator(pdf_path)
-        
-        # Add header
-        pdf.add_header(filename)
-        
-        # Add audience analysis if provided
-        if audience:
-            audience_analysis = generate_audience_analysis(job_id, audience)
-            pdf.add_audience_analysis(audience_analysis)
-        
-        # Add critical moment
-        drop_risks = result.get('drop_risks', [])
-        critical_moment = drop_risks[0] if drop_risks else None
-        pdf.add_critical_moment(critical_moment)
-        
-        # Add detailed filler words analysis
-        segments = result.get('segments', [])
-        filler_pattern = result.get('filler_pattern', r'\b(um|uh|like|you know|so|actually|basically|literally)\b')
-        if segments:
-            pdf.add_filler_words_detail(segments, filler_pattern)
-        
-        # Add complex words analysis
-        if segments:
-            pdf.add_complex_words_detail(segments)
-        
-        # Add speech rate analysis
-        duration = result.get('duration', 0)
-        if segments and duration > 0:
-            pdf.add_speech_rate_analysis(segments, duration)
-        
-        # Add suggestions
-        summary = result.get('summary', {})
-        suggestions = summary.get('suggestions', [])
-        pdf.add_suggestions(suggestions)
-        
-        # Add summary insights
-        pdf.add_summary_insights(summary)
-        
-        # Generate PDF
-        pdf.generate()
-        
-        logger.info(f"PDF generated successfully at {pdf_path}")
-        
-        # Check if file exists
-        if not os.path.exists(pdf_path):
-            raise Exception(f"PDF file was not created at {pdf_path}")
-        
-        # Return file for download with proper headers
-        # Return file for download with proper headers
-        base_name = os.path.splitext(filename)[0]
-        # Sanitize filename to ensure it is valid
-        safe_name = re.sub(r'[^a-zA-Z0-9_\-]', '_', base_name)
-        download_name = f"{safe_name}_Analysis.pdf"
-        
-        return FileResponse(
-            path=pdf_path,
-            media_type='application/pdf',
-            filename=download_name,
-            headers={
-                "Content-Disposition": f"attachment; filename={download_name}"
-            }
-        )
+    # Reports only change with the result, so clients can revalidate instead of downloading again
+    etag = report_cache.etag(job_id, audience, job.get("revision", 0))
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if not profile and etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=cache_headers)
     
+    try:
+        pdf_path = await get_report(job_id, job, audience, profile)
     except Exception as e:
         logger.error(f"Error generating PDF for job {job_id}: {e}", exc_info=True)
         return {"error": f"Failed to generate PDF: {str(e)}"}
+    
+    # Return file for download with proper headers
+    filename = job.get("filename", "audio.mp3")
+    base_name = os.path.splitext(filename)[0]
+    # Sanitize filename to ensure it is valid
+    safe_name = re.sub(r'[^a-zA-Z0-9_\-]', '_', base_name)
+    download_name = f"{safe_name}_Analysis.pdf"
+    
+    return FileResponse(
+        path=pdf_path,
+        media_type='application/pdf',
+        filename=download_name,
+        headers={
+            "Content-Disposition": f"attachment; filename={download_name}",
+            **cache_headers
+        }
+    )
+
+@app.get("/admin/profiles/{job_id}")
+async def get_profiles(job_id: str, request: Request):
+    """Profile artifacts of a job: <kind>.collapsed (stack samples) and <kind>.memory.txt (tracemalloc)."""
+    if not is_admin(request):
+        return JSONResponse(status_code=403, content=ADMIN_REQUIRED)
+    artifacts = await run_in_threadpool(list_artifacts, config.PROFILE_DIR, job_id)
+    if not artifacts:
+        return JSONResponse(status_code=404, content={"error": "No profile for this job"})
+    return {"job_id": job_id, "artifacts": artifacts}
+
+@app.get("/admin/profiles/{job_id}/{name}")
+async def download_profile(job_id: str, name: str, request: Request):
+    if not is_admin(request):
+        return JSONResponse(status_code=403, content=ADMIN_REQUIRED)
+    path = artifact_path(config.PROFILE_DIR, job_id, name)
+    if path is None:
+        return JSONResponse(status_code=404, content={"error": "Profile artifact not found"})
+    return FileResponse(path=path, media_type="text/plain", filename=f"{job_id}_{name}")
+
+scheduler = JobScheduler(
+    analyze_audio_sync,
+    on_update=apply_job_update,
+    workers=config.ANALYSIS_WORKERS,
+    max_queue=config.ANALYSIS_QUEUE_SIZE,
+    initializer=init_analysis_worker,
+    prestart=config.WHISPER_EAGER_LOAD,
+    on_start=record_queue_wait,
+    on_crash=record_worker_crash
+)
 
 if __name__ == "__main__":
     import uvicorn
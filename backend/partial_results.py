@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Partial results published while a job is still running.
+The energy curve and silence map go out as soon as the audio is decoded; transcript
+segments follow, each with its stand-alone risk, as the transcription backend produces them.
+"""
+
+import time
+from typing import Callable, Dict, Any, List, Tuple
+
+from fillers import FillerDetector
+from timeline import score_segments
+
+
+class PartialResultPublisher:
+    """
+    Accumulates the partial result of one job and hands what changed to `publish` as job fields
+    ({"partial": ..., "progress": ...}), at most once every `min_interval` seconds
+    for segment batches: the audio features once, then only segments not published yet
+    (the job store appends them). Progress moves through `progress_range` as transcription advances.
+    """
+
+    def __init__(self, publish: Callable[[Dict[str, Any]], None], filler_detector: FillerDetector,
+                 min_interval: float = 1.0, progress_range: Tuple[int, int] = (35, 60)):
+        self.publish = publish
+        self.filler_detector = filler_detector
+        self.min_interval = min_interval
+        self.progress_range = progress_range
+        self.partial = {"duration": 0, "energy": [], "silences": [], "segments": [], "transcribed_until": 0}
+        self._last_publish = 0.0
+        self._dirty = False
+        self._published_audio = False
+        self._published_segments = 0
+
+    def set_audio(self, duration: float, energy: List[Dict[str, Any]], silences: List[Dict[str, float]]):
+        self.partial.update({"duration": duration, "energy": energy, "silences": silences})
+        self._publish(force=True)
+
+    def add_segments(self, segments: List[Dict[str, Any]]):
+        if not segments:
+            return
+        self.partial["segments"].extend(score_segments(segments, self.filler_detector))
+        self.partial["transcribed_until"] = float(segments[-1].get("end", 0))
+        self._dirty = True
+        self._publish()
+
+    def flush(self):
+        """Publish any segments still held back by the rate limit."""
+        if self._dirty:
+            self._publish(force=True)
+
+    def _publish(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._last_publish < self.min_interval:
+            return
+        self._last_publish = now
+        self._dirty = False
+        update = {
+            "transcribed_until": self.partial["transcribed_until"],
+            "segments": self.partial["segments"][self._published_segments:]
+        }
+        self._published_segments = len(self.partial["segments"])
+        if not self._published_audio:
+            update.update({key: self.partial[key] for key in ("duration", "energy", "silences")})
+            self._published_audio = True
+        fields = {"partial": update}
+        duration = self.partial["duration"]
+        if duration > 0 and self.partial["transcribed_until"] > 0:
+            low, high = self.progress_range
+            fraction = min(self.partial["transcribed_until"] / duration, 1.0)
+            fields["progress"] = int(low + (high - low) * fraction)
+        self.publish(fields)
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+On-disk store of decoded audio, so re-analysing a recording skips ffmpeg.
+Each recording is one headerless file of 16 kHz mono samples (float32, or int16 at half the
+size) named after its key, usually the upload's content hash. Readers get np.memmap views,
+so any number of worker processes share the same pages of the OS cache without copying.
+Files are written under a temporary name and renamed into place, and expire `ttl` seconds
+after they were last used.
+"""
+
+import logging
+import os
+import re
+import tempfile
+import time
+from typing import Iterator, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DTYPES = {"float32": (np.float32, "f32"), "int16": (np.int16, "s16")}
+
+# Keys become file names
+_KEY = re.compile(r"^[a-zA-Z0-9_\-]+$")
+
+
+class PCMWriter:
+    """Same interface as audio_io.PCMSpool; array() publishes the file in the store."""
+
+    def __init__(self, store: "PCMStore", key: str):
+        self.store = store
+        self.key = key
+        self.samples = 0
+        fd, self._tmp_path = tempfile.mkstemp(dir=store.directory, suffix=".tmp")
+        self._file = os.fdopen(fd, "wb")
+
+    def write(self, block: np.ndarray):
+        self.samples += len(block)
+        self._file.write(self.store.encode(block).tobytes())
+
+    def array(self) -> np.ndarray:
+        """Commit the recording to the store and return it as float32."""
+        self._file.close()
+        os.replace(self._tmp_path, self.store.path(self.key))
+        return self.store.as_float32(self.store.open(self.key))
+
+    def cleanup(self):
+        """Drop the file if the recording was never committed."""
+        self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+
+class PCMStore:
+    def __init__(self, directory: str, ttl: int, dtype: str = "float32"):
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported retained audio dtype '{dtype}'. Choose one of: {', '.join(DTYPES)}")
+        self.directory = directory
+        self.ttl = ttl
+        self.dtype, self._extension = DTYPES[dtype]
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        if not _KEY.match(key):
+            raise ValueError(f"Invalid audio key: {key!r}")
+        return os.path.join(self.directory, f"{key}.{self._extension}")
+
+    def open(self, key: str) -> Optional[np.ndarray]:
+        """Read-only memory map of the stored samples (in the store's dtype), or None."""
+        path = self.path(key)
+        try:
+            # Bump mtime so eviction counts from the last use
+            os.utime(path)
+            if os.path.getsize(path) == 0:
+                return np.zeros(0, dtype=self.dtype)
+            # "c": writable for consumers that need it (torch.from_numpy), without touching the file
+            return np.memmap(path, dtype=self.dtype, mode="c")
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def writer(self, key: str) -> PCMWriter:
+        return PCMWriter(self, key)
+
+    def encode(self, block: np.ndarray) -> np.ndarray:
+        if self.dtype == np.float32:
+            return np.asarray(block, dtype=np.float32)
+        return np.rint(np.clip(block, -1.0, 32767 / 32768) * 32768).astype(np.int16)
+
+    def as_float32(self, samples: np.ndarray) -> np.ndarray:
+        """Whole recording as float32: the memory map itself, or a decoded copy for int16."""
+        if samples.dtype == np.float32:
+            return samples
+        return np.multiply(samples, 1 / 32768, dtype=np.float32)
+
+    def blocks(self, samples: np.ndarray, block_samples: int) -> Iterator[np.ndarray]:
+        """float32 blocks of a stored recording, for streaming feature extraction."""
+        for start in range(0, len(samples), block_samples):
+            yield self.as_float32(np.asarray(samples[start:start + block_samples]))
+
+    def delete(self, key: str):
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def evict(self) -> int:
+        """Delete recordings unused for longer than the TTL (and stale partial writes). Returns how many."""
+        cutoff = time.time() - self.ttl
+        removed = 0
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError as e:
+                # Still memory-mapped on Windows; try again on the next pass
+                logger.debug(f"Could not evict retained audio {path}: {e}")
+        return removed
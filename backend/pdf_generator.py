@@ -13,9 +13,162 @@ from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
 from reportlab.pdfgen import canvas
 from datetime import datetime
 import os
+import threading
+
+from fillers import FillerDetector
+from scoring import DEFAULT_SCORING_PROFILE
+from timeline import load_segment_features
+
+
+def _add_custom_styles(styles):
+    """Create custom paragraph styles"""
+    # Check if style exists before adding to avoid duplicate errors
+    
+    # Title style
+    try:
+        styles['CustomTitle']
+    except KeyError:
+        styles.add(ParagraphStyle(
+            name='CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor=HexColor('#1a1a1a'),
+            spaceAfter=30,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold'
+        ))
+    
+    # Section header
+    try:
+        styles['SectionHeader']
+    except KeyError:
+        styles.add(ParagraphStyle(
+            name='SectionHeader',
+            parent=styles['Heading2'],
+            fontSize=16,
+            textColor=HexColor('#2563eb'),
+            spaceAfter=12,
+            spaceBefore=20,
+            fontName='Helvetica-Bold'
+        ))
+    
+    # Subsection header
+    try:
+        styles['SubsectionHeader']
+    except KeyError:
+        styles.add(ParagraphStyle(
+            name='SubsectionHeader',
+            parent=styles['Heading3'],
+            fontSize=13,
+            textColor=HexColor('#1e40af'),
+            spaceAfter=8,
+            spaceBefore=12,
+            fontName='Helvetica-Bold'
+        ))
+    
+    # Body text
+    try:
+        styles['BodyText']
+    except KeyError:
+        styles.add(ParagraphStyle(
+            name='BodyText',
+            parent=styles['Normal'],
+            fontSize=11,
+            textColor=HexColor('#374151'),
+            spaceAfter=8,
+            alignment=TA_JUSTIFY,
+            leading=14
+        ))
+    
+    # Highlight box
+    try:
+        styles['HighlightBox']
+    except KeyError:
+        styles.add(ParagraphStyle(
+            name='HighlightBox',
+            parent=styles['Normal'],
+            fontSize=11,
+            textColor=HexColor('#991b1b'),
+            spaceAfter=10,
+            spaceBefore=10,
+            leftIndent=20,
+            rightIndent=20,
+            fontName='Helvetica-Bold'
+        ))
+    
+    # Timestamp style
+    try:
+        styles['Timestamp']
+    except KeyError:
+        styles.add(ParagraphStyle(
+            name='Timestamp',
+            parent=styles['Normal'],
+            fontSize=10,
+            textColor=HexColor('#6b7280'),
+            fontName='Courier'
+        ))
+
+    # Indented list items in suggestions
+    styles.add(ParagraphStyle(name='ListItem', parent=styles['BodyText'], leftIndent=20))
+    styles.add(ParagraphStyle(name='BulletItem', parent=styles['BodyText'], leftIndent=30))
+
+
+_style_sheet = None
+_style_sheet_lock = threading.Lock()
+
+
+def get_style_sheet():
+    """The report style sheet, built once per process and shared by every report."""
+    global _style_sheet
+    with _style_sheet_lock:
+        if _style_sheet is None:
+            styles = getSampleStyleSheet()
+            _add_custom_styles(styles)
+            _style_sheet = styles
+    return _style_sheet
+
+
+# Look shared by the per-item tables (filler words, complex language, pace issues)
+ITEM_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), HexColor('#2563eb')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), white),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), HexColor('#f3f4f6')),
+    ('GRID', (0, 0), (-1, -1), 0.5, HexColor('#d1d5db')),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ('TOPPADDING', (0, 1), (-1, -1), 6),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
+])
+
+# Rows per Table flowable. ReportLab re-splits a long table on every page break,
+# so many short tables lay out much faster than one huge one.
+TABLE_BATCH_ROWS = 40
+
+
+def _truncate(text, limit):
+    return text[:limit] + "..." if len(text) > limit else text
+
+
+def _format_time(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+def _item_tables(header, rows, col_widths):
+    """Rows as a series of compact tables of at most TABLE_BATCH_ROWS rows, each with the header."""
+    tables = []
+    for start in range(0, len(rows), TABLE_BATCH_ROWS):
+        table = Table([header] + rows[start:start + TABLE_BATCH_ROWS], colWidths=col_widths, repeatRows=1)
+        table.setStyle(ITEM_TABLE_STYLE)
+        tables.append(table)
+    return tables
+
 
 class PDFReportGenerator:
-    def __init__(self, output_path):
+    def __init__(self, output_path, max_items=0):
         self.output_path = output_path
         self.doc = SimpleDocTemplate(
             output_path,
@@ -26,95 +179,23 @@ class PDFReportGenerator:
             bottomMargin=0.75*inch
         )
         self.story = []
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
+        self.styles = get_style_sheet()
+        # Per-section item limit; the rest is listed in an appendix (0 = no limit)
+        self.max_items = max_items
+        self.appendix = []
     
-    def _setup_custom_styles(self):
-        """Create custom paragraph styles"""
-        # Check if style exists before adding to avoid duplicate errors
-        
-        # Title style
-        try:
-            self.styles['CustomTitle']
-        except KeyError:
-            self.styles.add(ParagraphStyle(
-                name='CustomTitle',
-                parent=self.styles['Heading1'],
-                fontSize=24,
-                textColor=HexColor('#1a1a1a'),
-                spaceAfter=30,
-                alignment=TA_CENTER,
-                fontName='Helvetica-Bold'
-            ))
-        
-        # Section header
-        try:
-            self.styles['SectionHeader']
-        except KeyError:
-            self.styles.add(ParagraphStyle(
-                name='SectionHeader',
-                parent=self.styles['Heading2'],
-                fontSize=16,
-                textColor=HexColor('#2563eb'),
-                spaceAfter=12,
-                spaceBefore=20,
-                fontName='Helvetica-Bold'
-            ))
-        
-        # Subsection header
-        try:
-            self.styles['SubsectionHeader']
-        except KeyError:
-            self.styles.add(ParagraphStyle(
-                name='SubsectionHeader',
-                parent=self.styles['Heading3'],
-                fontSize=13,
-                textColor=HexColor('#1e40af'),
-                spaceAfter=8,
-                spaceBefore=12,
-                fontName='Helvetica-Bold'
-            ))
-        
-        # Body text
-        try:
-            self.styles['BodyText']
-        except KeyError:
-            self.styles.add(ParagraphStyle(
-                name='BodyText',
-                parent=self.styles['Normal'],
-                fontSize=11,
-                textColor=HexColor('#374151'),
-                spaceAfter=8,
-                alignment=TA_JUSTIFY,
-                leading=14
-            ))
-        
-        # Highlight box
-        try:
-            self.styles['HighlightBox']
-        except KeyError:
-            self.styles.add(ParagraphStyle(
-                name='HighlightBox',
-                parent=self.styles['Normal'],
-                fontSize=11,
-                textColor=HexColor('#991b1b'),
-                spaceAfter=10,
-                spaceBefore=10,
-                leftIndent=20,
-                rightIndent=20,
-                fontName='Helvetica-Bold'
-            ))
-        
-        # Timestamp style
-        try:
-            self.styles['Timestamp']
-        except KeyError:
-            self.styles.add(ParagraphStyle(
-                name='Timestamp',
-                parent=self.styles['Normal'],
-                fontSize=10,
-                textColor=HexColor('#6b7280'),
-                fontName='Courier'
+    def _add_item_table(self, section, header, rows, col_widths):
+        """Add a section's item rows as compact tables, moving rows past max_items to the appendix."""
+        shown = rows
+        if self.max_items and len(rows) > self.max_items:
+            shown = rows[:self.max_items]
+            self.appendix.append((section, header, rows[self.max_items:], col_widths))
+        self.story.extend(_item_tables(header, shown, col_widths))
+        if len(shown) < len(rows):
+            self.story.append(Spacer(1, 0.1*inch))
+            self.story.append(Paragraph(
+                f"Showing the first {len(shown)} of {len(rows)}. The remaining {len(rows) - len(shown)} are listed in the appendix.",
+                self.styles['Timestamp']
             ))
     
     def add_header(self, filename):
@@ -176,35 +257,22 @@ class PDFReportGenerator:
         
         self.story.append(Spacer(1, 0.3*inch))
     
-    def add_filler_words_detail(self, segments, filler_pattern):
+    def add_filler_words_detail(self, segments, features):
         """Add detailed filler words analysis with timestamps"""
-        import re
-        
         self.story.append(Paragraph("Filler Words Analysis", self.styles['SectionHeader']))
         
-        # Collect all filler words with timestamps
+        # Collect all filler words with timestamps (per word when Whisper word timings were available)
         filler_instances = []
-        for seg in segments:
-            text = seg.get('text', '')
-            start_time = seg.get('start', 0)
-            
-            # Find all filler words in this segment using the passed pattern
-            # Use the pattern string directly if it's a string, or compile it
-            try:
-                matches = re.finditer(filler_pattern, text.lower(), re.IGNORECASE)
-                for match in matches:
-                    filler_word = match.group()
-                    minutes = int(start_time // 60)
-                    seconds = int(start_time % 60)
-                    time_str = f"{minutes}:{seconds:02d}"
-                    filler_instances.append({
-                        'word': filler_word,
-                        'time': time_str,
-                        'context': text.strip()
-                    })
-            except Exception as e:
-                print(f"Regex error: {e}")
+        for seg, filler_words in zip(segments, features['filler_words']):
+            if not filler_words:
                 continue
+            context = seg.get('text', '').strip()
+            for filler in filler_words:
+                filler_instances.append({
+                    'word': filler['word'],
+                    'time': _format_time(filler['start']),
+                    'context': context
+                })
         
         if not filler_instances:
             self.story.append(Paragraph(
@@ -221,67 +289,32 @@ class PDFReportGenerator:
         self.story.append(Spacer(1, 0.15*inch))
         
         # Create table of filler words
-        table_data = [['#', 'Time', 'Filler Word', 'Context']]
-        for idx, filler in enumerate(filler_instances, 1):
-            context = filler['context'][:60] + "..." if len(filler['context']) > 60 else filler['context']
-            table_data.append([
-                str(idx),
-                filler['time'],
-                filler['word'],
-                context
-            ])
-        
-        # Create table
-        if len(table_data) > 1:
-            table = Table(table_data, colWidths=[0.4*inch, 0.8*inch, 1.2*inch, 4*inch])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), HexColor('#2563eb')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), white),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), HexColor('#f3f4f6')),
-                ('GRID', (0, 0), (-1, -1), 0.5, HexColor('#d1d5db')),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('TOPPADDING', (0, 1), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-            ]))
-            
-            self.story.append(table)
+        rows = [
+            [str(idx), filler['time'], filler['word'], _truncate(filler['context'], 60)]
+            for idx, filler in enumerate(filler_instances, 1)
+        ]
+        self._add_item_table(
+            "Filler Words", ['#', 'Time', 'Filler Word', 'Context'], rows,
+            [0.4*inch, 0.8*inch, 1.2*inch, 4*inch]
+        )
         self.story.append(Spacer(1, 0.3*inch))
     
-    def add_complex_words_detail(self, segments):
+    def add_complex_words_detail(self, segments, features):
         """Add detailed analysis of complex/jargon words"""
-        import textstat
-        
         self.story.append(Paragraph("Complex Language Analysis", self.styles['SectionHeader']))
         
-        # Collect complex words (words with 3+ syllables or technical terms)
+        # Sections that are hard to read, with their long (3+ syllable) words
         complex_instances = []
-        for seg in segments:
-            text = seg.get('text', '')
-            start_time = seg.get('start', 0)
-            
-            # Check if segment is complex
-            if len(text) > 20:
-                reading_ease = textstat.flesch_reading_ease(text)
-                if reading_ease < 50:  # Difficult to read
-                    minutes = int(start_time // 60)
-                    seconds = int(start_time % 60)
-                    time_str = f"{minutes}:{seconds:02d}"
-                    
-                    # Find long/complex words (3+ syllables)
-                    words = text.split()
-                    complex_words = [w for w in words if textstat.syllable_count(w) >= 3]
-                    
-                    if complex_words:
-                        complex_instances.append({
-                            'time': time_str,
-                            'score': reading_ease,
-                            'words': complex_words[:5],  # First 5 complex words
-                            'context': text.strip()
-                        })
+        for seg, start_time, reading_ease, complex_words in zip(
+            segments, features['start'], features['reading_ease'], features['complex_words']
+        ):
+            if complex_words:
+                complex_instances.append({
+                    'time': _format_time(start_time),
+                    'score': reading_ease,
+                    'words': complex_words,
+                    'context': seg.get('text', '').strip()
+                })
         
         if not complex_instances:
             self.story.append(Paragraph(
@@ -296,54 +329,42 @@ class PDFReportGenerator:
         self.story.append(Paragraph(summary, self.styles['BodyText']))
         self.story.append(Spacer(1, 0.15*inch))
         
-        # List each complex section
-        for idx, instance in enumerate(complex_instances, 1):
-            self.story.append(Paragraph(f"<b>{idx}. At {instance['time']}</b>", self.styles['SubsectionHeader']))
-            
-            # Readability score
-            score_text = f"Readability Score: {instance['score']:.0f}/100 (Lower = Harder to understand)"
-            self.story.append(Paragraph(score_text, self.styles['BodyText']))
-            
-            # Complex words found
-            words_text = f"Complex words: {', '.join(instance['words'])}"
-            self.story.append(Paragraph(words_text, self.styles['BodyText']))
-            
-            # Context
-            context = instance['context'][:150] + "..." if len(instance['context']) > 150 else instance['context']
-            self.story.append(Paragraph(f'What you said: "{context}"', self.styles['BodyText']))
-            self.story.append(Spacer(1, 0.1*inch))
+        self.story.append(Paragraph(
+            "Readability scores run from 0 to 100; lower means harder to understand.",
+            self.styles['BodyText']
+        ))
         
-        self.story.append(Spacer(1, 0.2*inch))
+        # One row per complex section
+        rows = [
+            [
+                str(idx),
+                instance['time'],
+                f"{instance['score']:.0f}",
+                _truncate(', '.join(instance['words'][:3]), 32),
+                _truncate(instance['context'], 45)
+            ]
+            for idx, instance in enumerate(complex_instances, 1)
+        ]
+        self._add_item_table(
+            "Complex Language", ['#', 'Time', 'Score', 'Complex Words', 'What You Said'], rows,
+            [0.4*inch, 0.7*inch, 0.6*inch, 2*inch, 2.8*inch]
+        )
+        self.story.append(Spacer(1, 0.3*inch))
     
-    def add_speech_rate_analysis(self, segments, duration):
-        """Add detailed speech rate analysis per segment"""
+    def add_speech_rate_analysis(self, segments, features, pace=DEFAULT_SCORING_PROFILE['wpm']):
+        """Add detailed speech rate analysis per segment, with the pace thresholds of the scoring profile"""
         self.story.append(Paragraph("Speaking Pace Analysis", self.styles['SectionHeader']))
         
-        # Analyze each segment
+        # Flag segments that are too fast or too slow (segments too short to measure have NaN pace)
         pace_issues = []
-        for seg in segments:
-            text = seg.get('text', '').strip()
-            start_time = seg.get('start', 0)
-            end_time = seg.get('end', start_time + 1)
-            segment_duration = end_time - start_time
-            
-            if len(text) > 0 and segment_duration > 0.5:
-                words = len(text.split())
-                wpm = (words / segment_duration) * 60
-                
-                minutes = int(start_time // 60)
-                seconds = int(start_time % 60)
-                time_str = f"{minutes}:{seconds:02d}"
-                
-                # Flag if too fast or too slow
-                if wpm > 190 or wpm < 110:
-                    issue_type = "Too Fast" if wpm > 190 else "Too Slow"
-                    pace_issues.append({
-                        'time': time_str,
-                        'wpm': wpm,
-                        'type': issue_type,
-                        'text': text
-                    })
+        for seg, start_time, wpm in zip(segments, features['start'], features['wpm']):
+            if wpm > pace['too_fast'] or wpm < pace['too_slow']:
+                pace_issues.append({
+                    'time': _format_time(start_time),
+                    'wpm': wpm,
+                    'type': "Too Fast" if wpm > pace['too_fast'] else "Too Slow",
+                    'text': seg.get('text', '').strip()
+                })
         
         if not pace_issues:
             self.story.append(Paragraph(
@@ -354,31 +375,33 @@ class PDFReportGenerator:
             return
         
         # Summary
-        summary = f"Found <b>{len(pace_issues)} section(s)</b> where your speaking pace needs adjustment:"
+        summary = f"Found <b>{len(pace_issues)} section(s)</b> where your speaking pace needs adjustment (Optimal: 140-160 wpm):"
         self.story.append(Paragraph(summary, self.styles['BodyText']))
-        self.story.append(Spacer(1, 0.15*inch))
         
-        # List each issue
-        for idx, issue in enumerate(pace_issues, 1):
-            self.story.append(Paragraph(f"<b>{idx}. At {issue['time']} - {issue['type']}</b>", self.styles['SubsectionHeader']))
-            
-            # WPM
-            wpm_text = f"Speaking at: {issue['wpm']:.0f} words/minute (Optimal: 140-160 wpm)"
-            self.story.append(Paragraph(wpm_text, self.styles['BodyText']))
-            
-            # Explanation
-            if issue['type'] == "Too Fast":
-                explanation = "When you speak this fast, your audience can't keep up and will miss important points."
-            else:
-                explanation = "When you speak this slowly, people get bored and their minds start to wander."
-            self.story.append(Paragraph(explanation, self.styles['BodyText']))
-            
-            # Context
-            context = issue['text'][:100] + "..." if len(issue['text']) > 100 else issue['text']
-            self.story.append(Paragraph(f'What you said: "{context}"', self.styles['BodyText']))
-            self.story.append(Spacer(1, 0.1*inch))
+        # Explain each kind of issue once instead of per row
+        issue_types = {issue['type'] for issue in pace_issues}
+        if "Too Fast" in issue_types:
+            self.story.append(Paragraph(
+                "<b>Too Fast:</b> When you speak this fast, your audience can't keep up and will miss important points.",
+                self.styles['BodyText']
+            ))
+        if "Too Slow" in issue_types:
+            self.story.append(Paragraph(
+                "<b>Too Slow:</b> When you speak this slowly, people get bored and their minds start to wander.",
+                self.styles['BodyText']
+            ))
+        self.story.append(Spacer(1, 0.15*inch))
         
-        self.story.append(Spacer(1, 0.2*inch))
+        # One row per issue
+        rows = [
+            [str(idx), issue['time'], issue['type'], f"{issue['wpm']:.0f}", _truncate(issue['text'], 60)]
+            for idx, issue in enumerate(pace_issues, 1)
+        ]
+        self._add_item_table(
+            "Speaking Pace", ['#', 'Time', 'Issue', 'WPM', 'What You Said'], rows,
+            [0.4*inch, 0.7*inch, 0.9*inch, 0.6*inch, 3.9*inch]
+        )
+        self.story.append(Spacer(1, 0.3*inch))
     
     def add_suggestions(self, suggestions):
         """Add actionable suggestions"""
@@ -411,12 +434,10 @@ class PDFReportGenerator:
                    self.story.append(Paragraph(f"<b>{line}</b>", self.styles['BodyText']))
                 elif line.startswith('1.') or line.startswith('2.') or line.startswith('3.') or line.startswith('4.') or line.startswith('5.'):
                     # Indent numbered lists
-                    style = ParagraphStyle('List', parent=self.styles['BodyText'], leftIndent=20)
-                    self.story.append(Paragraph(line, style))
+                    self.story.append(Paragraph(line, self.styles['ListItem']))
                 elif line.startswith('•') or line.startswith('-') or line.startswith('✓'):
                      # Indent bullet lists
-                    style = ParagraphStyle('Bullet', parent=self.styles['BodyText'], leftIndent=30)
-                    self.story.append(Paragraph(line, style))
+                    self.story.append(Paragraph(line, self.styles['BulletItem']))
                 else:
                     self.story.append(Paragraph(line, self.styles['BodyText']))
                     
@@ -545,13 +566,27 @@ class PDFReportGenerator:
             
         self.story.append(Spacer(1, 0.3*inch))
 
+    def add_appendix(self):
+        """Full listing of the items that were cut from capped sections"""
+        if not self.appendix:
+            return
+        self.story.append(PageBreak())
+        self.story.append(Paragraph("Appendix: All Findings", self.styles['SectionHeader']))
+        for section, header, rows, col_widths in self.appendix:
+            self.story.append(Paragraph(f"<b>{section} (continued)</b>", self.styles['SubsectionHeader']))
+            self.story.extend(_item_tables(header, rows, col_widths))
+            self.story.append(Spacer(1, 0.2*inch))
+        self.appendix = []
+
     def generate(self):
         """Generate the PDF file"""
+        self.add_appendix()
         self.doc.build(self.story)
         return self.output_path
 
 
-def generate_detailed_report(analysis_result, filename, output_path):
+def generate_detailed_report(analysis_result, filename, output_path, audience_analysis=None, filler_detector=None,
+                             max_items=0):
     """
     Generate a detailed PDF report from analysis results
     
@@ -559,27 +594,51 @@ def generate_detailed_report(analysis_result, filename, output_path):
         analysis_result: Dictionary containing analysis results
         filename: Original audio filename
         output_path: Path where PDF should be saved
+        audience_analysis: Optional audience fit analysis to include
+        filler_detector: FillerDetector for results stored without per-segment features
+            (defaults to one built from the lexicon stored with the result)
+        max_items: Items shown per detail section before the rest moves to an appendix (0 = all inline)
     
     Returns:
         Path to generated PDF file
     """
-    pdf = PDFReportGenerator(output_path)
+    pdf = PDFReportGenerator(output_path, max_items=max_items)
     
     # Add header
     pdf.add_header(filename)
     
+    # Add audience analysis if provided
+    if audience_analysis:
+        pdf.add_audience_analysis(audience_analysis)
+    
     # Add critical moment
     drop_risks = analysis_result.get('drop_risks', [])
     critical_moment = drop_risks[0] if drop_risks else None
     pdf.add_critical_moment(critical_moment)
     
-    # Add detailed analyses
-    summary = analysis_result.get('summary', {})
+    # Per-segment metrics were computed during analysis; the sections below only format them
+    segments = analysis_result.get('segments', [])
+    if filler_detector is None:
+        filler_detector = FillerDetector(analysis_result.get('fillers', []))
+    features = load_segment_features(analysis_result, filler_detector) if segments else None
+    
+    # Add detailed filler words analysis
+    if segments:
+        pdf.add_filler_words_detail(segments, features)
     
-    # We need segments for detailed analysis - these should be stored in the job
-    # For now, we'll work with what we have
+    # Add complex words analysis
+    if segments:
+        pdf.add_complex_words_detail(segments, features)
+    
+    # Add speech rate analysis
+    duration = analysis_result.get('duration', 0)
+    if segments and duration > 0:
+        # Results scored before scoring profiles existed used the default thresholds
+        scoring_profile = analysis_result.get('scoring_profile') or DEFAULT_SCORING_PROFILE
+        pdf.add_speech_rate_analysis(segments, features, scoring_profile['wpm'])
     
     # Add suggestions
+    summary = analysis_result.get('summary', {})
     suggestions = summary.get('suggestions', [])
     pdf.add_suggestions(suggestions)
     
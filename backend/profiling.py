@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Opt-in profiling of single jobs.
+A profiled run samples the Python stack of the thread doing the work every few milliseconds
+(collapsed stacks, ready for flamegraph.pl or speedscope) and traces allocations with
+tracemalloc. Artifacts are written to <directory>/<job_id>/ and served to admins only.
+"""
+
+import collections
+import logging
+import os
+import random
+import re
+import shutil
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Allocation sites listed in the memory report
+TOP_ALLOCATIONS = 50
+
+# Artifact names are built from job ids and kinds; anything else is rejected on download
+_ARTIFACT_NAME = re.compile(r"^[a-zA-Z0-9_\-]+\.(collapsed|memory\.txt)$")
+_JOB_ID = re.compile(r"^[a-zA-Z0-9\-]+$")
+
+# tracemalloc is process-wide; it runs while at least one profile in this process needs it
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+_tracemalloc_started = False
+
+
+def should_profile(sample_rate: float) -> bool:
+    """Sampling decision for a job nobody explicitly asked to profile."""
+    return sample_rate > 0 and random.random() < sample_rate
+
+
+class SamplingProfiler:
+    """Samples one thread's stack every `interval` seconds from a background thread."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = 0
+        self._counts: Dict[str, int] = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        """One "outermost;...;innermost count" line per distinct stack."""
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self._counts.items()))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self._counts[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+
+class JobProfile:
+    """
+    Profile of one unit of work (`kind`, e.g. "analysis" or "report") of a job.
+    `checkpoint` takes a tracemalloc snapshot; the one with the most traced memory ends
+    up in the memory report, so call it where memory use is likely to peak (stage changes).
+    """
+
+    def __init__(self, job_id: str, kind: str, directory: str, interval: float):
+        self.job_id = job_id
+        self.kind = kind
+        self.directory = os.path.join(directory, job_id)
+        self.interval = interval
+        self._profiler = SamplingProfiler(threading.get_ident(), interval)
+        self._snapshot = None
+        self._snapshot_label = None
+        self._snapshot_size = -1
+        self._started = None
+
+    def start(self):
+        global _tracemalloc_users, _tracemalloc_started
+        with _tracemalloc_lock:
+            if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _tracemalloc_started = True
+            _tracemalloc_users += 1
+            tracemalloc.reset_peak()
+        self._started = time.perf_counter()
+        self._profiler.start()
+
+    def on_stage(self, job_id: str, stage: str):
+        """Stage hook (see main.stage_hooks)."""
+        if job_id == self.job_id:
+            self.checkpoint(stage)
+
+    def checkpoint(self, label: str):
+        size = tracemalloc.get_traced_memory()[0]
+        if size > self._snapshot_size:
+            self._snapshot = tracemalloc.take_snapshot()
+            self._snapshot_label = label
+            self._snapshot_size = size
+
+    def stop(self) -> List[str]:
+        """Stop profiling and write the artifacts. Returns their paths."""
+        global _tracemalloc_users, _tracemalloc_started
+        self._profiler.stop()
+        elapsed = time.perf_counter() - self._started
+        self.checkpoint("end")
+        current, peak = tracemalloc.get_traced_memory()
+        with _tracemalloc_lock:
+            _tracemalloc_users -= 1
+            # Leave tracing on if it was started elsewhere (e.g. PYTHONTRACEMALLOC)
+            if _tracemalloc_users == 0 and _tracemalloc_started:
+                tracemalloc.stop()
+                _tracemalloc_started = False
+
+        os.makedirs(self.directory, exist_ok=True)
+        stacks_path = os.path.join(self.directory, f"{self.kind}.collapsed")
+        with open(stacks_path, "w", encoding="utf-8") as f:
+            f.write(self._profiler.collapsed())
+
+        memory_path = os.path.join(self.directory, f"{self.kind}.memory.txt")
+        with open(memory_path, "w", encoding="utf-8") as f:
+            f.write(f"job {self.job_id} ({self.kind})\n")
+            f.write(f"wall time: {elapsed:.3f} s, {self._profiler.samples} stack samples every {self.interval * 1000:g} ms\n")
+            # Traced memory is process-wide: other jobs or renders in this process count too
+            f.write(f"traced memory: peak {peak / 1048576:.1f} MB, at end {current / 1048576:.1f} MB\n")
+            f.write(f"largest snapshot: {self._snapshot_size / 1048576:.1f} MB at '{self._snapshot_label}'\n\n")
+            # Leave out the profiler's own sample counts
+            snapshot = self._snapshot.filter_traces([tracemalloc.Filter(False, __file__)])
+            for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+                f.write(f"{stat.size / 1024:12.1f} KB {stat.count:9d} blocks  {stat.traceback}\n")
+        return [stacks_path, memory_path]
+
+    def finish(self):
+        """stop(), logging instead of raising: a failed profile must not fail the job."""
+        try:
+            paths = self.stop()
+            logger.info(f"Profile of job {self.job_id} ({self.kind}) written to {', '.join(paths)}")
+        except Exception as e:
+            logger.warning(f"Could not write profile of job {self.job_id} ({self.kind}): {e}")
+
+
+@contextmanager
+def profile_job(job_id: str, kind: str, directory: str, interval: float):
+    """Profile the calling thread for the duration of the block. Yields the JobProfile."""
+    job_profile = JobProfile(job_id, kind, directory, interval)
+    job_profile.start()
+    try:
+        yield job_profile
+    finally:
+        job_profile.finish()
+
+
+def list_artifacts(directory: str, job_id: str) -> List[Dict[str, object]]:
+    job_dir = os.path.join(directory, job_id)
+    if not _JOB_ID.match(job_id) or not os.path.isdir(job_dir):
+        return []
+    return [
+        {"name": name, "size": os.path.getsize(os.path.join(job_dir, name))}
+        for name in sorted(os.listdir(job_dir)) if _ARTIFACT_NAME.match(name)
+    ]
+
+
+def artifact_path(directory: str, job_id: str, name: str) -> Optional[str]:
+    """Path of an existing artifact, or None (also for names that could escape the directory)."""
+    if not _ARTIFACT_NAME.match(name) or not _JOB_ID.match(job_id):
+        return None
+    path = os.path.join(directory, job_id, name)
+    return path if os.path.isfile(path) else None
+
+
+def purge_profiles(directory: str, max_age: int) -> int:
+    """Delete the profiles of jobs last profiled more than `max_age` seconds ago. Returns how many."""
+    if not os.path.isdir(directory):
+        return 0
+    cutoff = time.time() - max_age
+    removed = 0
+    for job_id in os.listdir(directory):
+        job_dir = os.path.join(directory, job_id)
+        try:
+            if os.path.getmtime(job_dir) < cutoff:
+                shutil.rmtree(job_dir)
+                removed += 1
+        except OSError:
+            continue
+    return removed
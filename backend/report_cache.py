@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+On-disk cache of rendered PDF reports, one file per (job, audience).
+Files are written atomically so API and worker processes can share the directory;
+entries older than `max_age` are dropped, and the least recently used ones go first
+once the directory grows past its size budget.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the report layout changes so clients revalidate instead of keeping stale PDFs
+REPORT_VERSION = 2
+
+
+class ReportCache:
+    def __init__(self, directory: str, max_bytes: int, max_age: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    def path(self, job_id: str, audience: Optional[str]) -> str:
+        # Audience comes from the query string: hash it so the name is filename-safe and distinct
+        # audiences never share a file. "all" can't collide with a digest.
+        if audience is None:
+            audience_part = "all"
+        else:
+            audience_part = hashlib.sha1(audience.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"report_{job_id}_{audience_part}.pdf")
+
+    @staticmethod
+    def etag(job_id: str, audience: Optional[str], revision: int = 0) -> str:
+        """Strong validator for a report: it only changes when the job's result does."""
+        digest = hashlib.sha1(f"{job_id}:{audience or ''}:{revision}:{REPORT_VERSION}".encode()).hexdigest()
+        return f'"{digest}"'
+
+    def get(self, job_id: str, audience: Optional[str]) -> Optional[str]:
+        """Path of the cached report, or None if it hasn't been rendered."""
+        path = self.path(job_id, audience)
+        try:
+            # Bump mtime so eviction treats the report as recently used
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def put(self, job_id: str, audience: Optional[str], render: Callable[[str], object]) -> str:
+        """Call `render(path)` to write the report, then move it into place. Returns the final path."""
+        path = self.path(job_id, audience)
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            render(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+        self.evict()
+        return path
+
+    def invalidate(self, job_id: str):
+        """Drop every cached report of a job (all audiences)."""
+        prefix = f"report_{job_id}_"
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if name.startswith(prefix):
+                self._remove(os.path.join(self.directory, name))
+
+    def evict(self):
+        """Remove expired reports, then least recently used ones until the cache fits in max_bytes."""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        cutoff = time.time() - self.max_age
+        entries = []
+        total = 0
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if stat.st_mtime < cutoff:
+                self._remove(path)
+                continue
+            if name.endswith(".pdf"):
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Content-addressed cache of finished analysis results.
+Entries are JSON files on disk keyed by the audio hash plus the analysis configuration,
+so they survive restarts and are shared by every worker process. Least recently used
+entries are evicted once the cache grows past its size budget.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(content_hash: str, fingerprint: str) -> str:
+    """Combine the audio hash with the analysis config fingerprint."""
+    return hashlib.sha256(f"{content_hash}:{fingerprint}".encode()).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def _path(self, key):
+        # Two-level fan-out keeps directories small
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cache entry {key}: {e}")
+            self._remove(path)
+            return None
+        # Bump mtime so eviction treats the entry as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file and rename so readers in other processes never see partial JSON
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(result, f, default=float)
+            os.replace(tmp_path, path)
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+Bounded job scheduler for the analysis pipeline.
+Runs jobs on a fixed pool of worker processes and keeps a FIFO queue of the jobs waiting for one.
+"""
+
+import collections
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when every worker is busy and the waiting queue has no free slot."""
+
+
+# Channel back to the parent process. Only set inside worker processes.
+_updates = None
+
+
+def _init_worker(updates, initializer):
+    global _updates
+    _updates = updates
+    if initializer is not None:
+        initializer()
+    # Tell the parent this worker finished its initializer and can take jobs
+    updates.put((None, {"worker_ready": os.getpid()}))
+
+
+def _noop():
+    return None
+
+
+def publish(job_id, fields):
+    """
+    Send job field updates from a worker process to the parent process.
+    Returns False when called outside a worker, so callers can store the update locally instead.
+    """
+    if _updates is None:
+        return False
+    _updates.put((job_id, fields))
+    return True
+
+
+class JobScheduler:
+    """
+    Admission control in front of a process pool.
+
+    At most `workers` jobs run at once; up to `max_queue` more wait in FIFO order.
+    Field updates published by the workers are handed to `on_update` in the parent process.
+    `on_start(job_id, queue_wait)` is called when a job leaves the queue for a worker.
+    `on_crash(job_id, fields)` gets the failure of a job whose worker process died; unlike
+    worker updates, nothing has stored it yet (defaults to `on_update`).
+    With `prestart`, all worker processes are spawned (and run `initializer`) at start-up
+    instead of on the first submitted jobs.
+    """
+
+    def __init__(self, target, on_update, workers=2, max_queue=20, initializer=None, prestart=False, on_start=None,
+                 on_crash=None):
+        self.target = target
+        self.on_update = on_update
+        self.on_start = on_start
+        self.on_crash = on_crash or on_update
+        self.workers = workers
+        self.max_queue = max_queue
+        self.initializer = initializer
+        self.prestart = prestart
+        # spawn instead of fork: torch and librosa do not survive forking a threaded parent
+        self._ctx = multiprocessing.get_context("spawn")
+        self._lock = threading.RLock()
+        self._pending = collections.deque()
+        self._running = set()
+        self._ready_workers = set()
+        self._executor = None
+        self._updates = None
+        self._listener = None
+
+    def start(self):
+        self._updates = self._ctx.Queue()
+        with self._lock:
+            self._start_pool()
+        self._listener = threading.Thread(target=self._listen, name="job-updates", daemon=True)
+        self._listener.start()
+        logger.info(f"Job scheduler started with {self.workers} worker(s), queue size {self.max_queue}")
+
+    def shutdown(self):
+        with self._lock:
+            self._pending.clear()
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+        if self._updates is not None:
+            self._updates.put(None)
+
+    def submit(self, job_id, *args, target=None):
+        """
+        Queue a job, run as `target(job_id, *args)` (the scheduler's target by default).
+        Returns its queue position (0 = running now).
+        Raises QueueFullError when the queue is at capacity.
+        """
+        with self._lock:
+            if len(self._running) >= self.workers and len(self._pending) >= self.max_queue:
+                raise QueueFullError(f"Analysis queue is full ({self.max_queue} jobs waiting)")
+            self._pending.append((job_id, target or self.target, args, time.monotonic()))
+            self._dispatch()
+            return self.position(job_id)
+
+    def position(self, job_id):
+        """Queue position of a job: 0 while running, 1.. while waiting, None if unknown."""
+        with self._lock:
+            if job_id in self._running:
+                return 0
+            for idx, (pending_id, _, _, _) in enumerate(self._pending, 1):
+                if pending_id == job_id:
+                    return idx
+            return None
+
+    @property
+    def queue_length(self):
+        return len(self._pending)
+
+    @property
+    def ready_workers(self):
+        """Number of worker processes that have completed their initializer."""
+        return len(self._ready_workers)
+
+    def _start_pool(self):
+        self._ready_workers.clear()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=self._ctx,
+            initializer=_init_worker,
+            initargs=(self._updates, self.initializer),
+        )
+        if self.prestart:
+            # The pool spawns one process per submission while none is idle
+            for _ in range(self.workers):
+                self._executor.submit(_noop)
+
+    def _dispatch(self):
+        while self._pending and len(self._running) < self.workers:
+            job_id, target, args, queued_at = self._pending.popleft()
+            try:
+                future = self._executor.submit(target, job_id, *args)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM-killed); replace the pool and retry once
+                logger.error("Worker pool is broken, restarting it")
+                self._start_pool()
+                future = self._executor.submit(target, job_id, *args)
+            self._running.add(job_id)
+            future.add_done_callback(partial(self._on_done, job_id))
+            if self.on_start is not None:
+                try:
+                    self.on_start(job_id, time.monotonic() - queued_at)
+                except Exception as e:
+                    logger.error(f"on_start failed for job {job_id}: {e}", exc_info=True)
+
+    def _on_done(self, job_id, future):
+        if not future.cancelled() and future.exception() is not None:
+            # analyze_audio_sync handles its own errors, so this means the worker itself crashed
+            error = future.exception()
+            logger.error(f"Worker crashed while processing job {job_id}: {error!r}")
+            try:
+                self.on_crash(job_id, {"status": "failed", "error": f"Worker crashed: {error}"})
+            except Exception as e:
+                logger.error(f"Failed to record crash of job {job_id}: {e}", exc_info=True)
+        with self._lock:
+            self._running.discard(job_id)
+            if self._executor is not None:
+                self._dispatch()
+
+    def _listen(self):
+        while True:
+            message = self._updates.get()
+            if message is None:
+                break
+            job_id, fields = message
+            if job_id is None:
+                self._ready_workers.add(fields["worker_ready"])
+                logger.info(f"Analysis worker {fields['worker_ready']} is ready")
+                continue
+            try:
+                self.on_update(job_id, fields)
+            except Exception as e:
+                logger.error(f"Failed to apply update for job {job_id}: {e}", exc_info=True)
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Risk scoring profiles.
+A scoring profile holds every threshold and penalty of the timeline scoring. Results keep the
+profile they were scored with and the inputs of the scoring stages (RMS curve, silence map),
+so a finished job can be re-scored with another profile without decoding or transcribing.
+"""
+
+import base64
+import copy
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_SCORING_PROFILE = {
+    # Pace of a segment in words per minute
+    "wpm": {"way_too_fast": 220, "too_fast": 190, "too_slow": 110, "way_too_slow": 90},
+    # Filler words in one segment
+    "fillers": {"too_many": 5, "several": 3},
+    # Words in one segment
+    "words": {"extremely_long": 50, "very_long": 40},
+    # Flesch reading ease of a segment (lower = harder)
+    "reading_ease": {"very_difficult": 20, "complex": 30},
+    # Standard deviations of RMS energy below the recording's mean
+    "energy_std": {"extremely_low": 2.0, "low": 1.5},
+    # Length of a silence in seconds
+    "silence_sec": {"dead_air": 6, "awkward": 4},
+    # Risk added per severity level, starting with level 0 (no issue)
+    "penalties": {
+        # too fast, way too fast, too slow, way too slow
+        "rate": [0, 20, 35, 15, 30],
+        "fillers": [0, 15, 30],
+        "length": [0, 15, 30],
+        "complexity": [0, 15, 30],
+        "energy": [0, 20, 35],
+        "silence": [0, 40, 65]
+    },
+    # Risk of a timeline point with no issues at all
+    "base_risk": 20,
+    # Timeline points above this risk are drop risks
+    "drop_risk_threshold": 70
+}
+
+# (section, severe level, mild level, direction): severe thresholds lie beyond mild ones in `direction`
+_ORDER = [
+    ("wpm", "way_too_fast", "too_fast", 1),
+    ("wpm", "way_too_slow", "too_slow", -1),
+    ("fillers", "too_many", "several", 1),
+    ("words", "extremely_long", "very_long", 1),
+    ("reading_ease", "very_difficult", "complex", -1),
+    ("energy_std", "extremely_low", "low", 1),
+    ("silence_sec", "dead_air", "awkward", 1),
+]
+
+
+def resolve_scoring_profile(overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    The default profile with `overrides` (any subset of its keys) applied.
+    Raises ValueError with a client-facing message for unknown keys or invalid values.
+    """
+    profile = copy.deepcopy(DEFAULT_SCORING_PROFILE)
+    for section, value in (overrides or {}).items():
+        if section not in profile:
+            raise ValueError(f"Unknown scoring setting '{section}'. Choose from: {', '.join(profile)}")
+        default = profile[section]
+        if not isinstance(default, dict):
+            profile[section] = _number(value, section)
+            continue
+        if not isinstance(value, dict):
+            raise ValueError(f"Scoring setting '{section}' must be an object")
+        for key, item in value.items():
+            if key not in default:
+                raise ValueError(f"Unknown scoring setting '{section}.{key}'. Choose from: {', '.join(default)}")
+            if isinstance(default[key], list):
+                if not isinstance(item, list) or len(item) != len(default[key]):
+                    raise ValueError(f"'{section}.{key}' must be a list of {len(default[key])} numbers")
+                default[key] = [_number(penalty, f"{section}.{key}") for penalty in item]
+            else:
+                default[key] = _number(item, f"{section}.{key}")
+
+    for section, severe, mild, direction in _ORDER:
+        if (profile[section][severe] - profile[section][mild]) * direction < 0:
+            relation = "at least" if direction > 0 else "at most"
+            raise ValueError(f"'{section}.{severe}' must be {relation} '{section}.{mild}'")
+    return profile
+
+
+def _number(value: Any, name: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not np.isfinite(value):
+        raise ValueError(f"'{name}' must be a number")
+    return value
+
+
+def scoring_inputs(rms: np.ndarray, silence_sections: List[Dict[str, float]]) -> Dict[str, Any]:
+    """JSON-friendly copy of the scoring stages' audio inputs (the RMS curve as base64 float32)."""
+    return {
+        "rms": base64.b64encode(np.asarray(rms, dtype=np.float32).tobytes()).decode("ascii"),
+        "silence_sections": silence_sections
+    }
+
+
+def load_scoring_inputs(result: Dict[str, Any]) -> Optional[Tuple[np.ndarray, List[Dict[str, float]]]]:
+    """(rms, silence_sections) stored with a result, or None for results from before they were stored."""
+    inputs = result.get("scoring_inputs")
+    if not inputs:
+        return None
+    rms = np.frombuffer(base64.b64decode(inputs["rms"]), dtype=np.float32)
+    return rms, inputs["silence_sections"]
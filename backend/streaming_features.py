@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Block-wise audio features for recordings of any length.
+StreamingFeatures computes the same RMS frames as librosa.feature.rms (centered, zero-padded)
+while the audio is still being decoded, keeping only one frame of overlap between blocks.
+Silence detection then works on the frame energies, exactly like librosa.effects.split, so
+the full-length signal is never needed for either.
+"""
+
+from typing import Iterable, Optional
+
+import librosa
+import numpy as np
+
+from audio_io import PCMSpool
+
+
+class StreamingFeatures:
+    """Feed blocks of mono float32 audio with add(), then call finish() once."""
+
+    def __init__(self, sr: int, frame_length: int = 2048, hop_length: int = 512):
+        self.sr = sr
+        self.frame_length = frame_length
+        self.hop_length = hop_length
+        self.samples = 0
+        # Samples of the (virtually) padded signal from the start of the next frame on;
+        # centered frames start half a frame before the audio does
+        self._pending = np.zeros(frame_length // 2, dtype=np.float32)
+        self._rms_blocks = []
+        self._finished = False
+
+    def add(self, block: np.ndarray):
+        self.samples += len(block)
+        self._pending = np.concatenate((self._pending, block))
+        self._emit_frames()
+
+    def finish(self):
+        """Pad the end like librosa does and compute the last frames."""
+        if not self._finished:
+            self._pending = np.concatenate((self._pending, np.zeros(self.frame_length // 2, dtype=np.float32)))
+            self._emit_frames()
+            self._pending = None
+            self._finished = True
+
+    @property
+    def duration(self) -> float:
+        return self.samples / self.sr
+
+    @property
+    def rms(self) -> np.ndarray:
+        """RMS energy per frame, as librosa.feature.rms(y=y, frame_length, hop_length)[0]."""
+        if not self._rms_blocks:
+            return np.zeros(0, dtype=np.float32)
+        if len(self._rms_blocks) > 1:
+            self._rms_blocks = [np.concatenate(self._rms_blocks)]
+        return self._rms_blocks[0]
+
+    def non_silent_intervals(self, top_db: float = 30) -> np.ndarray:
+        """Sample intervals louder than `top_db` below the loudest frame, as librosa.effects.split(y, top_db)."""
+        rms = self.rms
+        if len(rms) == 0:
+            return np.zeros((0, 2), dtype=np.int64)
+        # librosa.amplitude_to_db(rms, ref=np.max, top_db=None), computed on powers
+        power = np.square(rms)
+        db = 10.0 * np.log10(np.maximum(1e-10, power)) - 10.0 * np.log10(np.maximum(1e-10, power.max()))
+        non_silent = db > -top_db
+
+        edges = [np.flatnonzero(np.diff(non_silent.astype(int))) + 1]
+        if non_silent[0]:
+            edges.insert(0, np.array([0]))
+        if non_silent[-1]:
+            edges.append(np.array([len(non_silent)]))
+        edges = librosa.frames_to_samples(np.concatenate(edges), hop_length=self.hop_length)
+        return np.minimum(edges, self.samples).reshape((-1, 2))
+
+    def _emit_frames(self):
+        if len(self._pending) < self.frame_length:
+            return
+        count = 1 + (len(self._pending) - self.frame_length) // self.hop_length
+        used = (count - 1) * self.hop_length + self.frame_length
+        rms = librosa.feature.rms(
+            y=self._pending[:used], frame_length=self.frame_length, hop_length=self.hop_length, center=False
+        )[0]
+        self._rms_blocks.append(rms)
+        self._pending = self._pending[count * self.hop_length:]
+
+
+def analyze_blocks(blocks: Iterable[np.ndarray], sr: int, spool: Optional[PCMSpool] = None,
+                   hop_length: int = 512) -> StreamingFeatures:
+    """Run the blocks through StreamingFeatures, copying them into `spool` for transcription on the way."""
+    features = StreamingFeatures(sr, hop_length=hop_length)
+    for block in blocks:
+        features.add(block)
+        if spool is not None:
+            spool.write(block)
+    features.finish()
+    return features
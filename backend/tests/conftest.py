@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""The backend modules import each other by their top-level names, as they do when run from backend/."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from chunking import plan_chunks
+
+SR = 16000
+
+
+def seconds(*intervals):
+    return [[int(start * SR), int(end * SR)] for start, end in intervals]
+
+
+def cut_points(chunks):
+    return [start / SR for start, _ in chunks[1:]]
+
+
+def test_cuts_mid_gap_once_the_chunk_reaches_target():
+    chunks = plan_chunks(seconds((0, 30), (40, 70), (80, 100), (110, 200)), 200 * SR, SR)
+    assert cut_points(chunks) == [75, 105]
+
+
+def test_cuts_at_the_last_gap_instead_of_splitting_speech_past_max():
+    # 50 s of speech is below target, but the next interval would take the chunk past max_sec
+    chunks = plan_chunks(seconds((0, 50), (52, 130)), 130 * SR, SR)
+    assert cut_points(chunks) == [51]
+
+
+def test_cut_moves_later_in_a_long_gap_so_the_next_speech_fits():
+    chunks = plan_chunks(seconds((0, 10), (100, 215)), 215 * SR, SR)
+    assert cut_points(chunks) == [95]
+
+
+def test_hard_splits_speech_longer_than_max_without_a_pause():
+    chunks = plan_chunks(seconds((10, 300)), 300 * SR, SR)
+    assert cut_points(chunks) == [10, 130, 250]
+
+
+def test_silent_recording_is_split_at_max():
+    chunks = plan_chunks([], 300 * SR, SR)
+    assert cut_points(chunks) == [120, 240]
+
+
+def test_short_recording_is_one_chunk():
+    assert plan_chunks(seconds((1, 20)), 30 * SR, SR) == [(0, 30 * SR)]
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_chunks_cover_the_recording_and_only_cut_speech_when_unavoidable(seed):
+    rng = np.random.RandomState(seed)
+    edges = np.cumsum(rng.uniform(0.2, 90, size=2 * rng.randint(1, 30)))
+    intervals = (edges.reshape(-1, 2) * SR).astype(np.int64)
+    total = int(intervals[-1][1] + rng.uniform(0, 200) * SR)
+    chunks = plan_chunks(intervals, total, SR)
+
+    assert chunks[0][0] == 0 and chunks[-1][1] == total
+    assert all(hi == lo for (_, hi), (lo, _) in zip(chunks[:-1], chunks[1:]))
+    assert all(hi - lo <= 120 * SR for lo, hi in chunks)
+    for cut in cut_points(chunks):
+        inside = [(start, end) for start, end in intervals if start < cut * SR < end]
+        # A cut inside speech is only allowed in an interval that can't fit in one chunk
+        assert all(end - start > 120 * SR for start, end in inside)
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+import random
+import re
+
+import pytest
+
+from fillers import FILLER_LEXICONS, FillerDetector, load_fillers
+
+# The pattern FillerDetector replaced, for the built-in English lexicon
+FILLER_PATTERN = re.compile(r'\b(um|uh|like|you know|so|actually|basically|literally)\b')
+
+WORDS = ["um", "Uh", "like", "you", "know", "YOU", "Know", "so", "actually", "basically", "literally",
+         "summer", "likely", "so-so", "umm", "you_know", "café", "x", "42"]
+SEPARATORS = [" ", "  ", "\n", "\t", ", ", "-", ".", "'", " - "]
+
+
+@pytest.fixture(scope="module")
+def detector():
+    return FillerDetector(FILLER_LEXICONS["en"])
+
+
+def test_count_matches_the_old_pattern_on_random_text(detector):
+    rng = random.Random(0)
+    for _ in range(5000):
+        text = "".join(rng.choice(WORDS) + rng.choice(SEPARATORS) for _ in range(rng.randint(1, 20)))
+        assert detector.count(text) == len(FILLER_PATTERN.findall(text.lower())), text
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("you know what", ["you know"]),
+    ("You Know", ["you know"]),
+    ("you  know", []),
+    ("you\nknow", []),
+    ("you, know", []),
+    ("you-know", []),
+    ("um so like", ["um", "so", "like"]),
+    ("summer likely", []),
+])
+def test_find(detector, text, expected):
+    assert detector.find(text) == expected
+
+
+def test_find_in_segment_uses_word_timings(detector):
+    segment = {
+        "start": 0.0, "end": 3.0, "text": " Um, you know it",
+        "words": [
+            {"word": " Um,", "start": 0.0, "end": 0.4},
+            {"word": " you", "start": 0.5, "end": 0.7},
+            {"word": " know", "start": 0.7, "end": 1.0},
+            {"word": " it", "start": 1.1, "end": 1.3},
+        ]
+    }
+    assert detector.find_in_segment(segment) == [
+        {"word": "um", "start": 0.0, "end": 0.4},
+        {"word": "you know", "start": 0.5, "end": 1.0},
+    ]
+
+
+def test_find_in_segment_without_word_timings_uses_the_segment_bounds(detector):
+    segment = {"start": 2.0, "end": 4.0, "text": " so, um"}
+    assert detector.find_in_segment(segment) == [
+        {"word": "so", "start": 2.0, "end": 4.0},
+        {"word": "um", "start": 2.0, "end": 4.0},
+    ]
+
+
+def test_longest_match_wins():
+    detector = FillerDetector(["you", "you know", "you know what"])
+    assert detector.find("you know what you know you") == ["you know what", "you know", "you"]
+
+
+def test_load_fillers_rejects_unknown_languages():
+    assert load_fillers("en, de") == FILLER_LEXICONS["en"] + FILLER_LEXICONS["de"]
+    with pytest.raises(ValueError):
+        load_fillers("xx")
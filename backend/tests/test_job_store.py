@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Partial results in both job stores: appended per publish, read from an offset, kept out of status reads."""
+
+import pytest
+
+from fillers import FILLER_LEXICONS, FillerDetector
+from job_store import MemoryJobStore, SQLiteJobStore
+from partial_results import PartialResultPublisher
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryJobStore(ttl=60)
+    return SQLiteJobStore(str(tmp_path / "jobs.db"), ttl=60)
+
+
+def _publish_recording(store, job_id, batches):
+    store.create(job_id, {"status": "processing", "progress": 0})
+    publisher = PartialResultPublisher(lambda fields: store.update(job_id, fields),
+                                       FillerDetector(FILLER_LEXICONS["en"]), min_interval=0)
+    publisher.set_audio(60.0, [{"time": "0:00", "seconds": 0.0, "energy": 0.5}], [{"start": 1.0, "end": 4.0, "duration": 3.0}])
+    for i in range(batches):
+        publisher.add_segments([
+            {"start": i * 5.0, "end": i * 5.0 + 4, "text": f" we talk about part {i}"},
+            {"start": i * 5.0 + 4, "end": i * 5.0 + 5, "text": " um"},
+        ])
+    return publisher
+
+
+def test_partial_segments_are_appended(store):
+    publisher = _publish_recording(store, "job", 5)
+    partial = store.get_partial("job")
+    assert partial["segments"] == publisher.partial["segments"]
+    assert len(partial["segments"]) == 10
+    assert partial["duration"] == 60.0
+    assert partial["energy"] == publisher.partial["energy"]
+    assert partial["transcribed_until"] == 25.0
+    assert store.get_partial("job", 8)["segments"] == publisher.partial["segments"][8:]
+    assert "partial" not in store.get("job", include_result=False)
+
+
+def test_publisher_sends_only_new_segments():
+    updates = []
+    publisher = PartialResultPublisher(updates.append, FillerDetector(FILLER_LEXICONS["en"]), min_interval=0)
+    publisher.set_audio(10.0, [], [])
+    publisher.add_segments([{"start": 0.0, "end": 2.0, "text": " one"}])
+    publisher.add_segments([{"start": 2.0, "end": 4.0, "text": " two"}])
+    assert "energy" in updates[0]["partial"] and "energy" not in updates[1]["partial"]
+    assert [len(update["partial"]["segments"]) for update in updates] == [0, 1, 1]
+
+
+def test_clearing_the_partial_result(store):
+    _publish_recording(store, "job", 2)
+    store.update("job", {"status": "done", "partial": None})
+    assert store.get_partial("job") is None
+    # A re-created job starts without the old segments
+    _publish_recording(store, "job", 1)
+    assert len(store.get_partial("job")["segments"]) == 2
+
+
+def test_deleted_job_has_no_partial_result(store):
+    _publish_recording(store, "job", 1)
+    store.delete("job")
+    assert store.get_partial("job") is None
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from scoring import DEFAULT_SCORING_PROFILE, load_scoring_inputs, resolve_scoring_profile, scoring_inputs
+
+
+def test_no_overrides_is_the_default_profile():
+    profile = resolve_scoring_profile()
+    assert profile == DEFAULT_SCORING_PROFILE
+    # A copy: callers may change it
+    profile["wpm"]["too_fast"] = 0
+    assert DEFAULT_SCORING_PROFILE["wpm"]["too_fast"] == 190
+
+
+def test_overrides_merge_into_the_defaults():
+    profile = resolve_scoring_profile({"wpm": {"too_fast": 170}, "drop_risk_threshold": 60,
+                                       "penalties": {"silence": [0, 10, 20]}})
+    assert profile["wpm"] == {"way_too_fast": 220, "too_fast": 170, "too_slow": 110, "way_too_slow": 90}
+    assert profile["drop_risk_threshold"] == 60
+    assert profile["penalties"]["silence"] == [0, 10, 20]
+    assert profile["penalties"]["rate"] == DEFAULT_SCORING_PROFILE["penalties"]["rate"]
+
+
+@pytest.mark.parametrize("overrides", [
+    {"nope": 1},
+    {"wpm": {"nope": 1}},
+    {"wpm": 200},
+    {"base_risk": {"a": 1}},
+    {"base_risk": "20"},
+    {"base_risk": True},
+    {"base_risk": float("nan")},
+    {"wpm": {"too_fast": None}},
+    {"penalties": {"rate": [0, 1, 2]}},
+    {"penalties": {"rate": "0,20,35,15,30"}},
+    {"penalties": {"energy": [0, 20, "35"]}},
+    # Severe thresholds must lie beyond the mild ones
+    {"wpm": {"way_too_fast": 180}},
+    {"wpm": {"way_too_slow": 120}},
+    {"fillers": {"several": 6}},
+    {"reading_ease": {"very_difficult": 40}},
+    {"silence_sec": {"awkward": 7}},
+])
+def test_invalid_overrides_are_rejected(overrides):
+    with pytest.raises(ValueError):
+        resolve_scoring_profile(overrides)
+
+
+def test_scoring_inputs_round_trip():
+    rms = np.random.RandomState(0).rand(1000).astype(np.float32)
+    silences = [{"start": 1.0, "end": 4.5, "duration": 3.5}]
+    loaded_rms, loaded_silences = load_scoring_inputs({"scoring_inputs": scoring_inputs(rms, silences)})
+    assert np.array_equal(loaded_rms, rms)
+    assert loaded_silences == silences
+    assert load_scoring_inputs({}) is None
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+The vectorized timeline against the per-point loop it replaced. The reference below is that
+loop, trimmed to what it computed, with the original regex filler pattern.
+"""
+
+import re
+
+import numpy as np
+import pytest
+import textstat
+
+from fillers import FILLER_LEXICONS, FillerDetector
+from scoring import resolve_scoring_profile
+from timeline import build_timeline, compute_segment_features, find_silence_sections, score_segments
+
+FILLER_PATTERN = r'\b(um|uh|like|you know|so|actually|basically|literally)\b'
+FILLER_DETECTOR = FillerDetector(FILLER_LEXICONS["en"])
+
+VOCABULARY = [
+    "um", "uh", "like", "you", "know", "so", "actually", "basically", "literally", "we", "the", "talk",
+    "about", "a", "plan", "interoperability", "characterization", "institutionalization", "it", "is",
+]
+
+
+def _reference_segment(seg):
+    """Risk added by a segment's own features, with its reasons and problems."""
+    risk = 0
+    reasons = []
+    problems = []
+    text = seg.get("text", "").strip()
+    segment_duration = seg.get("end", 0) - seg.get("start", 0)
+
+    if len(text) > 0 and segment_duration > 0.5:
+        segment_speech_rate = (len(text.split()) / segment_duration) * 60
+        if segment_speech_rate > 220:
+            risk += 35
+            reasons.append("speaking way too fast")
+            problems.append(f"You spoke way too fast here ({segment_speech_rate:.0f} words/min). Listeners cannot keep up with this speed.")
+        elif segment_speech_rate > 190:
+            risk += 20
+            reasons.append("speaking too fast")
+            problems.append(f"You spoke too fast here ({segment_speech_rate:.0f} words/min). It is hard to follow your points.")
+        elif segment_speech_rate < 90:
+            risk += 30
+            reasons.append("speaking way too slow")
+            problems.append(f"You spoke way too slowly here (only {segment_speech_rate:.0f} words/min). The audience will get bored waiting for your next word.")
+        elif segment_speech_rate < 110:
+            risk += 15
+            reasons.append("speaking too slow")
+            problems.append(f"You spoke a bit too slowly here ({segment_speech_rate:.0f} words/min). You risk losing the audience's interest.")
+
+    segment_fillers = len(re.findall(FILLER_PATTERN, text.lower()))
+    if segment_fillers >= 5:
+        risk += 30
+        reasons.append("too many filler words")
+        problems.append(f"You used {segment_fillers} filler words ('um', 'uh', 'like') in this short clip. This makes you sound unsure of yourself.")
+    elif segment_fillers >= 3:
+        risk += 15
+        reasons.append("several filler words")
+        problems.append(f"You used {segment_fillers} filler words here. Try to pause silently instead of saying 'um' or 'uh'.")
+
+    word_count = len(text.split())
+    if word_count > 50:
+        risk += 30
+        reasons.append("extremely long section")
+        problems.append(f"You spoke {word_count} words without a single pause. Listeners need a break to process this much information.")
+    elif word_count > 40:
+        risk += 15
+        reasons.append("very long section")
+        problems.append(f"This section is too long ({word_count} words) without a break. You need to pause to let your audience digest what you said.")
+
+    if len(text) > 20:
+        segment_reading_ease = textstat.flesch_reading_ease(text)
+        if segment_reading_ease < 20:
+            risk += 30
+            reasons.append("very difficult language")
+            problems.append("You used very complicated words here. The audience likely didn't understand what you meant.")
+        elif segment_reading_ease < 30:
+            risk += 15
+            reasons.append("complex language")
+            problems.append("The language here is dense and hard to follow. Try simpler words.")
+    return risk, reasons, problems
+
+
+def _reference_timeline(duration, segments, rms, silence_sections, num_points):
+    rms_mean = np.mean(rms)
+    rms_std = np.std(rms)
+    timeline = []
+    drop_risks = []
+    for i in range(num_points):
+        time_sec = (i / (num_points - 1)) * duration if num_points > 1 else 0
+        time_str = f"{int(time_sec // 60)}:{int(time_sec % 60):02d}"
+        base_risk = 20
+        risk_reasons = []
+        detailed_problems = []
+
+        current_segment = None
+        for seg in segments:
+            if seg.get("start", 0) <= time_sec <= seg.get("end", 0):
+                current_segment = seg
+                break
+        if current_segment:
+            risk, risk_reasons, detailed_problems = _reference_segment(current_segment)
+            base_risk += risk
+
+        rms_idx = int((time_sec / duration) * len(rms)) if duration > 0 else 0
+        rms_idx = min(rms_idx, len(rms) - 1)
+        if rms_idx < len(rms):
+            segment_rms = rms[rms_idx]
+            if segment_rms < rms_mean - (2.0 * rms_std):
+                base_risk += 35
+                risk_reasons.append("extremely low energy")
+                detailed_problems.append("Your voice became completely flat here. You stopped varying your pitch and volume, which sounds robotic.")
+            elif segment_rms < rms_mean - (1.5 * rms_std):
+                base_risk += 20
+                risk_reasons.append("low energy")
+                detailed_problems.append("Your voice got much quieter and flatter here. It sounds like you lost interest in what you were saying.")
+
+        for silence in silence_sections:
+            if silence["start"] <= time_sec <= silence["end"]:
+                silence_duration = silence["duration"]
+                if silence_duration > 6:
+                    base_risk += 65
+                    risk_reasons.append(f"no speech detected ({silence_duration:.1f}s)")
+                    detailed_problems.append(f"⚠️ Long silence detected ({silence_duration:.1f}s). This dead air kills the momentum of your speech.")
+                elif silence_duration > 4:
+                    base_risk += 40
+                    risk_reasons.append(f"long silence ({silence_duration:.1f}s)")
+                    detailed_problems.append(f"🔇 Awkward pause ({silence_duration:.1f}s). This break is too long and feels unnatural.")
+                break
+
+        risk = min(base_risk, 100)
+        timeline.append({
+            "time": time_str,
+            "risk": risk,
+            "reasons": risk_reasons,
+            "detailed_problems": detailed_problems,
+            "segment_text": current_segment.get("text", "") if current_segment else ""
+        })
+        if risk > 70:
+            if current_segment:
+                text = current_segment.get("text", "")
+                transcript_preview = text[:100] + "..." if len(text) > 100 else text
+                if detailed_problems:
+                    issue_description = " ".join(detailed_problems)
+                    issue_description += f"\n\nTranscript: \"{transcript_preview}\""
+                else:
+                    issue_description = f"Multiple issues detected. Transcript: \"{transcript_preview}\""
+            else:
+                issue_description = " ".join(detailed_problems) if detailed_problems else "Critical attention drop detected."
+            end_time_sec = min(time_sec + 10, duration)
+            drop_risks.append({
+                "start": time_str,
+                "end": f"{int(end_time_sec // 60)}:{int(end_time_sec % 60):02d}",
+                "risk": f"{risk}%",
+                "description": issue_description,
+                "reasons": risk_reasons,
+                "detailed_problems": detailed_problems,
+                "risk_value": risk,
+                "segment_text": current_segment.get("text", "") if current_segment else ""
+            })
+
+    if drop_risks:
+        most_critical = max(drop_risks, key=lambda x: x["risk_value"])
+        for entry in timeline:
+            if entry["time"] == most_critical["start"]:
+                entry["label"] = "CRITICAL MOMENT - Maximum attention drop"
+                break
+    return timeline, drop_risks
+
+
+def _reference_silence_sections(non_silent_intervals, sr):
+    silence_sections = []
+    prev_end = 0
+    for start_sample, end_sample in non_silent_intervals:
+        start_time = start_sample / sr
+        end_time = end_sample / sr
+        if start_time - prev_end > 2.0:
+            silence_sections.append({"start": prev_end, "end": start_time, "duration": start_time - prev_end})
+        prev_end = end_time
+    return silence_sections
+
+
+def _random_recording(rng):
+    """Segments on a half-second grid (so timeline points land on boundaries), RMS with dips, silences."""
+    segments = []
+    t = 0.0
+    while t < 120:
+        length = rng.randint(1, 24) / 2
+        # Back to back, or after a pause long enough to be flagged
+        gap = rng.choice([0, 0, 0.5, 3, 5, 7])
+        words = rng.choice(VOCABULARY, size=rng.randint(0, 70))
+        segments.append({"id": len(segments), "start": t, "end": t + length, "text": " " + " ".join(words)})
+        t += length + gap
+    duration = float(t)
+    rms = np.abs(rng.normal(0.1, 0.03, size=int(duration * 16000 / 512))).astype(np.float32)
+    rms[rng.randint(0, len(rms), size=len(rms) // 20)] = 0
+    intervals = [[int(seg["start"] * 16000), int(seg["end"] * 16000)] for seg in segments]
+    return duration, segments, rms, intervals
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_build_timeline_matches_the_per_point_loop(seed):
+    rng = np.random.RandomState(seed)
+    duration, segments, rms, intervals = _random_recording(rng)
+    silence_sections = find_silence_sections(intervals, 16000)
+    num_points = int(rng.choice([2, 20, int(duration) + 1, 2 * int(duration) + 1, 500]))
+
+    features = compute_segment_features(segments, FILLER_DETECTOR)
+    expected = _reference_timeline(duration, segments, rms, silence_sections, num_points)
+    assert build_timeline(duration, segments, features, rms, silence_sections, num_points) == expected
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_find_silence_sections_matches_the_loop(seed):
+    _, _, _, intervals = _random_recording(np.random.RandomState(seed))
+    assert find_silence_sections(intervals, 16000) == _reference_silence_sections(intervals, 16000)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_score_segments_matches_the_segment_part_of_the_loop(seed):
+    _, segments, _, _ = _random_recording(np.random.RandomState(seed))
+    scored = score_segments(segments, FILLER_DETECTOR)
+    for seg, entry in zip(segments, scored):
+        risk, reasons, _ = _reference_segment(seg)
+        assert entry["risk"] == min(20 + risk, 100)
+        assert entry["reasons"] == reasons
+
+
+def test_build_timeline_without_segments_or_silences():
+    rms = np.full(100, 0.1, dtype=np.float32)
+    timeline, drop_risks = build_timeline(10.0, [], compute_segment_features([], FILLER_DETECTOR), rms, [], 5)
+    assert [entry["risk"] for entry in timeline] == [20] * 5
+    assert drop_risks == []
+
+
+def test_build_timeline_without_an_energy_curve():
+    segments = [{"id": 0, "start": 0.0, "end": 4.0, "text": " we talk about the plan"}]
+    features = compute_segment_features(segments, FILLER_DETECTOR)
+    timeline, _ = build_timeline(10.0, segments, features, np.array([]), [], 5)
+    assert len(timeline) == 5
+    assert not any("energy" in reason for entry in timeline for reason in entry["reasons"])
+
+
+def test_build_timeline_uses_the_scoring_profile():
+    rng = np.random.RandomState(0)
+    duration, segments, rms, intervals = _random_recording(rng)
+    silence_sections = find_silence_sections(intervals, 16000)
+    features = compute_segment_features(segments, FILLER_DETECTOR)
+    profile = resolve_scoring_profile({"base_risk": 0, "drop_risk_threshold": -1,
+                                       "penalties": {"energy": [0, 0, 0], "silence": [0, 0, 0]}})
+    timeline, drop_risks = build_timeline(duration, segments, features, rms, silence_sections, 50, profile)
+    # Every point is a drop risk, and only segment features add risk
+    assert len(drop_risks) == len(timeline) == 50
+    assert all(entry["risk"] == 0 for entry in timeline if not entry["segment_text"])
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""receive_multipart: files written straight to disk, form fields, size limits and cleanup."""
+
+import hashlib
+import os
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from uploads import InvalidUploadError, UploadTooLargeError, receive_multipart
+
+LIMIT = 64 * 1024
+
+
+@pytest.fixture
+def client(tmp_path):
+    app = FastAPI()
+
+    @app.post("/upload")
+    async def upload(request: Request):
+        def destination(field, index, filename):
+            if field != "file":
+                return None
+            return str(tmp_path / f"{index}_{filename}"), "sha256"
+        try:
+            fields, files = await receive_multipart(request, destination, LIMIT)
+        except UploadTooLargeError:
+            return JSONResponse(status_code=413, content={})
+        except InvalidUploadError as e:
+            return JSONResponse(status_code=400, content={"error": str(e)})
+        return {"fields": fields, "files": files}
+
+    return TestClient(app)
+
+
+def test_files_and_fields_are_received(client, tmp_path):
+    audio = os.urandom(40 * 1024)
+    response = client.post("/upload", data={"profile": "true"},
+                           files=[("file", ("a.wav", audio)), ("other", ("b.wav", b"skipped"))])
+    assert response.status_code == 200
+    body = response.json()
+    assert body["fields"] == {"profile": "true"}
+    [(field, filename, path, size, digest)] = body["files"]
+    assert (field, filename, size, digest) == ("file", "a.wav", len(audio), hashlib.sha256(audio).hexdigest())
+    with open(path, "rb") as f:
+        assert f.read() == audio
+    assert os.listdir(tmp_path) == ["0_a.wav"]
+
+
+def test_oversized_uploads_are_refused_and_removed(client, tmp_path):
+    # Two files that only exceed the limit together
+    files = [("file", ("a.wav", b"x" * (LIMIT // 2 + 1))), ("file", ("b.wav", b"x" * (LIMIT // 2 + 1)))]
+    assert client.post("/upload", files=files).status_code == 413
+    assert os.listdir(tmp_path) == []
+
+
+def test_content_length_is_checked_before_reading(client):
+    response = client.post("/upload", content=b"", headers={
+        "content-type": "multipart/form-data; boundary=abc", "content-length": str(10 * LIMIT)
+    })
+    assert response.status_code == 413
+
+
+def test_truncated_body_is_rejected(client, tmp_path):
+    body = b'--abc\r\nContent-Disposition: form-data; name="file"; filename="a.wav"\r\n\r\npartial audio'
+    response = client.post("/upload", content=body, headers={"content-type": "multipart/form-data; boundary=abc"})
+    assert response.status_code == 400
+    assert os.listdir(tmp_path) == []
+
+
+def test_non_multipart_body_is_rejected(client):
+    assert client.post("/upload", data={"a": "b"}).status_code == 400
@@ -0,0 +1,429 @@
+# -*- coding: utf-8 -*-
+"""
+Timeline risk scoring.
+Per-segment features (pace, fillers, length, readability) are computed once per Whisper segment;
+timeline points then look up their segment and silence with np.searchsorted and are scored
+with NumPy, so the cost of a finer timeline is a handful of array operations.
+"""
+
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+import textstat
+
+from fillers import FillerDetector
+from scoring import DEFAULT_SCORING_PROFILE
+
+
+def format_time(seconds: float) -> str:
+    return f"{int(seconds // 60)}:{int(seconds % 60):02d}"
+
+
+def timeline_point_count(duration: float, interval: float = None, max_points: int = 60,
+                         point_limit: int = 10000) -> int:
+    """
+    Number of timeline points for a recording.
+    With `interval`, one point every `interval` seconds; otherwise roughly one every 5 seconds,
+    at least 20 and at most `max_points`. Never more than `point_limit`.
+    """
+    if interval:
+        num_points = int(duration // interval) + 1
+    else:
+        num_points = max(20, min(max_points, int(duration / 5)))
+    return max(2, min(num_points, point_limit))
+
+
+def downsample_timeline(timeline: List[Dict[str, Any]], max_points: int) -> List[Dict[str, Any]]:
+    """
+    Level-of-detail view of a long timeline for charting: split it into `max_points` buckets
+    and keep the highest-risk entry of each, so peaks and the critical moment survive.
+    """
+    if len(timeline) <= max_points:
+        return timeline
+    risks = np.array([entry["risk"] for entry in timeline])
+    edges = np.linspace(0, len(timeline), max_points + 1).astype(np.int64)
+    return [timeline[lo + int(np.argmax(risks[lo:hi]))] for lo, hi in zip(edges[:-1], edges[1:]) if hi > lo]
+
+
+def find_silence_sections(non_silent_intervals, sr: int, min_gap: float = 2.0) -> List[Dict[str, float]]:
+    """Gaps longer than `min_gap` seconds between the non-silent intervals from librosa.effects.split."""
+    intervals = np.asarray(non_silent_intervals, dtype=np.float64).reshape(-1, 2) / sr
+    if len(intervals) == 0:
+        return []
+    starts = intervals[:, 0]
+    prev_ends = np.concatenate(([0.0], intervals[:-1, 1]))
+    gaps = starts - prev_ends
+    return [
+        {"start": float(prev_end), "end": float(start), "duration": float(gap)}
+        for prev_end, start, gap in zip(prev_ends[gaps > min_gap], starts[gaps > min_gap], gaps[gaps > min_gap])
+    ]
+
+
+# Readability below which a segment's long words are collected for the report
+COMPLEX_READING_EASE = 50
+# Words with at least this many syllables count as complex
+COMPLEX_WORD_SYLLABLES = 3
+# Complex words kept per segment
+MAX_COMPLEX_WORDS = 5
+
+
+def compute_segment_features(segments: List[Dict[str, Any]], filler_detector: FillerDetector) -> Dict[str, Any]:
+    """
+    One pass over the Whisper segments. Metrics that don't apply to a segment are NaN
+    (pace for segments under 0.5 s, readability for text of 20 characters or less).
+    Besides the numeric arrays, "filler_words" lists the fillers found in each segment
+    ({"word", "start", "end"}) and "complex_words" the first long words of segments that are hard to read.
+    """
+    n = len(segments)
+    features = {
+        "start": np.zeros(n),
+        "end": np.zeros(n),
+        "wpm": np.full(n, np.nan),
+        "fillers": np.zeros(n, dtype=np.int64),
+        "words": np.zeros(n, dtype=np.int64),
+        "reading_ease": np.full(n, np.nan),
+        "filler_words": [],
+        "complex_words": [],
+    }
+    for i, seg in enumerate(segments):
+        text = seg.get("text", "").strip()
+        start = seg.get("start", 0)
+        end = seg.get("end", 0)
+        words = text.split()
+        filler_words = filler_detector.find_in_segment(seg)
+        features["start"][i] = start
+        features["end"][i] = end
+        features["words"][i] = len(words)
+        features["fillers"][i] = len(filler_words)
+        features["filler_words"].append(filler_words)
+        if len(text) > 0 and end - start > 0.5:
+            features["wpm"][i] = (len(words) / (end - start)) * 60
+        complex_words = []
+        if len(text) > 20:
+            reading_ease = textstat.flesch_reading_ease(text)
+            features["reading_ease"][i] = reading_ease
+            if reading_ease < COMPLEX_READING_EASE:
+                for word in words:
+                    if textstat.syllable_count(word) >= COMPLEX_WORD_SYLLABLES:
+                        complex_words.append(word)
+                        if len(complex_words) == MAX_COMPLEX_WORDS:
+                            break
+        features["complex_words"].append(complex_words)
+    return features
+
+
+def segment_feature_table(features: Dict[str, Any]) -> Dict[str, list]:
+    """Column-oriented, JSON-serializable copy of the segment features (NaN becomes None)."""
+    table = {}
+    for name, values in features.items():
+        if isinstance(values, np.ndarray):
+            if values.dtype.kind == "f":
+                table[name] = [None if np.isnan(v) else float(v) for v in values]
+            else:
+                table[name] = values.tolist()
+        else:
+            table[name] = values
+    return table
+
+
+def segment_features_from_table(table: Dict[str, list]) -> Dict[str, Any]:
+    """Inverse of segment_feature_table."""
+    features = {}
+    for name, values in table.items():
+        if name in ("filler_words", "complex_words"):
+            features[name] = values
+        elif name in ("fillers", "words"):
+            features[name] = np.asarray(values, dtype=np.int64)
+        else:
+            features[name] = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    return features
+
+
+def load_segment_features(result: Dict[str, Any], filler_detector: FillerDetector) -> Dict[str, Any]:
+    """
+    The feature table stored with an analysis result, or computed with `filler_detector`
+    for results stored before the table (or the filler detector, "fillers") existed.
+    """
+    table = result.get("segment_features")
+    if table is not None and "fillers" in result:
+        return segment_features_from_table(table)
+    return compute_segment_features(result.get("segments", []), filler_detector)
+
+
+def _containing_interval(starts, ends, times):
+    """Index of the first [start, end] interval containing each time, or -1."""
+    if len(starts) == 0:
+        return np.full(len(times), -1)
+    idx = np.searchsorted(starts, times, side="right") - 1
+    # On a shared boundary (end of one == start of the next) the earlier interval wins
+    prev = idx - 1
+    use_prev = (prev >= 0) & (ends[np.clip(prev, 0, None)] >= times)
+    idx = np.where(use_prev, prev, idx)
+    valid = (idx >= 0) & (ends[np.clip(idx, 0, None)] >= times)
+    return np.where(valid, idx, -1)
+
+
+def _segment_levels(features, profile: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Severity level of each issue per segment (0 = fine, higher = worse), vectorized over segments."""
+    wpm = features["wpm"]
+    ease = features["reading_ease"]
+    pace = profile["wpm"]
+    fillers = profile["fillers"]
+    words = profile["words"]
+    readability = profile["reading_ease"]
+    # NaN compares False everywhere, so segments without a metric stay at level 0
+    with np.errstate(invalid="ignore"):
+        return {
+            # 1 = too fast, 2 = way too fast, 3 = too slow, 4 = way too slow
+            "rate": np.select(
+                [wpm > pace["way_too_fast"], wpm > pace["too_fast"], wpm < pace["way_too_slow"], wpm < pace["too_slow"]],
+                [2, 1, 4, 3], 0
+            ),
+            "fillers": np.select(
+                [features["fillers"] >= fillers["too_many"], features["fillers"] >= fillers["several"]], [2, 1], 0
+            ),
+            "length": np.select(
+                [features["words"] > words["extremely_long"], features["words"] > words["very_long"]], [2, 1], 0
+            ),
+            "complexity": np.select([ease < readability["very_difficult"], ease < readability["complex"]], [2, 1], 0),
+        }
+
+
+def _penalties(profile: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Risk added for each severity level, indexable by the level arrays."""
+    return {issue: np.array(risks) for issue, risks in profile["penalties"].items()}
+
+
+def _segment_risk(levels: Dict[str, np.ndarray], penalties: Dict[str, np.ndarray]) -> np.ndarray:
+    return (
+        penalties["rate"][levels["rate"]] + penalties["fillers"][levels["fillers"]]
+        + penalties["length"][levels["length"]] + penalties["complexity"][levels["complexity"]]
+    )
+
+
+def _segment_problems(features, levels, i) -> Tuple[List[str], List[str]]:
+    """Reasons and plain-language problems for a single segment."""
+    reasons = []
+    problems = []
+
+    # 1. SPEECH RATE ANALYSIS - only flag SERIOUS speech rate issues
+    wpm = features["wpm"][i]
+    rate = levels["rate"][i]
+    if rate == 2:
+        reasons.append("speaking way too fast")
+        problems.append(f"You spoke way too fast here ({wpm:.0f} words/min). Listeners cannot keep up with this speed.")
+    elif rate == 1:
+        reasons.append("speaking too fast")
+        problems.append(f"You spoke too fast here ({wpm:.0f} words/min). It is hard to follow your points.")
+    elif rate == 4:
+        reasons.append("speaking way too slow")
+        problems.append(f"You spoke way too slowly here (only {wpm:.0f} words/min). The audience will get bored waiting for your next word.")
+    elif rate == 3:
+        reasons.append("speaking too slow")
+        problems.append(f"You spoke a bit too slowly here ({wpm:.0f} words/min). You risk losing the audience's interest.")
+
+    # 2. FILLER WORDS ANALYSIS - 5+ fillers in one segment is a real problem
+    fillers = int(features["fillers"][i])
+    if levels["fillers"][i] == 2:
+        reasons.append("too many filler words")
+        problems.append(f"You used {fillers} filler words ('um', 'uh', 'like') in this short clip. This makes you sound unsure of yourself.")
+    elif levels["fillers"][i] == 1:
+        reasons.append("several filler words")
+        problems.append(f"You used {fillers} filler words here. Try to pause silently instead of saying 'um' or 'uh'.")
+
+    # 3. SENTENCE LENGTH ANALYSIS - 50+ words is real cognitive overload
+    words = int(features["words"][i])
+    if levels["length"][i] == 2:
+        reasons.append("extremely long section")
+        problems.append(f"You spoke {words} words without a single pause. Listeners need a break to process this much information.")
+    elif levels["length"][i] == 1:
+        reasons.append("very long section")
+        problems.append(f"This section is too long ({words} words) without a break. You need to pause to let your audience digest what you said.")
+
+    # 4. LANGUAGE COMPLEXITY ANALYSIS - reading ease < 30 is college level
+    if levels["complexity"][i] == 2:
+        reasons.append("very difficult language")
+        problems.append("You used very complicated words here. The audience likely didn't understand what you meant.")
+    elif levels["complexity"][i] == 1:
+        reasons.append("complex language")
+        problems.append("The language here is dense and hard to follow. Try simpler words.")
+
+    return reasons, problems
+
+
+def energy_curve(rms: np.ndarray, duration: float, num_points: int) -> List[Dict[str, Any]]:
+    """RMS energy averaged into `num_points` buckets and scaled to 0-1, for an early energy chart."""
+    if len(rms) == 0 or num_points < 1:
+        return []
+    edges = np.linspace(0, len(rms), min(num_points, len(rms)) + 1).astype(np.int64)
+    means = np.array([rms[lo:hi].mean() for lo, hi in zip(edges[:-1], edges[1:])])
+    peak = means.max()
+    if peak > 0:
+        means = means / peak
+    return [
+        {"time": format_time(lo / len(rms) * duration), "seconds": float(lo / len(rms) * duration), "energy": float(value)}
+        for lo, value in zip(edges[:-1], means)
+    ]
+
+
+def score_segments(segments: List[Dict[str, Any]], filler_detector: FillerDetector,
+                   profile: Dict[str, Any] = DEFAULT_SCORING_PROFILE) -> List[Dict[str, Any]]:
+    """
+    Stand-alone risk of each segment from its own features (pace, fillers, length, readability),
+    before energy and silence are combined in on the timeline. Used for partial results.
+    """
+    features = compute_segment_features(segments, filler_detector)
+    levels = _segment_levels(features, profile)
+    risks = np.minimum(profile["base_risk"] + _segment_risk(levels, _penalties(profile)), 100)
+    scored = []
+    for i, seg in enumerate(segments):
+        reasons, _ = _segment_problems(features, levels, i)
+        scored.append({
+            "time": format_time(features["start"][i]),
+            "start": float(features["start"][i]),
+            "end": float(features["end"][i]),
+            "text": seg.get("text", ""),
+            "risk": int(risks[i]),
+            "reasons": reasons
+        })
+    return scored
+
+
+def build_timeline(duration: float, segments: List[Dict[str, Any]], features: Dict[str, np.ndarray],
+                   rms: np.ndarray, silence_sections: List[Dict[str, float]],
+                   num_points: int, profile: Dict[str, Any] = DEFAULT_SCORING_PROFILE
+                   ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Score `num_points` evenly spaced points over the audio with the thresholds and penalties
+    of a scoring profile. Returns (timeline, drop_risks).
+    """
+    # Same arithmetic as i / (num_points - 1) * duration: np.linspace can differ in the last bit,
+    # which moves points on a segment or silence boundary to the other side of it
+    times = np.arange(num_points) / (num_points - 1) * duration if num_points > 1 else np.zeros(num_points)
+    penalties = _penalties(profile)
+
+    # --- Segment lookup: segment-level risk is scored once per segment, not per point ---
+    levels = _segment_levels(features, profile)
+    segment_risk = _segment_risk(levels, penalties)
+    seg_idx = _containing_interval(features["start"], features["end"], times)
+    point_segment_risk = np.where(seg_idx >= 0, segment_risk[np.clip(seg_idx, 0, None)] if len(segment_risk) else 0, 0)
+
+    # --- 5. ENERGY/MONOTONE ANALYSIS - only flag SERIOUSLY low energy ---
+    if len(rms) > 0:
+        rms_mean = np.mean(rms)
+        rms_std = np.std(rms)
+        if duration > 0:
+            rms_idx = np.minimum((times / duration * len(rms)).astype(np.int64), len(rms) - 1)
+        else:
+            rms_idx = np.zeros(len(times), dtype=np.int64)
+        point_rms = rms[rms_idx]
+        energy = profile["energy_std"]
+        energy_level = np.select(
+            [point_rms < rms_mean - (energy["extremely_low"] * rms_std), point_rms < rms_mean - (energy["low"] * rms_std)],
+            [2, 1], 0
+        )
+    else:
+        # No energy curve (e.g. audio shorter than one frame): no point is flagged for energy
+        energy_level = np.zeros(len(times), dtype=np.int64)
+
+    # --- 6. SILENCE/PAUSE ANALYSIS - 4+ seconds is awkward silence ---
+    silence_starts = np.array([s["start"] for s in silence_sections], dtype=np.float64)
+    silence_ends = np.array([s["end"] for s in silence_sections], dtype=np.float64)
+    silence_durations = np.array([s["duration"] for s in silence_sections], dtype=np.float64)
+    silence_idx = _containing_interval(silence_starts, silence_ends, times)
+    point_silence = np.where(silence_idx >= 0, silence_durations[np.clip(silence_idx, 0, None)] if len(silence_durations) else 0, 0)
+    silence = profile["silence_sec"]
+    silence_level = np.select([point_silence > silence["dead_air"], point_silence > silence["awkward"]], [2, 1], 0)
+
+    # Cap at 100
+    risks = np.minimum(
+        profile["base_risk"] + point_segment_risk + penalties["energy"][energy_level] + penalties["silence"][silence_level],
+        100
+    )
+
+    # Reason texts are only built for segments a timeline point actually lands in
+    segment_problems = {}
+    for i in np.unique(seg_idx[seg_idx >= 0]):
+        segment_problems[int(i)] = _segment_problems(features, levels, int(i))
+
+    timeline = []
+    drop_risks = []
+    for p, time_sec in enumerate(times):
+        time_str = format_time(time_sec)
+        risk = int(risks[p])
+        current_segment = segments[seg_idx[p]] if seg_idx[p] >= 0 else None
+
+        if current_segment is not None:
+            seg_reasons, seg_problems = segment_problems[int(seg_idx[p])]
+            risk_reasons = list(seg_reasons)
+            detailed_problems = list(seg_problems)
+        else:
+            risk_reasons = []
+            detailed_problems = []
+
+        if energy_level[p] == 2:
+            risk_reasons.append("extremely low energy")
+            detailed_problems.append("Your voice became completely flat here. You stopped varying your pitch and volume, which sounds robotic.")
+        elif energy_level[p] == 1:
+            risk_reasons.append("low energy")
+            detailed_problems.append("Your voice got much quieter and flatter here. It sounds like you lost interest in what you were saying.")
+
+        silence_duration = point_silence[p]
+        if silence_level[p] == 2:
+            risk_reasons.append(f"no speech detected ({silence_duration:.1f}s)")
+            detailed_problems.append(f"⚠️ Long silence detected ({silence_duration:.1f}s). This dead air kills the momentum of your speech.")
+        elif silence_level[p] == 1:
+            risk_reasons.append(f"long silence ({silence_duration:.1f}s)")
+            detailed_problems.append(f"🔇 Awkward pause ({silence_duration:.1f}s). This break is too long and feels unnatural.")
+
+        timeline.append({
+            "time": time_str,
+            "risk": risk,
+            "reasons": risk_reasons,
+            "detailed_problems": detailed_problems,
+            "segment_text": current_segment.get("text", "") if current_segment else ""
+        })
+
+        # Track all high-risk sections (>70%) for analysis
+        # But we'll only show the HIGHEST risk one as the critical moment
+        if risk > profile["drop_risk_threshold"]:
+            # Build detailed description with exact problems
+            if current_segment:
+                text = current_segment.get("text", "")
+                transcript_preview = text[:100] + "..." if len(text) > 100 else text
+
+                # Create comprehensive problem description
+                if detailed_problems:
+                    issue_description = " ".join(detailed_problems)
+                    issue_description += f"\n\nTranscript: \"{transcript_preview}\""
+                else:
+                    issue_description = f"Multiple issues detected. Transcript: \"{transcript_preview}\""
+            else:
+                issue_description = " ".join(detailed_problems) if detailed_problems else "Critical attention drop detected."
+
+            # Calculate end time (next 5-10 seconds)
+            end_time_sec = min(time_sec + 10, duration)
+
+            drop_risks.append({
+                "start": time_str,
+                "end": format_time(end_time_sec),
+                "risk": f"{risk}%",
+                "description": issue_description,
+                "reasons": risk_reasons,
+                "detailed_problems": detailed_problems,
+                "risk_value": risk,  # Store numeric value for comparison
+                "segment_text": current_segment.get("text", "") if current_segment else ""
+            })
+
+    # After generating all timeline points, mark ONLY the highest risk point as critical
+    if drop_risks:
+        # Find the single most critical moment (highest risk)
+        most_critical = max(drop_risks, key=lambda x: x["risk_value"])
+
+        # Update timeline to mark only this point as critical
+        for entry in timeline:
+            if entry["time"] == most_critical["start"]:
+                entry["label"] = "CRITICAL MOMENT - Maximum attention drop"
+                break
+
+    return timeline, drop_risks
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Speech-to-text backends for the analysis pipeline.
+Every backend returns the openai-whisper result shape: {"text": str, "segments": [{"start", "end", "text", ...}]}.
+An optional `on_segments` callback receives segments as soon as the backend has them.
+"""
+
+import logging
+from typing import Dict, Any, Callable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptionBackend:
+    """Base class: subclasses implement load() and _transcribe()."""
+
+    name = None
+
+    def __init__(self, model_name="tiny", **options):
+        self.model_name = model_name
+        self.options = options
+        self.model = None
+
+    def load(self):
+        raise NotImplementedError
+
+    def _transcribe(self, audio, on_segments=None) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def transcribe(self, audio, on_segments: Optional[Callable[[List[Dict[str, Any]]], None]] = None) -> Dict[str, Any]:
+        """
+        Transcribe a file path or a 16 kHz mono float32 array.
+        `on_segments` is called with each batch of newly decoded segments, in order.
+        """
+        if self.model is None:
+            logger.info(f"Loading {self.name} model '{self.model_name}'...")
+            self.load()
+            logger.info(f"{self.name} model loaded.")
+        return self._transcribe(audio, on_segments)
+
+    def warm_up(self):
+        """Load the model and run one short decode so the first real job skips load and first-inference overhead."""
+        logger.info(f"Warming up {self.name} model...")
+        # Two seconds of quiet noise: enough to run the encoder and decoder once
+        warm_up_audio = (np.random.RandomState(0).randn(32000) * 0.01).astype(np.float32)
+        self.transcribe(warm_up_audio)
+        logger.info(f"{self.name} model warm.")
+
+
+class WhisperBackend(TranscriptionBackend):
+    """Reference openai-whisper (PyTorch) implementation."""
+
+    name = "whisper"
+
+    # fp16=False is crucial for CPU execution
+    DECODE_OPTIONS = {
+        "fp16": False,
+        "language": "en",
+        "beam_size": 1,
+        "best_of": 1,
+        "temperature": 0.0,
+        "condition_on_previous_text": False,
+        "verbose": False
+    }
+
+    def load(self):
+        import whisper
+        if self.options.get("cpu_threads"):
+            import torch
+            torch.set_num_threads(self.options["cpu_threads"])
+        self.model = whisper.load_model(self.model_name, device="cpu")
+
+    def _transcribe(self, audio, on_segments=None):
+        import torch
+        # Using torch.no_grad() to significantly reduce memory overhead
+        with torch.no_grad():
+            result = self.model.transcribe(
+                audio, word_timestamps=self.options.get("word_timestamps", False), **self.DECODE_OPTIONS
+            )
+        # openai-whisper has no per-segment hook, so its segments arrive all at once
+        if on_segments is not None:
+            on_segments(result["segments"])
+        return result
+
+
+class FasterWhisperBackend(TranscriptionBackend):
+    """CTranslate2 implementation (faster-whisper) with int8 quantized weights by default."""
+
+    name = "faster-whisper"
+
+    def load(self):
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise RuntimeError("TRANSCRIPTION_BACKEND=faster-whisper requires the faster-whisper package")
+        self.model = WhisperModel(
+            self.model_name,
+            device="cpu",
+            compute_type=self.options.get("compute_type", "int8"),
+            cpu_threads=self.options.get("cpu_threads", 0)
+        )
+
+    def _transcribe(self, audio, on_segments=None):
+        segments_iter, _ = self.model.transcribe(
+            audio,
+            language="en",
+            beam_size=1,
+            best_of=1,
+            temperature=0.0,
+            condition_on_previous_text=False,
+            word_timestamps=self.options.get("word_timestamps", False)
+        )
+        # Convert to the openai-whisper segment dicts the rest of the pipeline expects
+        segments = []
+        # faster-whisper decodes lazily, so each segment can be reported as soon as it exists
+        for seg in segments_iter:
+            segments.append({
+                "id": seg.id,
+                "seek": seg.seek,
+                "start": seg.start,
+                "end": seg.end,
+                "text": seg.text,
+                "tokens": list(seg.tokens),
+                "temperature": seg.temperature,
+                "avg_logprob": seg.avg_logprob,
+                "compression_ratio": seg.compression_ratio,
+                "no_speech_prob": seg.no_speech_prob
+            })
+            if seg.words:
+                segments[-1]["words"] = [
+                    {"word": word.word, "start": word.start, "end": word.end, "probability": word.probability}
+                    for word in seg.words
+                ]
+            if on_segments is not None:
+                on_segments(segments[-1:])
+        return {
+            "text": "".join(seg["text"] for seg in segments),
+            "segments": segments,
+            "language": "en"
+        }
+
+
+BACKENDS = {
+    WhisperBackend.name: WhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+
+def create_backend(name, model_name="tiny", **options) -> TranscriptionBackend:
+    """Instantiate a backend by its config name (the model is loaded on first use)."""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown transcription backend '{name}'. Choose one of: {', '.join(BACKENDS)}")
+    return BACKENDS[name](model_name, **options)
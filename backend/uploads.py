@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming upload ingestion.
+Parses multipart/form-data request bodies as they arrive and writes file parts straight to
+disk, enforcing the size limit on the received bytes (Starlette's form parsing would spool
+the whole body before the handler runs).
+"""
+
+import hashlib
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+
+try:
+    from python_multipart.exceptions import FormParserError
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ModuleNotFoundError:
+    # python-multipart before 0.0.13
+    from multipart.exceptions import FormParserError
+    from multipart.multipart import MultipartParser, parse_options_header
+
+# Room for boundaries, part headers and form fields on top of the file bytes
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadTooLargeError(Exception):
+    """Raised as soon as an upload exceeds the configured limit."""
+
+
+class InvalidUploadError(Exception):
+    """Raised for request bodies that aren't well-formed multipart/form-data."""
+
+
+def _write_chunk(out, chunk, digest):
+    out.write(chunk)
+    if digest is not None:
+        digest.update(chunk)
+
+
+def _decode(value: bytes) -> str:
+    try:
+        return value.decode("utf-8")
+    except UnicodeDecodeError:
+        return value.decode("latin-1")
+
+
+def _close_and_remove(out, path):
+    out.close()
+    if os.path.exists(path):
+        os.remove(path)
+
+
+async def receive_multipart(
+    request: Request,
+    destination: Callable[[str, int, str], Optional[Tuple[str, Optional[str]]]],
+    max_bytes: int
+) -> Tuple[Dict[str, str], List[Tuple[str, str, str, int, Optional[str]]]]:
+    """
+    Stream a multipart/form-data request into files on disk without holding it in memory.
+
+    `destination(field name, index, filename)` gives the path and hash algorithm (or None) for
+    the index-th file part, or None to discard the part. File parts may hold `max_bytes` in total:
+    a larger Content-Length is refused before anything is read, and a body that grows past it
+    is cut off as soon as it does. Disk writes and hashing run on the threadpool.
+    Returns (form fields, files as (field name, filename, path, size, hex digest or None)).
+    On any failure, including UploadTooLargeError, every file written so far is removed.
+    """
+    body_limit = max_bytes + MULTIPART_OVERHEAD
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > body_limit:
+        raise UploadTooLargeError(f"Upload is {content_length} bytes, limit is {max_bytes}")
+
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or not params.get(b"boundary"):
+        raise InvalidUploadError("Expected a multipart/form-data body")
+
+    # The parser calls back synchronously; collect what it found in each chunk and handle
+    # it afterwards, so file writes can go to the threadpool
+    messages = []
+    header = [bytearray(), bytearray()]
+    headers = {}
+
+    def on_header_end():
+        headers[bytes(header[0]).lower()] = bytes(header[1])
+        header[0].clear()
+        header[1].clear()
+
+    def on_headers_finished():
+        messages.append(("headers", dict(headers)))
+        headers.clear()
+
+    parser = MultipartParser(params[b"boundary"], {
+        "on_header_field": lambda data, start, end: header[0].extend(data[start:end]),
+        "on_header_value": lambda data, start, end: header[1].extend(data[start:end]),
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": lambda data, start, end: messages.append(("data", data[start:end])),
+        "on_part_end": lambda: messages.append(("end", None)),
+    })
+
+    fields = {}
+    files = []
+    # The part being read: its name, and for files where it goes; `value` collects form fields
+    name = None
+    value = None
+    out = None
+    part = None
+    received = 0
+    file_bytes = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > body_limit:
+                raise UploadTooLargeError(f"Upload exceeds limit of {max_bytes} bytes")
+            try:
+                parser.write(chunk)
+            except FormParserError as e:
+                raise InvalidUploadError(f"Malformed multipart body: {e}")
+
+            for kind, data in messages:
+                if kind == "headers":
+                    _, options = parse_options_header(data.get(b"content-disposition", b""))
+                    name = _decode(options.get(b"name", b""))
+                    if b"filename" in options:
+                        filename = _decode(options[b"filename"])
+                        target = destination(name, len(files), filename)
+                        if target is not None:
+                            path, hash_algorithm = target
+                            part = [filename, path, 0, hashlib.new(hash_algorithm) if hash_algorithm else None]
+                            out = await run_in_threadpool(open, path, "wb")
+                        value = None
+                    else:
+                        value = bytearray()
+                elif kind == "data":
+                    if value is not None:
+                        value.extend(data)
+                        if len(value) > MULTIPART_OVERHEAD:
+                            raise InvalidUploadError(f"Form field '{name}' is too long")
+                    elif out is not None:
+                        file_bytes += len(data)
+                        if file_bytes > max_bytes:
+                            raise UploadTooLargeError(f"Upload exceeds limit of {max_bytes} bytes")
+                        part[2] += len(data)
+                        await run_in_threadpool(_write_chunk, out, data, part[3])
+                else:
+                    if value is not None:
+                        fields[name] = _decode(bytes(value))
+                    elif out is not None:
+                        await run_in_threadpool(out.close)
+                        filename, path, size, digest = part
+                        files.append((name, filename, path, size, digest.hexdigest() if digest is not None else None))
+                        out = None
+                    value = None
+            messages.clear()
+        parser.finalize()
+        if out is not None:
+            raise InvalidUploadError("Upload ended in the middle of a file")
+    except BaseException:
+        if out is not None:
+            await run_in_threadpool(_close_and_remove, out, part[1])
+        for _, _, path, _, _ in files:
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+
+    return fields, files
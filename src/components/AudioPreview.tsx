@@ -0,0 +1,71 @@
+import { cn } from "@/lib/utils";
+import { Tooltip, TooltipContent, TooltipTrigger } from "@/components/ui/tooltip";
+
+interface EnergyPoint {
+  time: string;
+  seconds: number;
+  energy: number;
+}
+
+interface SilenceSection {
+  start: number;
+  end: number;
+  duration: number;
+}
+
+interface AudioPreviewProps {
+  duration: number;
+  energy: EnergyPoint[];
+  silences: SilenceSection[];
+  // Seconds of audio transcribed so far; the rest of the curve is dimmed
+  transcribedUntil?: number;
+  className?: string;
+}
+
+function formatTime(seconds: number): string {
+  return `${Math.floor(seconds / 60)}:${String(Math.floor(seconds % 60)).padStart(2, "0")}`;
+}
+
+// Energy curve and silence map of a recording, shown while the transcript is still being analyzed
+export function AudioPreview({ duration, energy, silences, transcribedUntil = 0, className }: AudioPreviewProps) {
+  const peak = Math.max(...energy.map((point) => point.energy), 0) || 1;
+  const percent = (seconds: number) => `${Math.min(100, Math.max(0, (seconds / duration) * 100))}%`;
+
+  return (
+    <div className={cn("w-full", className)}>
+      <div className="relative flex items-end gap-px h-20">
+        {energy.map((point, index) => (
+          <div
+            key={index}
+            className={cn(
+              "flex-1 rounded-t-sm bg-primary transition-opacity duration-300",
+              point.seconds >= transcribedUntil && "opacity-40"
+            )}
+            style={{ height: `${Math.max(4, (point.energy / peak) * 100)}%` }}
+          />
+        ))}
+        {silences.map((silence, index) => (
+          <Tooltip key={`silence-${index}`}>
+            <TooltipTrigger asChild>
+              <div
+                className="absolute inset-y-0 bg-orange/30 border-x border-orange/60 cursor-pointer"
+                style={{ left: percent(silence.start), width: percent(silence.duration) }}
+              />
+            </TooltipTrigger>
+            <TooltipContent side="top" className="bg-card border-border">
+              <div className="text-sm">
+                <p className="font-semibold">{formatTime(silence.start)} - {formatTime(silence.end)}</p>
+                <p className="text-muted-foreground">Silence: {silence.duration.toFixed(1)}s</p>
+              </div>
+            </TooltipContent>
+          </Tooltip>
+        ))}
+      </div>
+      <div className="flex justify-between mt-2 text-xs text-muted-foreground">
+        <span>0:00</span>
+        <span>{silences.length} {silences.length === 1 ? "pause" : "pauses"} over 2s</span>
+        <span>{formatTime(duration)}</span>
+      </div>
+    </div>
+  );
+}
@@ -2,6 +2,7 @@
 import { useState, useRef, useEffect } from "react";
 import { ContentCard } from "@/components/ContentCard";
 import { TimelineBlock } from "@/components/TimelineBlock";
+import { AudioPreview } from "@/components/AudioPreview";
 import { InsightTile } from "@/components/InsightTile";
 import { Button } from "@/components/ui/button";
 import { Tabs, TabsContent, TabsList, TabsTrigger } from "@/components/ui/tabs";
@@ -39,7 +40,7 @@ import { toast } from "sonner";
 
 type AnalysisState = "idle" | "uploading" | "analyzing" | "complete" | "error";
 
-import { api, AudienceAnalysisResult } from "../services/api";
+import { api, AnalysisResult, AudienceAnalysisResult, LiveFeedback, LiveSession, PartialResultEvent, PartialSegment, StatusResponse } from "../services/api";
 
 
 interface DashboardData {
@@ -232,6 +233,9 @@ export default function Dashboard() {
   const [file, setFile] = useState<File | null>(null);
   const [progress, setProgress] = useState(0);
   const [data, setData] = useState<DashboardData>(ZERO_DATA);
+  // Energy curve, silences and segments scored so far, streamed while the analysis is still running
+  const [partialAudio, setPartialAudio] = useState<PartialResultEvent | null>(null);
+  const [partialSegments, setPartialSegments] = useState<PartialSegment[]>([]);
   const [error, setError] = useState<string | null>(null);
   const [jobId, setJobId] = useState<string | null>(null);
 
@@ -241,11 +245,15 @@ export default function Dashboard() {
   const mediaRecorderRef = useRef<MediaRecorder | null>(null);
   const audioChunksRef = useRef<Blob[]>([]);
   const recordingIntervalRef = useRef<NodeJS.Timeout | null>(null);
+  // Real-time analysis of the recording while it's in progress
+  const liveSessionRef = useRef<LiveSession | null>(null);
+  const [liveFeedback, setLiveFeedback] = useState<LiveFeedback | null>(null);
 
   // Audience analysis state
   const [selectedAudience, setSelectedAudience] = useState<string>("general");
   const [audienceAnalysis, setAudienceAnalysis] = useState<AudienceAnalysisResult | null>(null);
   const [audienceLoading, setAudienceLoading] = useState(false);
+  const audienceMatrixRef = useRef<{ jobId: string; matrix: Record<string, AudienceAnalysisResult> } | null>(null);
 
   // Auth & Membership State
   const [isPro, setIsPro] = useState(false);
@@ -354,6 +362,8 @@ export default function Dashboard() {
         console.log("Starting upload...");
         const id = await api.upload(selectedFile);
         console.log("Upload success, job id:", id);
+        setPartialAudio(null);
+        setPartialSegments([]);
         setJobId(id);
         setState("analyzing");
       } catch (err) {
@@ -389,6 +399,18 @@ export default function Dashboard() {
       // Request microphone permission
       const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
 
+      // Stream the audio for live feedback; the recorded file remains the fallback
+      setLiveFeedback(null);
+      try {
+        liveSessionRef.current = api.startLiveSession(stream, setLiveFeedback);
+      } catch (err) {
+        console.warn("Live analysis unavailable, recording only", err);
+        liveSessionRef.current = null;
+        toast.error("Live feedback isn't available in this browser", {
+          description: "Your recording will still be analyzed when you stop.",
+        });
+      }
+
       // Create MediaRecorder with explicit MIME type if possible
       let options = {};
       if (MediaRecorder.isTypeSupported('audio/webm;codecs=opus')) {
@@ -427,6 +449,26 @@ export default function Dashboard() {
           recordingIntervalRef.current = null;
         }
 
+        // The live session already transcribed the recording; its report is ready right away
+        const liveSession = liveSessionRef.current;
+        liveSessionRef.current = null;
+        if (liveSession) {
+          setState("analyzing");
+          setError(null);
+          setProgress(90);
+          setRecordingTime(0);
+          const liveJobId = await liveSession.stop();
+          if (liveJobId) {
+            console.log("Live analysis complete, job id:", liveJobId);
+            setFile(audioFile);
+            setPartialAudio(null);
+            setPartialSegments([]);
+            setJobId(liveJobId);
+            return;
+          }
+          console.warn("Live analysis failed, uploading the recording instead");
+        }
+
         // Limit check for recordings
         const MAX_FILE_SIZE = 10 * 1024 * 1024; // 10MB
         if (audioFile.size > MAX_FILE_SIZE) {
@@ -449,6 +491,8 @@ export default function Dashboard() {
           console.log("Uploading recorded audio...");
           const id = await api.upload(audioFile);
           console.log("Upload success, job id:", id);
+          setPartialAudio(null);
+          setPartialSegments([]);
           setJobId(id);
           setState("analyzing");
         } catch (err) {
@@ -505,10 +549,66 @@ export default function Dashboard() {
   };
 
 
-  // Polling Effect
+  // Progress Effect: push updates over Server-Sent Events, falling back to polling
   useEffect(() => {
     if (!jobId || state === "complete" || state === "error" || state === "idle") return;
 
+    const applyProgress = (statusRes: StatusResponse) => {
+      // Update progress if available (assuming 0.0 - 1.0 or 0-100)
+      if (typeof statusRes.progress === "number") {
+        // Normalize to 0-100
+        const p = statusRes.progress <= 1 ? statusRes.progress * 100 : statusRes.progress;
+        setProgress(Math.floor(p));
+      }
+    };
+
+    const applyResult = (result: AnalysisResult) => {
+      console.log("Analysis result:", result);
+
+      // Map result to DashboardData
+      // We intentionally map fields loosely to prevent crashes if backend schema differs slightly
+      const mappedData: DashboardData = {
+        timeline: result.timeline?.map((t: any) => ({
+          time: t.time || "0:00",
+          risk: t.risk || 0,
+          label: t.label
+        })) || [],
+        criticalSection: {
+          start: result.drop_risks?.[0]?.start || "0:00",
+          end: result.drop_risks?.[0]?.end || "0:00",
+          risk: result.drop_risks?.[0]?.risk || "0%"
+        },
+        stats: {
+          dropRisk: result.summary?.drop_risk || result.summary?.stats?.dropRisk || "N/A",
+          jargonDensity: result.summary?.jargon_density || result.summary?.stats?.jargonDensity || "N/A",
+          fillerWords: result.summary?.filler_words || result.summary?.stats?.fillerWords || "0"
+        },
+        // Use honest fallbacks if backend omits specific fields
+        suggestions: result.summary?.suggestions?.map((s: any) => ({
+          icon: Lightbulb,
+          title: s.title || "Suggestion",
+          description: s.description || ""
+        })) || [],
+
+        problematicSection: {
+          range: result.summary?.problematic_section?.range || "N/A",
+          title: result.summary?.problematic_section?.title || "No critical section detected",
+          description: result.summary?.problematic_section?.description || "Your speech flow looks good."
+        },
+        insights: {
+          jargon: result.summary?.insights?.jargon || { title: "Jargon", desc: "No data available" },
+          explanation: result.summary?.insights?.explanation || { title: "Explanation", desc: "No data available" },
+          monotone: result.summary?.insights?.monotone || { title: "Monotone", desc: "No data available" },
+          fillers: result.summary?.insights?.fillers || { title: "Fillers", desc: "No data available" },
+        }
+      };
+
+      setData(mappedData);
+      setState("complete");
+    };
+
+    let intervalId: ReturnType<typeof setInterval> | undefined;
+
     const poll = async () => {
       try {
         const statusRes = await api.getStatus(jobId);
@@ -520,57 +620,10 @@ export default function Dashboard() {
           return;
         }
 
-        // Update progress if available (assuming 0.0 - 1.0 or 0-100)
-        if (typeof statusRes.progress === "number") {
-          // Normalize to 0-100
-          const p = statusRes.progress <= 1 ? statusRes.progress * 100 : statusRes.progress;
-          setProgress(Math.floor(p));
-        }
+        applyProgress(statusRes);
 
         if (statusRes.status === "done") {
-          const result = await api.getResult(jobId);
-          console.log("Analysis result:", result);
-
-          // Map result to DashboardData
-          // We intentionally map fields loosely to prevent crashes if backend schema differs slightly
-          const mappedData: DashboardData = {
-            timeline: result.timeline?.map((t: any) => ({
-              time: t.time || "0:00",
-              risk: t.risk || 0,
-              label: t.label
-            })) || [],
-            criticalSection: {
-              start: result.drop_risks?.[0]?.start || "0:00",
-              end: result.drop_risks?.[0]?.end || "0:00",
-              risk: result.drop_risks?.[0]?.risk || "0%"
-            },
-            stats: {
-              dropRisk: result.summary?.drop_risk || result.summary?.stats?.dropRisk || "N/A",
-              jargonDensity: result.summary?.jargon_density || result.summary?.stats?.jargonDensity || "N/A",
-              fillerWords: result.summary?.filler_words || result.summary?.stats?.fillerWords || "0"
-            },
-            // Use honest fallbacks if backend omits specific fields
-            suggestions: result.summary?.suggestions?.map((s: any) => ({
-              icon: Lightbulb,
-              title: s.title || "Suggestion",
-              description: s.description || ""
-            })) || [],
-
-            problematicSection: {
-              range: result.summary?.problematic_section?.range || "N/A",
-              title: result.summary?.problematic_section?.title || "No critical section detected",
-              description: result.summary?.problematic_section?.description || "Your speech flow looks good."
-            },
-            insights: {
-              jargon: result.summary?.insights?.jargon || { title: "Jargon", desc: "No data available" },
-              explanation: result.summary?.insights?.explanation || { title: "Explanation", desc: "No data available" },
-              monotone: result.summary?.insights?.monotone || { title: "Monotone", desc: "No data available" },
-              fillers: result.summary?.insights?.fillers || { title: "Fillers", desc: "No data available" },
-            }
-          };
-
-          setData(mappedData);
-          setState("complete");
+          applyResult(await api.getResult(jobId));
         }
       } catch (e) {
         console.error("Polling error", e);
@@ -578,10 +631,35 @@ export default function Dashboard() {
       }
     };
 
-    // Poll immediately, then every 1 second
-    poll();
-    const intervalId = setInterval(poll, 1000);
-    return () => clearInterval(intervalId);
+    const unsubscribe = api.subscribeToJob(jobId, {
+      onProgress: applyProgress,
+      onPartial: (partial) => {
+        if (partial.energy) {
+          setPartialAudio(partial);
+        } else if (partial.transcribed_until !== undefined) {
+          setPartialAudio((prev) => prev && { ...prev, transcribed_until: partial.transcribed_until });
+        }
+        if (!partial.segments) return;
+        const offset = partial.segment_offset ?? 0;
+        setPartialSegments((prev) => [...prev.slice(0, offset), ...partial.segments!]);
+      },
+      onResult: applyResult,
+      onFailed: () => {
+        setError("Analysis failed on server.");
+        setState("error");
+      },
+      onDisconnect: () => {
+        // Event stream unavailable (e.g. blocked by a proxy): poll every 1 second instead
+        console.warn("Progress stream disconnected, falling back to polling");
+        poll();
+        intervalId = setInterval(poll, 1000);
+      }
+    });
+
+    return () => {
+      unsubscribe();
+      if (intervalId) clearInterval(intervalId);
+    };
   }, [jobId, state]);
 
   // Cleanup effect for recording
@@ -598,14 +676,28 @@ export default function Dashboard() {
     };
   }, [isRecording]);
 
-  // Fetch audience analysis when audience changes or analysis completes
+  // Fetch audience analysis when audience changes or analysis completes.
+  // All profiles come in one request per job, so switching audience is a lookup.
   useEffect(() => {
     const fetchAudienceAnalysis = async () => {
       if (!jobId || state !== "complete") return;
 
+      const cached = audienceMatrixRef.current;
+      if (cached && cached.jobId === jobId && cached.matrix[selectedAudience]) {
+        setAudienceAnalysis(cached.matrix[selectedAudience]);
+        return;
+      }
+
       setAudienceLoading(true);
       try {
-        const result = await api.getAudienceAnalysis(jobId, selectedAudience);
+        let result: AudienceAnalysisResult;
+        try {
+          const matrix = await api.getAudienceMatrix(jobId);
+          audienceMatrixRef.current = { jobId, matrix };
+          result = matrix[selectedAudience] ?? await api.getAudienceAnalysis(jobId, selectedAudience);
+        } catch {
+          result = await api.getAudienceAnalysis(jobId, selectedAudience);
+        }
         console.log("Audience analysis result:", result);
         console.log("Structural insights:", result.structural_insights);
         setAudienceAnalysis(result);
@@ -731,6 +823,15 @@ export default function Dashboard() {
                 }
               </p>
 
+              {isRecording && liveFeedback && (
+                <div className="mt-4 grid grid-cols-2 gap-2 text-xs">
+                  <span>Pace: {liveFeedback.wpm !== null ? `${Math.round(liveFeedback.wpm)} WPM` : "..."}</span>
+                  <span>Fillers: {liveFeedback.filler_count} ({liveFeedback.filler_per_min}/min)</span>
+                  <span>Energy: {liveFeedback.energy !== null ? `${Math.round(liveFeedback.energy * 100)}%` : "..."}</span>
+                  <span>{liveFeedback.current_pause >= 3 ? `Pause: ${liveFeedback.current_pause}s` : "Speaking"}</span>
+                </div>
+              )}
+
               {isRecording && (
                 <div className="mt-4 text-xs text-muted-foreground">
                   Click again to stop and analyze
@@ -809,6 +910,31 @@ export default function Dashboard() {
                 <p className="text-xs text-muted-foreground mt-2 font-mono">
                   {progress}% {state === "analyzing" && "- Analyzing..."}
                 </p>
+
+                {/* Energy and pauses as soon as the audio is decoded */}
+                {state === "analyzing" && partialAudio?.energy && partialAudio.duration ? (
+                  <div className="mt-8 text-left">
+                    <p className="text-sm text-muted-foreground mb-3">
+                      Energy and pauses
+                    </p>
+                    <AudioPreview
+                      duration={partialAudio.duration}
+                      energy={partialAudio.energy}
+                      silences={partialAudio.silences ?? []}
+                      transcribedUntil={partialAudio.transcribed_until}
+                    />
+                  </div>
+                ) : null}
+
+                {/* Live preview of the timeline as segments are transcribed */}
+                {state === "analyzing" && partialSegments.length > 0 && (
+                  <div className="mt-8 text-left">
+                    <p className="text-sm text-muted-foreground mb-3">
+                      Preview: {partialSegments.length} segments analyzed so far
+                    </p>
+                    <TimelineBlock segments={partialSegments} />
+                  </div>
+                )}
               </div>
             </div>
           )}
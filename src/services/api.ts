@@ -7,6 +7,66 @@ export interface UploadResponse {
 export interface StatusResponse {
     status: "queued" | "processing" | "done" | "failed";
     progress?: number;
+    stage?: string | null;
+    queue_position?: number | null;
+    metrics?: JobMetrics;
+}
+
+// Where a job spent its time (also exported in aggregate on /metrics)
+export interface JobMetrics {
+    stages?: Record<string, number>;
+    total_seconds?: number;
+    audio_seconds?: number | null;
+    realtime_factor?: number | null;
+    peak_rss_mb?: number | null;
+    queue_wait_seconds?: number;
+}
+
+export interface PartialSegment {
+    time: string;
+    start: number;
+    end: number;
+    text: string;
+    risk: number;
+    reasons: string[];
+}
+
+// Sent while a job is running: audio features once, then batches of newly transcribed segments
+export interface PartialResultEvent {
+    duration?: number;
+    energy?: Array<{ time: string; seconds: number; energy: number }>;
+    silences?: Array<{ start: number; end: number; duration: number }>;
+    segment_offset?: number;
+    segments?: PartialSegment[];
+    transcribed_until?: number;
+}
+
+// Live indicators sent by /live while the user is still recording
+export interface LiveFeedback {
+    type: "feedback";
+    elapsed: number;
+    transcribed_until: number;
+    wpm: number | null;
+    filler_count: number;
+    filler_per_min: number;
+    energy: number | null;
+    current_pause: number;
+    segments?: PartialSegment[];
+}
+
+export interface LiveSession {
+    // Finish the recording; resolves to the job id once the final analysis is ready,
+    // or null if the live session failed (callers should upload the recording instead)
+    stop: () => Promise<string | null>;
+}
+
+export interface JobEventHandlers {
+    onProgress?: (status: StatusResponse) => void;
+    onPartial?: (partial: PartialResultEvent) => void;
+    onResult: (result: AnalysisResult) => void;
+    onFailed: (error: string) => void;
+    // Connection could not be established or dropped before the job finished
+    onDisconnect?: () => void;
 }
 
 export interface AnalysisResult {
@@ -22,6 +82,8 @@ export interface AnalysisResult {
         risk: number;
         label?: string;
     }>;
+    // Set when `timeline` is a downsampled view of a longer timeline
+    timeline_points_total?: number;
     summary: {
         drop_risk?: string;
         jargon_density?: string;
@@ -41,6 +103,27 @@ export interface AnalysisResult {
     };
 }
 
+// Scoring thresholds and penalties; any subset overrides the server defaults
+export interface ScoringProfile {
+    wpm?: Partial<Record<"way_too_fast" | "too_fast" | "too_slow" | "way_too_slow", number>>;
+    fillers?: Partial<Record<"too_many" | "several", number>>;
+    words?: Partial<Record<"extremely_long" | "very_long", number>>;
+    reading_ease?: Partial<Record<"very_difficult" | "complex", number>>;
+    energy_std?: Partial<Record<"extremely_low" | "low", number>>;
+    silence_sec?: Partial<Record<"dead_air" | "awkward", number>>;
+    // Risk per severity level, starting with level 0 (no issue)
+    penalties?: Partial<Record<"rate" | "fillers" | "length" | "complexity" | "energy" | "silence", number[]>>;
+    base_risk?: number;
+    drop_risk_threshold?: number;
+}
+
+export interface ReanalyzeResponse {
+    job_id: string;
+    // Bumped on every re-analysis; reports of earlier revisions are stale
+    revision: number;
+    result: AnalysisResult;
+}
+
 export interface AudienceAnalysisResult {
     audience: string;
     fit_score: number;
@@ -54,6 +137,84 @@ export interface AudienceAnalysisResult {
     };
 }
 
+export interface BatchJob {
+    job_id: string;
+    filename: string | null;
+    status: string;
+    progress: number;
+    stage?: string | null;
+}
+
+export interface BatchStatusResponse {
+    batch_id: string;
+    status: "queued" | "processing" | "done" | "failed";
+    progress: number;
+    total: number;
+    completed: number;
+    failed: number;
+    queue_position?: number | null;
+    jobs: BatchJob[];
+}
+
+export interface BatchRecording {
+    job_id: string;
+    filename: string | null;
+    status: string;
+    error?: string;
+    duration?: number;
+    speech_rate?: number;
+    filler_count?: number;
+    fillers_per_min?: number;
+    reading_ease?: number;
+    average_risk?: number;
+    peak_risk?: number;
+    drop_risk?: string;
+}
+
+export interface BatchComparison {
+    batch_id: string;
+    status: string;
+    recordings: BatchRecording[];
+    analyzed: number;
+    failed: number;
+    averages: Record<string, number>;
+    best: { pace?: string; fillers?: string; clarity?: string; engagement?: string };
+    ranking: string[];
+}
+
+// Sample rate /live expects
+const LIVE_SAMPLE_RATE = 16000;
+
+// Stateful resampler for consecutive audio buffers: each output sample is the mean of the
+// input samples it covers (a simple low-pass against aliasing), carried across buffer edges
+function createResampler(inputRate: number, outputRate: number): (input: Float32Array) => Float32Array {
+    const ratio = inputRate / outputRate;
+    let consumed = 0;
+    let boundary = ratio;
+    let sum = 0;
+    let count = 0;
+    let last = 0;
+    return (input) => {
+        const output: number[] = [];
+        for (let i = 0; i < input.length; i++) {
+            sum += input[i];
+            count++;
+            consumed++;
+            while (consumed >= boundary) {
+                // Upsampling: output samples between two inputs repeat the last one
+                if (count > 0) {
+                    last = sum / count;
+                    sum = 0;
+                    count = 0;
+                }
+                output.push(last);
+                boundary += ratio;
+            }
+        }
+        return Float32Array.from(output);
+    };
+}
+
 export const api = {
     upload: async (file: File): Promise<string> => {
         const formData = new FormData();
@@ -70,6 +231,10 @@ export const api = {
                 body: formData,
             });
 
+            if (response.status === 429) {
+                throw new Error("Server is busy analyzing other recordings. Please try again in a moment.");
+            }
+
             if (!response.ok) {
                 throw new Error(`Upload failed: ${response.statusText}`);
             }
@@ -101,6 +266,150 @@ export const api = {
         return response.json();
     },
 
+    // Push-based alternative to polling getStatus/getResult. Returns a function that closes the stream.
+    subscribeToJob: (jobId: string, handlers: JobEventHandlers): (() => void) => {
+        const source = new EventSource(`${API_BASE_URL}/events/${jobId}`);
+        let finished = false;
+
+        source.addEventListener("progress", (event) => {
+            handlers.onProgress?.(JSON.parse((event as MessageEvent).data));
+        });
+        source.addEventListener("partial", (event) => {
+            handlers.onPartial?.(JSON.parse((event as MessageEvent).data));
+        });
+        source.addEventListener("result", (event) => {
+            finished = true;
+            source.close();
+            handlers.onResult(JSON.parse((event as MessageEvent).data));
+        });
+        source.addEventListener("failed", (event) => {
+            finished = true;
+            source.close();
+            handlers.onFailed(JSON.parse((event as MessageEvent).data).error || "Analysis failed on server.");
+        });
+        source.onerror = () => {
+            if (finished) return;
+            source.close();
+            handlers.onDisconnect?.();
+        };
+
+        return () => {
+            finished = true;
+            source.close();
+        };
+    },
+
+    // Streams microphone audio to /live as 16 kHz float32 PCM for real-time feedback.
+    // Throws if the browser can't capture the microphone stream.
+    startLiveSession: (stream: MediaStream, onFeedback: (feedback: LiveFeedback) => void): LiveSession => {
+        const socket = new WebSocket(`${API_BASE_URL.replace(/^http/, "ws")}/live`);
+        socket.binaryType = "arraybuffer";
+
+        // Capture at the device's own rate: Firefox can't connect a microphone to a context
+        // running at any other rate, so the audio is resampled to 16 kHz here
+        const audioContext = new AudioContext();
+        let source: MediaStreamAudioSourceNode;
+        let processor: ScriptProcessorNode;
+        try {
+            source = audioContext.createMediaStreamSource(stream);
+            processor = audioContext.createScriptProcessor(4096, 1, 1);
+        } catch (err) {
+            audioContext.close();
+            socket.close();
+            throw err;
+        }
+        const resample = createResampler(audioContext.sampleRate, LIVE_SAMPLE_RATE);
+        processor.onaudioprocess = (event) => {
+            if (socket.readyState === WebSocket.OPEN) {
+                // resample() returns a new array: the input buffer is reused by the audio thread
+                socket.send(resample(event.inputBuffer.getChannelData(0)).buffer);
+            }
+        };
+        source.connect(processor);
+        processor.connect(audioContext.destination);
+
+        let failed = false;
+        let resolveDone: (jobId: string | null) => void = () => {};
+        const done = new Promise<string | null>((resolve) => { resolveDone = resolve; });
+
+        socket.onmessage = (event) => {
+            const message = JSON.parse(event.data);
+            if (message.type === "feedback") {
+                onFeedback(message);
+            } else if (message.type === "done") {
+                resolveDone(message.job_id);
+            } else if (message.type === "error") {
+                console.error("Live analysis error:", message.error);
+                failed = true;
+                resolveDone(null);
+            }
+        };
+        socket.onerror = () => {
+            failed = true;
+            resolveDone(null);
+        };
+        socket.onclose = () => resolveDone(null);
+
+        const stopCapture = () => {
+            processor.disconnect();
+            source.disconnect();
+            audioContext.close();
+        };
+
+        return {
+            stop: () => {
+                stopCapture();
+                if (failed || socket.readyState !== WebSocket.OPEN) {
+                    socket.close();
+                    return Promise.resolve(null);
+                }
+                socket.send(JSON.stringify({ type: "stop" }));
+                return done;
+            }
+        };
+    },
+
+    uploadBatch: async (files: File[]): Promise<{ batch_id: string; jobs: { job_id: string; filename: string }[] }> => {
+        const formData = new FormData();
+        files.forEach((file) => formData.append("files", file));
+
+        const response = await fetch(`${API_BASE_URL}/batch/upload`, {
+            method: "POST",
+            body: formData,
+        });
+
+        if (!response.ok) {
+            const errorData = await response.json().catch(() => ({}));
+            throw new Error(errorData.error || `Batch upload failed: ${response.statusText}`);
+        }
+
+        return response.json();
+    },
+
+    getBatchStatus: async (batchId: string): Promise<BatchStatusResponse> => {
+        const response = await fetch(`${API_BASE_URL}/batch/${batchId}`);
+        if (!response.ok) {
+            throw new Error(`Batch status check failed: ${response.statusText}`);
+        }
+        return response.json();
+    },
+
+    getBatchResult: async (batchId: string): Promise<BatchComparison> => {
+        const response = await fetch(`${API_BASE_URL}/batch/${batchId}/result`);
+        if (!response.ok) {
+            throw new Error(`Batch result fetch failed: ${response.statusText}`);
+        }
+        return response.json();
+    },
+
+    getAudienceMatrix: async (jobId: string): Promise<Record<string, AudienceAnalysisResult>> => {
+        const response = await fetch(`${API_BASE_URL}/audiences/${jobId}`);
+        if (!response.ok) {
+            throw new Error(`Audience matrix fetch failed: ${response.statusText}`);
+        }
+        return response.json();
+    },
+
     getAudienceAnalysis: async (jobId: string, audience: string): Promise<AudienceAnalysisResult> => {
         const response = await fetch(`${API_BASE_URL}/result/${jobId}?audience=${audience}`);
         if (!response.ok) {
@@ -109,5 +418,23 @@ export const api = {
         return response.json();
     },
 
+    // Re-score a finished job from its stored analysis; no re-upload or transcription
+    reanalyze: async (
+        jobId: string,
+        scoringProfile: ScoringProfile,
+        timeline?: { timeline_interval?: number; timeline_max_points?: number }
+    ): Promise<ReanalyzeResponse> => {
+        const response = await fetch(`${API_BASE_URL}/reanalyze/${jobId}`, {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({ scoring_profile: scoringProfile, ...timeline }),
+        });
+        if (!response.ok) {
+            const errorData = await response.json().catch(() => ({}));
+            throw new Error(errorData.error || `Re-analysis failed: ${response.statusText}`);
+        }
+        return response.json();
+    },
+
     API_BASE_URL
 };